@@ -1,44 +1,182 @@
 import pytest
-from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
-from typing import Generator
-import os
+from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page, Playwright
+from typing import Generator, Optional
+
+# Модули utils подключаются как плагины pytest и импортируются фикстурами раньше регистрации
+pytest.register_assert_rewrite("utils")
+
+from utils.browser_server import BrowserProvider
+from utils.config import (
+    get_local_site_latency,
+    get_prefetch_pool_size,
+    is_local_site_enabled,
+    is_page_reuse_enabled,
+)
+from utils.context_configs import get_context_config
+from utils.context_factory import new_order_context, open_order_page
+from utils.har import HarBundle, get_har_bundle, get_har_mode, record_har_bundle
+from utils.local_site import LocalSite, parse_latency
+from utils.prefetch import PREFETCHED_KEY, PrefetchPools
+from utils.routing import get_route_profile
+from utils.timing import record_viewport
+from utils.warm_page import WarmOrderPage
+from utils.web_vitals import record_web_vitals
+
+
+pytest_plugins = [
+    "pytester",
+    "utils.engines",
+    "utils.browser_server",
+    "utils.async_scenarios",
+    "utils.device_matrix",
+    "utils.durations",
+    "utils.timing",
+    "utils.routing",
+    "utils.context_configs",
+    "utils.web_vitals",
+    "utils.perf_budget",
+    "utils.checkpoint",
+    "utils.instrumentation",
+    "utils.results",
+    "utils.sharding",
+]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def local_site() -> Generator[Optional[LocalSite], None, None]:
+    """Фикстура локальной копии страницы заказа (LOCAL_SITE=true): сервер в процессе и BASE_URL на него"""
+    if not is_local_site_enabled():
+        yield None
+        return
+    site = LocalSite(parse_latency(get_local_site_latency())).start()
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("BASE_URL", site.url)
+        yield site
+    site.stop()
 
 
 @pytest.fixture(scope="session")
-def browser() -> Generator[Browser, None, None]:
-    """Фикстура для создания браузера"""
+def playwright_instance() -> Generator[Playwright, None, None]:
+    """Фикстура Playwright процесса, общая для всех движков"""
     with sync_playwright() as p:
-        # Можно изменить браузер: chromium, firefox, webkit
-        browser = p.chromium.launch(
-            headless=os.getenv("HEADLESS", "true").lower() == "true",
-            slow_mo=1000 if os.getenv("SLOW_MO") else 0
-        )
-        yield browser
-        browser.close()
+        yield p
+
+
+@pytest.fixture(scope="session")
+def browser_provider(playwright_instance: Playwright,
+                     browser_engine: str) -> Generator[BrowserProvider, None, None]:
+    """Фикстура поставщика браузера движка (BROWSER или --engines): свой браузер или общий сервер"""
+    provider = BrowserProvider(playwright_instance, browser_engine)
+    yield provider
+    provider.close()
+
+
+@pytest.fixture(scope="session")
+def browser(browser_provider: BrowserProvider) -> Browser:
+    """Фикстура для создания браузера"""
+    return browser_provider.get()
+
+
+@pytest.fixture(scope="session")
+def har_bundle(request: pytest.FixtureRequest, browser: Browser) -> Optional[HarBundle]:
+    """Фикстура HAR-слепка: записывает его (HAR_MODE=record) или подключает для воспроизведения (HAR_MODE=replay)"""
+    mode = get_har_mode()
+    if mode == "off" or is_local_site_enabled():
+        return None
+    if mode == "record":
+        if hasattr(request.config, "workerinput"):
+            pytest.fail("HAR_MODE=record нельзя использовать с pytest-xdist: "
+                        "запишите слепок командой python run_tests.py --record-har", pytrace=False)
+        record_har_bundle(browser)
+    bundle = get_har_bundle()
+    if not bundle.exists():
+        pytest.fail(f"HAR-слепок не найден в {bundle.directory}: "
+                    f"запишите его командой python run_tests.py --record-har", pytrace=False)
+    return bundle
+
+
+@pytest.fixture(scope="session")
+def warm_order_pages(browser_engine: str) -> Generator[dict[str, WarmOrderPage], None, None]:
+    """Фикстура прогретых страниц заказа движка по конфигурациям контекста (PAGE_REUSE=true)"""
+    pages: dict[str, WarmOrderPage] = {}
+    yield pages
+    for warm_page in pages.values():
+        warm_page.page.context.close()
+
+
+@pytest.fixture(scope="function")
+def warm_order_page(request: pytest.FixtureRequest, browser: Browser, har_bundle: Optional[HarBundle],
+                    warm_order_pages: dict[str, WarmOrderPage]) -> Optional[WarmOrderPage]:
+    """Фикстура прогретой страницы заказа для конфигурации теста (PAGE_REUSE=true)
+
+    Профиль блокировки у общих страниц один на процесс - из ROUTE_PROFILE.
+    """
+    if not is_page_reuse_enabled():
+        return None
+    context_config = get_context_config(request.node)
+    if context_config.name not in warm_order_pages:
+        context = new_order_context(browser, har_bundle, get_route_profile(), context_config)
+        warm_order_pages[context_config.name] = WarmOrderPage(context.new_page())
+    return warm_order_pages[context_config.name]
+
+
+@pytest.fixture(scope="session")
+def prefetch_pools(browser_provider: BrowserProvider,
+                   har_bundle: Optional[HarBundle]) -> Generator[Optional[PrefetchPools], None, None]:
+    """Фикстура пулов заранее загруженных страниц заказа по конфигурациям контекста (PREFETCH_POOL=K)"""
+    size = get_prefetch_pool_size()
+    if size <= 0 or is_page_reuse_enabled():
+        yield None
+        return
+    pools = PrefetchPools(browser_provider, har_bundle, size)
+    yield pools
+    pools.close()
 
 
 @pytest.fixture(scope="function")
-def context(browser: Browser) -> Generator[BrowserContext, None, None]:
+def context(request: pytest.FixtureRequest, browser_provider: BrowserProvider, har_bundle: Optional[HarBundle],
+            warm_order_page: Optional[WarmOrderPage],
+            prefetch_pools: Optional[PrefetchPools]) -> Generator[BrowserContext, None, None]:
     """Фикстура для создания контекста браузера"""
-    context = browser.new_context(
-        viewport={"width": 1920, "height": 1080},
-        user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-    )
+    if warm_order_page is not None:
+        yield warm_order_page.page.context
+        return
+    # Страницы пула загружены с профилем из ROUTE_PROFILE, тесты с другим маркером идут мимо пула
+    if prefetch_pools is not None and get_route_profile(request.node) == get_route_profile():
+        context = prefetch_pools.acquire(get_context_config(request.node)).context
+        request.node.stash[PREFETCHED_KEY] = True
+        yield context
+        context.close()
+        return
+    # Браузер берется у поставщика: после перезапуска общего сервера он переподключится
+    context = new_order_context(browser_provider.get(), har_bundle, get_route_profile(request.node),
+                                get_context_config(request.node))
     yield context
     context.close()
 
 
 @pytest.fixture(scope="function")
-def page(context: BrowserContext) -> Generator[Page, None, None]:
+def page(request: pytest.FixtureRequest, context: BrowserContext,
+         warm_order_page: Optional[WarmOrderPage]) -> Generator[Page, None, None]:
     """Фикстура для создания страницы"""
-    page = context.new_page()
+    if warm_order_page is not None:
+        record_viewport(request.node, warm_order_page.page.viewport_size)
+        yield warm_order_page.page
+        record_web_vitals(request.node, warm_order_page.page)
+        return
+    prefetched = request.node.stash.get(PREFETCHED_KEY, False)
+    page = context.pages[0] if prefetched else context.new_page()
+    record_viewport(request.node, page.viewport_size)
     yield page
+    record_web_vitals(request.node, page)
     page.close()
 
 
 @pytest.fixture(scope="function")
-def order_page(page: Page) -> Page:
+def order_page(request: pytest.FixtureRequest, page: Page, warm_order_page: Optional[WarmOrderPage]) -> Page:
     """Фикстура для загрузки страницы оформления заказа"""
-    page.goto("https://qa-mts.netlify.app/")
-    page.wait_for_load_state("networkidle")
-    return page
+    if warm_order_page is not None:
+        return warm_order_page.acquire()
+    if request.node.stash.get(PREFETCHED_KEY, False):
+        return page
+    return open_order_page(page)
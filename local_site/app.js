@@ -0,0 +1,137 @@
+// Локальная копия страницы заказа: правила доставки и оплаты, расчет цен,
+// валидация и окно подтверждения
+(() => {
+    const PRODUCT_PRICE = 89990;
+    const DELIVERY_PRICES = {courier: 0, pickup: 0, post: 300};
+    const SERVICE_PRICES = {giftWrap: 500, insurance: 200};
+
+    const form = document.getElementById('order-form');
+    const notice = document.getElementById('notice');
+    const field = name => form.elements[name];
+    const checked = name => {
+        const radio = form.querySelector(`input[name="${name}"]:checked`);
+        return radio ? radio.value : null;
+    };
+
+    // Цены в сводке - с пробелами, итог - с запятой, как на основном стенде
+    const formatPrice = (value, separator) =>
+        `${String(value).replace(/\B(?=(\d{3})+(?!\d))/g, separator)} ₽`;
+
+    const recalculate = () => {
+        const delivery = DELIVERY_PRICES[checked('delivery')] || 0;
+        const services = Object.entries(SERVICE_PRICES)
+            .reduce((sum, [name, price]) => sum + (field(name).checked ? price : 0), 0);
+        document.getElementById('delivery-price').textContent = formatPrice(delivery, ' ');
+        document.getElementById('services-price').textContent = formatPrice(services, ' ');
+        document.getElementById('total-price').textContent = formatPrice(PRODUCT_PRICE + delivery + services, ',');
+    };
+
+    // Оплата наличными доступна только при курьерской доставке
+    const updatePaymentRules = () => {
+        const cash = form.querySelector('input[name="payment"][value="cash"]');
+        cash.disabled = checked('delivery') !== 'courier';
+        if (cash.disabled && cash.checked) {
+            cash.checked = false;
+        }
+    };
+
+    const RULES = [
+        ['firstName', () => field('firstName').value.trim(), 'Введите имя'],
+        ['lastName', () => field('lastName').value.trim(), 'Введите фамилию'],
+        ['email', () => /^[^\s@]+@[^\s@]+\.[^\s@]+$/.test(field('email').value.trim()), 'Введите корректный email'],
+        ['phone', () => field('phone').value.replace(/\D/g, '').length >= 11, 'Введите корректный номер телефона'],
+        ['city', () => field('city').value, 'Выберите город'],
+        ['address', () => field('address').value.trim(), 'Введите адрес доставки'],
+        ['delivery', () => checked('delivery'), 'Выберите способ доставки'],
+        ['payment', () => checked('payment'), 'Выберите способ оплаты'],
+    ];
+
+    const showErrors = () => {
+        form.querySelectorAll('.error').forEach(el => el.remove());
+        let valid = true;
+        for (const [name, check, message] of RULES) {
+            if (check()) {
+                continue;
+            }
+            valid = false;
+            const error = document.createElement('div');
+            error.className = 'error';
+            error.id = `${name}-error`;
+            error.textContent = message;
+            // Ошибка выбора способа - под всей группой радиокнопок, остальные - под полем
+            const control = form.querySelector(`[name="${name}"]`);
+            const anchor = control.type === 'radio' ? control.closest('fieldset').lastElementChild : control.closest('label');
+            anchor.after(error);
+        }
+        return valid;
+    };
+
+    const showNotice = (text, failed = false) => {
+        notice.textContent = text;
+        notice.classList.toggle('notice-failed', failed);
+        notice.hidden = false;
+    };
+
+    const closeModal = () => {
+        const backdrop = document.querySelector('.modal-backdrop');
+        if (backdrop) {
+            backdrop.remove();
+        }
+    };
+
+    const confirmOrder = async () => {
+        const payload = Object.fromEntries(new FormData(form).entries());
+        try {
+            const response = await fetch('api/orders', {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify(payload),
+            });
+            if (!response.ok) {
+                throw new Error(response.statusText);
+            }
+            const {id} = await response.json();
+            closeModal();
+            showNotice(`Заказ №${id} оформлен`);
+        } catch (exc) {
+            closeModal();
+            showNotice('Не удалось оформить заказ, попробуйте еще раз', true);
+        }
+    };
+
+    const openModal = () => {
+        closeModal();
+        const backdrop = document.createElement('div');
+        backdrop.className = 'modal-backdrop';
+        backdrop.innerHTML = `
+            <div class="modal" role="dialog" aria-modal="true">
+                <h3>Подтверждение заказа</h3>
+                <p>Итого к оплате: ${document.getElementById('total-price').textContent}</p>
+                <button type="button" class="modal-confirm">Подтвердить</button>
+                <button type="button" class="modal-cancel">Отмена</button>
+            </div>`;
+        backdrop.querySelector('.modal-confirm').addEventListener('click', confirmOrder);
+        backdrop.querySelector('.modal-cancel').addEventListener('click', closeModal);
+        document.body.appendChild(backdrop);
+    };
+
+    form.addEventListener('change', () => {
+        updatePaymentRules();
+        recalculate();
+    });
+
+    form.addEventListener('submit', event => {
+        event.preventDefault();
+        if (showErrors()) {
+            openModal();
+        }
+    });
+
+    document.getElementById('save-draft').addEventListener('click', () => {
+        localStorage.setItem('orderDraft', JSON.stringify(Object.fromEntries(new FormData(form).entries())));
+        showNotice('Черновик сохранен');
+    });
+
+    updatePaymentRules();
+    recalculate();
+})();
@@ -0,0 +1,144 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from pages.order_page import (
+    ARM_REGION_JS,
+    BaseOrderPage,
+    FILL_ORDER_JS,
+    FormSnapshot,
+    ORDER_FIELDS,
+    OrderData,
+    PRICE_LABELS,
+    PriceBreakdown,
+    READ_PRICES_JS,
+    REGION_CHANGE_JS,
+    RegionChange,
+    SNAPSHOT_JS,
+    VALIDATION_ERRORS_JS,
+    ValidationError,
+    WAIT_PRICE_CHANGE_JS,
+)
+
+
+class AsyncOrderPage(BaseOrderPage):
+    """Асинхронный вариант OrderPage для playwright.async_api"""
+
+    async def fill_contact_info(self, first_name: str, last_name: str, email: str, phone: str) -> None:
+        """Заполняет контактную информацию"""
+        await self.first_name_input.fill(first_name)
+        await self.last_name_input.fill(last_name)
+        await self.email_input.fill(email)
+        await self.phone_input.fill(phone)
+
+    async def fill_address_info(self, city: str, address: str, postal_code: Optional[str] = None,
+                                apartment: Optional[str] = None) -> None:
+        """Заполняет информацию об адресе"""
+        await self.city_select.select_option(city)
+        await self.address_input.fill(address)
+        if postal_code:
+            await self.postal_code_input.fill(postal_code)
+        if apartment:
+            await self.apartment_input.fill(apartment)
+
+    async def select_delivery_method(self, method: str) -> None:
+        """Выбирает способ доставки"""
+        if method == "courier":
+            await self.courier_delivery.check()
+        elif method == "pickup":
+            await self.pickup_delivery.check()
+        elif method == "post":
+            await self.post_delivery.check()
+
+    async def select_payment_method(self, method: str) -> None:
+        """Выбирает способ оплаты"""
+        if method == "card":
+            await self.card_payment.check()
+        elif method == "cash":
+            await self.cash_payment.check()
+        elif method == "bank":
+            await self.bank_transfer.check()
+
+    async def set_additional_options(self, gift_wrapping: bool = False, insurance: bool = False,
+                                     newsletter: bool = False) -> None:
+        """Устанавливает дополнительные опции"""
+        if gift_wrapping:
+            await self.gift_wrapping.check()
+        if insurance:
+            await self.insurance.check()
+        if newsletter:
+            await self.newsletter.check()
+
+    async def fill_order(self, order: OrderData, batch: bool = True) -> None:
+        """Заполняет форму по описанию заказа (см. OrderPage.fill_order)"""
+        operations = self.fill_operations(order)
+        if batch:
+            await self.page.evaluate(FILL_ORDER_JS, operations)
+            return
+
+        for kind, selector, value in operations:
+            field = self.page.locator(selector)
+            if kind == "text":
+                await field.fill(value)
+            elif kind == "select":
+                await field.select_option(value)
+            else:
+                await field.set_checked(value)
+
+    async def add_comment(self, comment: str) -> None:
+        """Добавляет комментарий к заказу"""
+        await self.comment_textarea.fill(comment)
+
+    async def submit_order(self) -> None:
+        """Отправляет заказ"""
+        await self.submit_order_btn.click()
+
+    async def confirm_order(self) -> None:
+        """Подтверждает заказ в модальном окне"""
+        await self.confirm_order_btn.click()
+
+    async def save_draft(self) -> None:
+        """Сохраняет черновик заказа"""
+        await self.save_draft_btn.click()
+
+    async def get_total_price(self) -> str:
+        """Получает итоговую цену в том виде, в каком она показана"""
+        prices = await self.page.evaluate(READ_PRICES_JS, {"total_price": PRICE_LABELS["total_price"]})
+        return prices["total_price"]
+
+    async def get_price_breakdown(self) -> PriceBreakdown:
+        """Читает цены из сводки заказа за один вызов в странице"""
+        return PriceBreakdown.from_prices(await self.page.evaluate(READ_PRICES_JS, PRICE_LABELS))
+
+    async def wait_for_price_change(self, previous: PriceBreakdown, timeout: int = 5000) -> PriceBreakdown:
+        """Ждет, пока цены в сводке станут отличаться от previous (см. OrderPage.wait_for_price_change)"""
+        prices = await self.page.evaluate(WAIT_PRICE_CHANGE_JS, self._price_change_query(previous, timeout))
+        return PriceBreakdown.from_prices(prices)
+
+    @asynccontextmanager
+    async def watch_region(self, region: str, timeout: int = 5000) -> AsyncIterator[RegionChange]:
+        """Ждет изменения области после действий внутри блока (см. OrderPage.watch_region)"""
+        change = RegionChange(region)
+        await self.page.evaluate(ARM_REGION_JS, self._region_query(region, timeout))
+        yield change
+        change.elapsed_ms = await self.page.evaluate(REGION_CHANGE_JS, region)
+
+    async def snapshot(self) -> FormSnapshot:
+        """Снимает состояние всей формы и цены за один вызов в странице"""
+        state = await self.page.evaluate(SNAPSHOT_JS, [ORDER_FIELDS, PRICE_LABELS])
+        return self.snapshot_from_state(state)
+
+    async def is_confirmation_modal_visible(self) -> bool:
+        """Проверяет, видно ли модальное окно подтверждения"""
+        return await self.confirmation_modal.is_visible()
+
+    async def collect_validation_errors(self, wait_until_stable: bool = False, quiet_ms: int = 200,
+                                        timeout: int = 5000) -> list[ValidationError]:
+        """Собирает ошибки валидации за один вызов в странице"""
+        errors = await self.page.evaluate(
+            VALIDATION_ERRORS_JS, self._validation_query(wait_until_stable, quiet_ms, timeout)
+        )
+        return [ValidationError(**error) for error in errors]
+
+    async def get_validation_errors(self, wait_until_stable: bool = False) -> list[str]:
+        """Получает список ошибок валидации"""
+        return [error.message for error in await self.collect_validation_errors(wait_until_stable)]
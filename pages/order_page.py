@@ -1,11 +1,442 @@
+import math
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from playwright.async_api import Page as AsyncPage
 from playwright.sync_api import Page, Locator
-from typing import Optional
+from typing import Any, Iterator, Optional, Union
 
 
-class OrderPage:
-    """Класс для работы со страницей оформления заказа"""
+@dataclass(frozen=True)
+class OrderData:
+    """Декларативное описание заказа для заполнения формы
+
+    None означает, что поле не трогается. Для опций True отмечает чекбокс,
+    False снимает отметку.
+    """
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    city: Optional[str] = None
+    address: Optional[str] = None
+    postal_code: Optional[str] = None
+    apartment: Optional[str] = None
+    delivery: Optional[str] = None
+    payment: Optional[str] = None
+    gift_wrapping: Optional[bool] = None
+    insurance: Optional[bool] = None
+    newsletter: Optional[bool] = None
+    comment: Optional[str] = None
+
+
+# Поля формы в порядке заполнения: атрибут OrderData, тип поля и CSS-селектор.
+# Для радиокнопок {} подставляется значением (courier, card, ...)
+ORDER_FIELDS = (
+    ("first_name", "text", 'input[name="firstName"]'),
+    ("last_name", "text", 'input[name="lastName"]'),
+    ("email", "text", 'input[name="email"]'),
+    ("phone", "text", 'input[name="phone"]'),
+    ("city", "select", 'select[name="city"]'),
+    ("address", "text", 'textarea[name="address"]'),
+    ("postal_code", "text", 'input[name="postalCode"]'),
+    ("apartment", "text", 'input[name="apartment"]'),
+    ("delivery", "radio", 'input[name="delivery"][value="{}"]'),
+    ("payment", "radio", 'input[name="payment"][value="{}"]'),
+    ("gift_wrapping", "checkbox", 'input[name="giftWrap"]'),
+    ("insurance", "checkbox", 'input[name="insurance"]'),
+    ("newsletter", "checkbox", 'input[name="newsletter"]'),
+    ("comment", "text", 'textarea[name="comment"]'),
+)
+
+# Применяет список операций одним вызовом в странице. Значения выставляются
+# через нативные сеттеры и сопровождаются событиями input/change (для
+# радиокнопок и чекбоксов - настоящим click), чтобы их увидел фреймворк.
+# После выбора радиокнопки ждем перерисовки: от доставки зависит доступность оплаты.
+FILL_ORDER_JS = """
+async (operations) => {
+    const find = (selector) => {
+        const el = document.querySelector(selector);
+        if (!el) {
+            throw new Error(`Поле не найдено: ${selector}`);
+        }
+        return el;
+    };
+    const setNative = (el, value) => {
+        const descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value');
+        descriptor.set.call(el, value);
+        el.dispatchEvent(new Event('input', { bubbles: true }));
+        el.dispatchEvent(new Event('change', { bubbles: true }));
+    };
+    const rerender = () => new Promise(resolve => setTimeout(resolve, 0));
+
+    for (const [kind, selector, value] of operations) {
+        const el = find(selector);
+        if (el.disabled) {
+            throw new Error(`Поле недоступно: ${selector}`);
+        }
+        el.focus();
+        if (kind === 'text') {
+            setNative(el, value);
+        } else if (kind === 'select') {
+            const option = Array.from(el.options)
+                .find(o => o.value === value || o.textContent.trim() === value);
+            if (!option) {
+                throw new Error(`Нет варианта ${value} в ${selector}`);
+            }
+            setNative(el, option.value);
+        } else if (el.checked !== value) {
+            el.click();
+            await rerender();
+        }
+    }
+    if (document.activeElement) {
+        document.activeElement.blur();
+    }
+    await rerender();
+}
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class FormSnapshot:
+    """Неизменяемый снимок состояния формы заказа
+
+    Снимки можно сравнивать между шагами теста: == и diff().
+    """
+    first_name: str
+    last_name: str
+    email: str
+    phone: str
+    city: str
+    address: str
+    postal_code: str
+    apartment: str
+    delivery: Optional[str]
+    payment: Optional[str]
+    gift_wrapping: bool
+    insurance: bool
+    newsletter: bool
+    comment: str
+    disabled: frozenset[str]
+    product_price: Optional[str]
+    delivery_price: Optional[str]
+    additional_services_price: Optional[str]
+    total_price: Optional[str]
+
+    def is_enabled(self, field: str) -> bool:
+        """Проверяет доступность поля; для радиокнопок - "payment:cash" и т.п."""
+        return field not in self.disabled
+
+    def diff(self, other: "FormSnapshot") -> dict[str, tuple[Any, Any]]:
+        """Возвращает отличающиеся поля: имя -> (значение здесь, значение в other)"""
+        changes = {}
+        for field in fields(self):
+            before, after = getattr(self, field.name), getattr(other, field.name)
+            if before != after:
+                changes[field.name] = (before, after)
+        return changes
+
+
+@dataclass(slots=True)
+class RegionChange:
+    """Изменение области страницы, дождавшееся в watch_region"""
+    region: str
+    elapsed_ms: Optional[float] = None
+
+
+@dataclass(frozen=True, slots=True)
+class ValidationError:
+    """Ошибка валидации, показанная на странице"""
+    field: Optional[str]
+    message: str
+    visible: bool
+
+
+VALIDATION_ERROR_SELECTOR = '.error, .invalid, [class*="error"]'
+
+# Собирает ошибки валидации одним вызовом. При waitStable сначала ждет, пока
+# DOM не перестанет меняться quietMs миллисекунд (но не дольше timeout).
+# Поле определяется по aria-describedby или по ближайшему контейнеру с полем ввода.
+VALIDATION_ERRORS_JS = """
+async ({ selector, waitStable, quietMs, timeout }) => {
+    if (waitStable) {
+        await new Promise(resolve => {
+            let quietTimer = setTimeout(done, quietMs);
+            const deadline = setTimeout(done, timeout);
+            const observer = new MutationObserver(() => {
+                clearTimeout(quietTimer);
+                quietTimer = setTimeout(done, quietMs);
+            });
+            function done() {
+                observer.disconnect();
+                clearTimeout(quietTimer);
+                clearTimeout(deadline);
+                resolve();
+            }
+            observer.observe(document.body, {
+                subtree: true, childList: true, characterData: true, attributes: true,
+            });
+        });
+    }
+
+    const controls = 'input, select, textarea';
+    const fieldOf = (el) => {
+        if (el.matches(controls)) {
+            return el.name || null;
+        }
+        if (el.id) {
+            const described = document.querySelector(`[aria-describedby~="${CSS.escape(el.id)}"]`);
+            if (described) {
+                return described.name || null;
+            }
+        }
+        let container = el.parentElement;
+        for (let depth = 0; container && depth < 3; depth++, container = container.parentElement) {
+            const names = new Set(Array.from(container.querySelectorAll(controls)).map(c => c.name));
+            if (names.size === 1) {
+                return [...names][0] || null;
+            }
+            if (names.size > 1) {
+                return null;
+            }
+        }
+        return null;
+    };
+    const isVisible = (el) => {
+        const style = getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none' && el.getClientRects().length > 0;
+    };
+
+    return Array.from(document.querySelectorAll(selector))
+        .map(el => ({ field: fieldOf(el), message: (el.textContent || '').trim(), visible: isVisible(el) }))
+        .filter(error => error.message);
+}
+"""
+
+
+# Подписи строк блока итогов: поле снимка -> варианты подписи
+PRICE_LABELS = {
+    "product_price": ("Товар", "Стоимость товара"),
+    "delivery_price": ("Доставка",),
+    "additional_services_price": ("Дополнительные услуги", "Доп. услуги"),
+    "total_price": ("Итого",),
+}
+
+
+def price_label_pattern(variants: tuple[str, ...]) -> re.Pattern:
+    """Текст, начинающийся с любого варианта подписи, - то же правило, что в READ_PRICES_JS"""
+    return re.compile("^(?:" + "|".join(re.escape(variant) for variant in variants) + ")")
+
+
+# Ищет в блоке итогов строку по подписи и возвращает отображаемую цену.
+# Берется последнее вхождение подписи: блок итогов расположен под формой.
+READ_PRICES_JS = r"""
+(labels) => {
+    const priceRe = /\d[\d\s\u00a0\u202f,.]*\s?₽|бесплатно/i;
+    const leaves = Array.from(document.querySelectorAll('body *'))
+        .filter(el => el.children.length === 0);
+    const read = (variants) => {
+        for (const el of leaves.slice().reverse()) {
+            const text = el.textContent.trim();
+            const label = variants.find(v => text.startsWith(v));
+            if (!label) {
+                continue;
+            }
+            let row = el;
+            for (let depth = 0; row && depth < 3; depth++, row = row.parentElement) {
+                const match = row.textContent.replace(label, '').match(priceRe);
+                if (match) {
+                    return match[0].trim();
+                }
+            }
+        }
+        return null;
+    };
+    return Object.fromEntries(Object.entries(labels).map(([key, variants]) => [key, read(variants)]));
+}
+"""
+
+# Ждет, пока хотя бы одна строка сводки не покажет цену, отличную от previous
+# (рубли по строкам), и возвращает новые подписи цен. Разбор цены совпадает с parse_price
+WAIT_PRICE_CHANGE_JS = """
+async ({labels, previous, timeout}) => {
+    const readPrices = %s;
+    const rubles = (text) => {
+        if (!text) {
+            return null;
+        }
+        if (/бесплатно/i.test(text)) {
+            return 0;
+        }
+        const compact = text.replace(/[^\\d.,]/g, '');
+        const fraction = compact.match(/[.,](\\d{1,2})$/);
+        const whole = fraction ? compact.slice(0, -fraction[0].length) : compact;
+        return Math.floor(Number(whole.replace(/[.,]/g, '') + (fraction ? '.' + fraction[1] : '')) + 0.5);
+    };
+    const changed = () => {
+        const prices = readPrices(labels);
+        return Object.keys(labels).some(key => rubles(prices[key]) !== previous[key]) ? prices : null;
+    };
+    return changed() || await new Promise((resolve, reject) => {
+        const observer = new MutationObserver(() => {
+            const prices = changed();
+            if (prices) {
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(prices);
+            }
+        });
+        const timer = setTimeout(() => {
+            observer.disconnect();
+            reject(new Error(`Цены в сводке не изменились за ${timeout} мс`));
+        }, timeout);
+        observer.observe(document.body, {subtree: true, childList: true, characterData: true});
+    });
+}
+""" % READ_PRICES_JS
+
+
+# Отслеживаемые области страницы: сводка цен, радиокнопки оплаты, ошибки валидации
+WATCH_REGIONS = ("prices", "payment", "errors")
+
+# Запоминает состояние области и подключает MutationObserver: обещание в
+# window.__regionWatch[region] выполняется, как только состояние изменится, и
+# возвращает миллисекунды от первого события ввода (или от подключения) до
+# изменения. checked не отражается в атрибутах, поэтому состояние проверяется
+# и после событий input/change
+ARM_REGION_JS = """
+({region, labels, errorSelector, timeout}) => {
+    const readPrices = %s;
+    const states = {
+        prices: () => JSON.stringify(readPrices(labels)),
+        payment: () => Array.from(document.querySelectorAll('input[name="payment"]'))
+            .map(r => `${r.value}:${r.checked}:${r.disabled}`).join(','),
+        errors: () => Array.from(document.querySelectorAll(errorSelector))
+            .map(el => (el.textContent || '').trim()).filter(Boolean).join('\\n'),
+    };
+    const state = states[region];
+    const initial = state();
+    const armed = performance.now();
+    let start = null;
+    const events = ['pointerdown', 'mousedown', 'keydown', 'click', 'input', 'change'];
+    const onEvent = (event) => {
+        if (start === null) {
+            start = performance.now();
+        }
+        if (event.type === 'input' || event.type === 'change') {
+            setTimeout(check, 0);
+        }
+    };
+    let finish;
+    const check = () => {
+        if (state() !== initial) {
+            finish(null);
+        }
+    };
+    const observer = new MutationObserver(check);
+    const watch = new Promise((resolve, reject) => {
+        const timer = setTimeout(() => finish(new Error(`Область ${region} не изменилась за ${timeout} мс`)), timeout);
+        finish = (error) => {
+            const end = performance.now();
+            observer.disconnect();
+            clearTimeout(timer);
+            events.forEach(type => document.removeEventListener(type, onEvent, true));
+            error ? reject(error) : resolve(end - (start === null ? armed : start));
+        };
+    });
+    events.forEach(type => document.addEventListener(type, onEvent, true));
+    observer.observe(document.body, {subtree: true, childList: true, characterData: true, attributes: true});
+    watch.catch(() => {});
+    window.__regionWatch = Object.assign(window.__regionWatch || {}, {[region]: watch});
+}
+""" % READ_PRICES_JS
+
+# Результат наблюдения за областью: миллисекунды до изменения
+REGION_CHANGE_JS = "region => window.__regionWatch[region]"
+
+
+def parse_price(text: Optional[str]) -> int:
+    """Переводит отображаемую цену в рубли: "89 990 ₽", "89,990 ₽", "бесплатно"
+
+    Пробелы и запятые или точки перед тремя цифрами считаются разделителями
+    разрядов, одна-две цифры после запятой или точки - копейками (округляются).
+    """
+    if text is None:
+        raise ValueError("Цена не найдена")
+    if "бесплатно" in text.lower():
+        return 0
+    compact = re.sub(r"[^\d.,]", "", text)
+    if not compact or not compact[0].isdigit():
+        raise ValueError(f"Не удалось разобрать цену {text!r}")
+    fraction = re.search(r"[.,](\d{1,2})$", compact)
+    whole = compact[:fraction.start()] if fraction else compact
+    value = int(re.sub(r"[.,]", "", whole))
+    if fraction:
+        value = math.floor(value + int(fraction.group(1)) / 10 ** len(fraction.group(1)) + 0.5)
+    return value
+
+
+# Поле PriceBreakdown -> ключ PRICE_LABELS
+BREAKDOWN_KEYS = {
+    "product": "product_price",
+    "delivery": "delivery_price",
+    "additional_services": "additional_services_price",
+    "total": "total_price",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class PriceBreakdown:
+    """Цены из сводки заказа в рублях"""
+    product: int
+    delivery: int
+    additional_services: int
+    total: int
+
+    @classmethod
+    def from_prices(cls, prices: dict[str, Optional[str]]) -> "PriceBreakdown":
+        """Разбирает результат READ_PRICES_JS"""
+        values = {}
+        for name, key in BREAKDOWN_KEYS.items():
+            try:
+                values[name] = parse_price(prices.get(key))
+            except ValueError as error:
+                raise ValueError(f"Строка сводки {key}: {error}") from None
+        return cls(**values)
+
+    def as_previous(self) -> dict[str, int]:
+        """Цены по ключам PRICE_LABELS для WAIT_PRICE_CHANGE_JS"""
+        return {key: getattr(self, name) for name, key in BREAKDOWN_KEYS.items()}
+
+
+# Собирает значения, отметки и доступность всех полей формы и цены одним вызовом
+SNAPSHOT_JS = """
+([fieldsSpec, labels]) => {
+    const state = { disabled: [] };
+    for (const [attr, kind, selector] of fieldsSpec) {
+        if (kind === 'radio') {
+            const radios = Array.from(document.querySelectorAll(selector.replace('[value="{}"]', '')));
+            const checked = radios.find(r => r.checked);
+            state[attr] = checked ? checked.value : null;
+            radios.filter(r => r.disabled).forEach(r => state.disabled.push(`${attr}:${r.value}`));
+            continue;
+        }
+        const el = document.querySelector(selector);
+        state[attr] = !el ? null : kind === 'checkbox' ? el.checked : el.value;
+        if (el && el.disabled) {
+            state.disabled.push(attr);
+        }
+    }
+    return Object.assign(state, (%s)(labels));
+}
+""" % READ_PRICES_JS
+
+
+class BaseOrderPage:
+    """Локаторы страницы оформления заказа, общие для синхронного и асинхронного API"""
     
-    def __init__(self, page: Page):
+    def __init__(self, page: Union[Page, AsyncPage]):
         self.page = page
         
         # Селекторы для полей формы (обновлены в соответствии с реальной структурой)
@@ -44,15 +475,72 @@ class OrderPage:
         self.confirm_order_btn = page.locator('button:has-text("Подтвердить")')
         self.cancel_order_btn = page.locator('button:has-text("Отмена")')
         
-        # Цены и итого (обновлены селекторы)
-        self.product_price = page.locator('text=89 990 ₽').first
-        self.delivery_price = page.locator('text=0 ₽').first
-        self.additional_services_price = page.locator('text=0 ₽').first
-        self.total_price = page.locator('text=89,990 ₽').first
+        # Строки сводки с ценами: ищутся по подписи, а не по сумме, которая меняется.
+        # Берется последняя подпись - сводка расположена под формой
+        self.product_price = self._summary_row(page, PRICE_LABELS["product_price"])
+        self.delivery_price = self._summary_row(page, PRICE_LABELS["delivery_price"])
+        self.additional_services_price = self._summary_row(page, PRICE_LABELS["additional_services_price"])
+        self.total_price = self._summary_row(page, PRICE_LABELS["total_price"])
         
         # Модальное окно подтверждения
         self.confirmation_modal = page.locator('h3:has-text("Подтверждение заказа")')
     
+    @staticmethod
+    def _summary_row(page: Union[Page, AsyncPage], variants: tuple[str, ...]):
+        """Строка сводки заказа с подписью, начинающейся с одного из вариантов"""
+        return page.get_by_text(price_label_pattern(variants)).last.locator("xpath=..")
+    
+    @staticmethod
+    def _price_change_query(previous: PriceBreakdown, timeout: int) -> dict:
+        """Параметры WAIT_PRICE_CHANGE_JS"""
+        return {"labels": PRICE_LABELS, "previous": previous.as_previous(), "timeout": timeout}
+    
+    @staticmethod
+    def _region_query(region: str, timeout: int) -> dict:
+        """Параметры ARM_REGION_JS"""
+        if region not in WATCH_REGIONS:
+            raise ValueError(f"Неизвестная область {region!r}, есть: {', '.join(WATCH_REGIONS)}")
+        return {
+            "region": region,
+            "labels": PRICE_LABELS,
+            "errorSelector": VALIDATION_ERROR_SELECTOR,
+            "timeout": timeout,
+        }
+    
+    @staticmethod
+    def fill_operations(order: OrderData) -> list[tuple[str, str, Any]]:
+        """Превращает описание заказа в список операций над полями формы"""
+        operations = []
+        for attr, kind, selector in ORDER_FIELDS:
+            value = getattr(order, attr)
+            if value is None:
+                continue
+            if kind == "radio":
+                operations.append(("radio", selector.format(value), True))
+            else:
+                operations.append((kind, selector, value))
+        return operations
+    
+    @staticmethod
+    def snapshot_from_state(state: dict) -> FormSnapshot:
+        """Собирает снимок из состояния формы, прочитанного в странице"""
+        state["disabled"] = frozenset(state["disabled"])
+        return FormSnapshot(**state)
+    
+    @staticmethod
+    def _validation_query(wait_until_stable: bool, quiet_ms: int, timeout: int) -> dict:
+        """Параметры VALIDATION_ERRORS_JS"""
+        return {
+            "selector": VALIDATION_ERROR_SELECTOR,
+            "waitStable": wait_until_stable,
+            "quietMs": quiet_ms,
+            "timeout": timeout,
+        }
+
+
+class OrderPage(BaseOrderPage):
+    """Класс для работы со страницей оформления заказа"""
+    
     def fill_contact_info(self, first_name: str, last_name: str, email: str, phone: str) -> None:
         """Заполняет контактную информацию"""
         self.first_name_input.fill(first_name)
@@ -98,6 +586,27 @@ class OrderPage:
         if newsletter:
             self.newsletter.check()
     
+    def fill_order(self, order: OrderData, batch: bool = True) -> None:
+        """Заполняет форму по описанию заказа
+
+        В режиме batch все поля выставляются одним вызовом в странице.
+        С batch=False поля заполняются по одному через Playwright - для тестов,
+        которые проверяют настоящий путь ввода.
+        """
+        operations = self.fill_operations(order)
+        if batch:
+            self.page.evaluate(FILL_ORDER_JS, operations)
+            return
+
+        for kind, selector, value in operations:
+            field = self.page.locator(selector)
+            if kind == "text":
+                field.fill(value)
+            elif kind == "select":
+                field.select_option(value)
+            else:
+                field.set_checked(value)
+    
     def add_comment(self, comment: str) -> None:
         """Добавляет комментарий к заказу"""
         self.comment_textarea.fill(comment)
@@ -115,14 +624,55 @@ class OrderPage:
         self.save_draft_btn.click()
     
     def get_total_price(self) -> str:
-        """Получает итоговую цену"""
-        return self.total_price.text_content()
+        """Получает итоговую цену в том виде, в каком она показана"""
+        return self.page.evaluate(READ_PRICES_JS, {"total_price": PRICE_LABELS["total_price"]})["total_price"]
+    
+    def get_price_breakdown(self) -> PriceBreakdown:
+        """Читает цены из сводки заказа за один вызов в странице"""
+        return PriceBreakdown.from_prices(self.page.evaluate(READ_PRICES_JS, PRICE_LABELS))
+    
+    def wait_for_price_change(self, previous: PriceBreakdown, timeout: int = 5000) -> PriceBreakdown:
+        """Ждет, пока цены в сводке станут отличаться от previous, и возвращает новые
+
+        Ожидание идет в странице через MutationObserver, без опроса из теста.
+        """
+        prices = self.page.evaluate(WAIT_PRICE_CHANGE_JS, self._price_change_query(previous, timeout))
+        return PriceBreakdown.from_prices(prices)
+    
+    @contextmanager
+    def watch_region(self, region: str, timeout: int = 5000) -> Iterator[RegionChange]:
+        """Ждет изменения области (prices, payment, errors) после действий внутри блока
+
+        Ожидание идет в странице через MutationObserver: два вызова на весь
+        блок вместо опроса. В elapsed_ms записывается время от первого
+        события ввода до изменения - задержка пересчета страницы.
+        """
+        change = RegionChange(region)
+        self.page.evaluate(ARM_REGION_JS, self._region_query(region, timeout))
+        yield change
+        change.elapsed_ms = self.page.evaluate(REGION_CHANGE_JS, region)
+    
+    def snapshot(self) -> FormSnapshot:
+        """Снимает состояние всей формы и цены за один вызов в странице"""
+        state = self.page.evaluate(SNAPSHOT_JS, [ORDER_FIELDS, PRICE_LABELS])
+        return self.snapshot_from_state(state)
     
     def is_confirmation_modal_visible(self) -> bool:
         """Проверяет, видно ли модальное окно подтверждения"""
         return self.confirmation_modal.is_visible()
     
-    def get_validation_errors(self) -> list[str]:
+    def collect_validation_errors(self, wait_until_stable: bool = False, quiet_ms: int = 200,
+                                  timeout: int = 5000) -> list[ValidationError]:
+        """Собирает ошибки валидации (поле, текст, видимость) за один вызов в странице
+
+        С wait_until_stable ждет, пока набор ошибок перестанет меняться
+        quiet_ms миллисекунд, но не дольше timeout.
+        """
+        errors = self.page.evaluate(
+            VALIDATION_ERRORS_JS, self._validation_query(wait_until_stable, quiet_ms, timeout)
+        )
+        return [ValidationError(**error) for error in errors]
+    
+    def get_validation_errors(self, wait_until_stable: bool = False) -> list[str]:
         """Получает список ошибок валидации"""
-        error_elements = self.page.locator('.error, .invalid, [class*="error"]')
-        return [error.text_content() for error in error_elements.all() if error.text_content()]
+        return [error.message for error in self.collect_validation_errors(wait_until_stable)]
@@ -20,11 +20,3 @@ def get_viewport_config():
         "width": int(os.getenv("VIEWPORT_WIDTH", "1920")),
         "height": int(os.getenv("VIEWPORT_HEIGHT", "1080")),
     }
-
-
-def get_mobile_viewport_config():
-    """Возвращает конфигурацию мобильного viewport"""
-    return {
-        "width": int(os.getenv("MOBILE_WIDTH", "375")),
-        "height": int(os.getenv("MOBILE_HEIGHT", "667")),
-    }
@@ -6,31 +6,35 @@ import os
 import sys
 import subprocess
 import argparse
+import importlib.util
 from pathlib import Path
 
 
+# Наборы тестов: флаг run_tests.py -> маркер pytest
+SUITES = {
+    "smoke": "smoke",
+    "validation": "validation",
+    "delivery": "delivery",
+    "payment": "payment",
+    "mobile": "mobile",
+}
+
+RESULTS_PATH = Path("reports/results.json")
+
+
 def run_command(command, description):
-    """Выполняет команду и выводит результат"""
+    """Выполняет команду, вывод идет в консоль по мере выполнения"""
     print(f"\n{'='*50}")
     print(f"Выполняется: {description}")
     print(f"Команда: {command}")
-    print(f"{'='*50}")
+    print(f"{'='*50}", flush=True)
     
-    result = subprocess.run(command, shell=True, capture_output=True, text=True)
+    result = subprocess.run(command, shell=True)
     
     if result.returncode == 0:
         print("✅ Успешно выполнено")
-        if result.stdout:
-            print("Вывод:")
-            print(result.stdout)
     else:
         print("❌ Ошибка выполнения")
-        if result.stderr:
-            print("Ошибки:")
-            print(result.stderr)
-        if result.stdout:
-            print("Вывод:")
-            print(result.stdout)
     
     return result.returncode == 0
 
@@ -52,68 +56,122 @@ def install_dependencies():
     return True
 
 
-def run_smoke_tests():
-    """Запускает smoke тесты"""
-    return run_command(
-        "pytest -m smoke -v --tb=short",
-        "Запуск smoke тестов"
-    )
+def build_pytest_command(suites, parallel=False, engines=None, shard=None):
+    """Команда одного прогона pytest для выбранных наборов (без наборов - все тесты)"""
+    command = ["pytest", "-v", "--tb=short", f"--results-json={RESULTS_PATH}"]
+    if shard:
+        # Отчеты части собираются в общий командой --merge-shards
+        command.append(f"--shard {shard} --html=reports/report.html --self-contained-html")
+        if importlib.util.find_spec("allure_pytest") is not None:
+            command.append("--alluredir=reports/allure-results")
+    if suites:
+        command.append(f'-m "{" or ".join(SUITES[suite] for suite in suites)}"')
+    if parallel:
+        command.append("-n auto --dist loadgroup --duration-schedule")
+    elif engines:
+        command.append(f"-n {len(engines)} --dist loadgroup")
+    if engines:
+        command.append(f"--engines {','.join(engines)}")
+    return " ".join(command)
+
+
+def print_suite_summary(suites):
+    """Печатает итоги прогона по наборам тестов"""
+    from utils.results import read_results, summarize
 
+    if not RESULTS_PATH.is_file():
+        return
+    results = read_results(RESULTS_PATH)
+    rows = [(suite, summarize(results["tests"], SUITES[suite])) for suite in suites]
+    rows.append(("всего", summarize(results["tests"])))
+    print(f"\n{'набор':<12} {'пройдено':>9} {'упало':>6} {'пропущено':>10} {'тесты, с':>9}")
+    for name, summary in rows:
+        print(f"{name:<12} {summary['passed']:>9} {summary['failed']:>6} "
+              f"{summary['skipped']:>10} {summary['seconds']:>9.2f}")
+    print(f"Прогон: {results['duration']:.2f} с")
 
-def run_validation_tests():
-    """Запускает тесты валидации"""
-    return run_command(
-        "pytest -m validation -v --tb=short",
-        "Запуск тестов валидации"
-    )
 
+def run_test_session(suites, parallel=False, engines=None, shard=None):
+    """Запускает выбранные наборы тестов одной сессией pytest"""
+    description = f"Запуск тестов: {', '.join(suites)}" if suites else "Запуск всех тестов"
+    if shard:
+        description += f", часть {shard}"
+    if parallel:
+        description += " параллельно"
+    if engines:
+        description += f" в движках {', '.join(engines)}"
+    RESULTS_PATH.unlink(missing_ok=True)
+    success = run_command(build_pytest_command(suites, parallel, engines, shard), description)
+    print_suite_summary(suites)
+    return success
 
-def run_delivery_tests():
-    """Запускает тесты доставки"""
-    return run_command(
-        "pytest -m delivery -v --tb=short",
-        "Запуск тестов доставки"
-    )
 
+def merge_shard_reports(directories):
+    """Собирает отчеты частей прогона в общий"""
+    from utils.sharding import MERGED_DIR, merge_shards
+    from utils.results import summarize
+
+    merged = merge_shards([Path(directory) for directory in directories])
+    print(f"\n{'часть':<8} {'пройдено':>9} {'упало':>6} {'пропущено':>10} {'время, с':>9}")
+    for shard in merged["shards"]:
+        print(f"{shard['shard']:<8} {shard['passed']:>9} {shard['failed']:>6} "
+              f"{shard['skipped']:>10} {shard['duration']:>9.2f}")
+    total = summarize(merged["tests"])
+    print(f"Всего: пройдено {total['passed']}, упало {total['failed']}, пропущено {total['skipped']}; "
+          f"прогон {merged['duration']:.2f} с, последовательно было бы {merged['sequential_duration']:.2f} с")
+    for problem in merged["problems"]:
+        print(f"⚠️ {problem}")
+    for nodeid, outcomes in merged["duplicates"].items():
+        print(f"   {nodeid}: {', '.join(f'{shard} {outcome}' for shard, outcome in outcomes.items())}")
+    for nodeid in merged["missing"]:
+        print(f"   {nodeid}: ни в одной части")
+    print(f"Общий отчет: {MERGED_DIR}")
+    return total["failed"] == 0 and not merged["problems"]
+
+
+def record_har():
+    """Записывает HAR-слепок страницы заказа для офлайн-запуска"""
+    from playwright.sync_api import sync_playwright
+    from utils.har import record_har_bundle
+
+    print("Запись HAR-слепка страницы заказа...")
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        try:
+            bundle = record_har_bundle(browser)
+        finally:
+            browser.close()
+    manifest = bundle.read_manifest()
+    print(f"✅ Слепок {bundle.version} записан в {bundle.directory} ({manifest['entries']} запросов)")
+    return True
 
-def run_payment_tests():
-    """Запускает тесты оплаты"""
-    return run_command(
-        "pytest -m payment -v --tb=short",
-        "Запуск тестов оплаты"
-    )
 
+def run_load_test(rate, duration, concurrency):
+    """Запускает нагрузочный прогон сценария заказа"""
+    from utils.load_generator import LoadConfig, run_load
 
-def run_mobile_tests():
-    """Запускает мобильные тесты"""
-    return run_command(
-        "pytest tests/test_mobile_responsiveness.py -v --tb=short",
-        "Запуск мобильных тестов"
-    )
+    config = LoadConfig(rate=rate, duration=duration, concurrency=concurrency)
+    print(f"Нагрузка: {rate} заказов/с в течение {duration} с, не более {concurrency} контекстов...")
+    report = run_load(config)
+    print(report.format())
+    return report.completed > 0 and not report.errors
 
 
-def run_all_tests():
-    """Запускает все тесты"""
-    return run_command(
-        "pytest -v --tb=short",
-        "Запуск всех тестов"
-    )
+def profile_selectors(repeat, threshold):
+    """Профилирует селекторы страницы заказа"""
+    from utils.selector_profiler import format_selector_report, run_selector_profile
 
+    print(f"Профилирование селекторов OrderPage ({repeat} повторов)...")
+    print(format_selector_report(run_selector_profile(repeat=repeat, threshold=threshold)))
+    return True
 
-def run_parallel_tests():
-    """Запускает тесты параллельно"""
-    return run_command(
-        "pytest -n auto -v --tb=short",
-        "Запуск тестов параллельно"
-    )
 
+def show_timing_report(runs):
+    """Печатает отчет по базе длительностей тестов"""
+    from utils.timing import print_timing_report
 
-def run_with_browser(browser):
-    """Запускает тесты с указанным браузером"""
-    return run_command(
-        f"HEADLESS=false BROWSER={browser} pytest -v --tb=short",
-        f"Запуск тестов в браузере {browser}"
-    )
+    print_timing_report(runs=runs)
+    return True
 
 
 def main():
@@ -128,7 +186,28 @@ def main():
     parser.add_argument("--all", action="store_true", help="Запустить все тесты")
     parser.add_argument("--parallel", action="store_true", help="Запустить тесты параллельно")
     parser.add_argument("--browser", choices=["chromium", "firefox", "webkit"], help="Запустить в указанном браузере")
+    parser.add_argument("--engines", nargs="+", choices=["chromium", "firefox", "webkit"],
+                        help="Запустить тесты во всех указанных браузерах одновременно")
+    parser.add_argument("--shard", help="Выполнить часть прогона i/n, например 2/4")
+    parser.add_argument("--merge-shards", nargs="+", metavar="DIR",
+                        help="Собрать отчеты частей (каталоги reports машин) в reports/merged")
     parser.add_argument("--headless", action="store_true", help="Запустить в headless режиме")
+    parser.add_argument("--record-har", action="store_true", help="Записать HAR-слепок страницы заказа")
+    parser.add_argument("--offline", action="store_true", help="Запустить тесты на записанном HAR-слепке без сети")
+    parser.add_argument("--local", action="store_true", help="Запустить на локальной копии страницы заказа")
+    parser.add_argument("--route-profile", choices=["full", "functional", "minimal"],
+                        help="Профиль блокировки ресурсов страницы")
+    parser.add_argument("--load", action="store_true", help="Запустить нагрузочный прогон сценария заказа")
+    parser.add_argument("--load-rate", type=float, default=5.0, help="Частота прихода заказов в секунду")
+    parser.add_argument("--load-duration", type=float, default=60.0, help="Длительность нагрузки в секундах")
+    parser.add_argument("--load-concurrency", type=int, default=50, help="Максимум одновременных контекстов")
+    parser.add_argument("--profile-selectors", action="store_true",
+                        help="Замерить стоимость и стабильность селекторов OrderPage")
+    parser.add_argument("--selector-repeat", type=int, default=20, help="Число повторов замера селектора")
+    parser.add_argument("--selector-threshold", type=float, default=2.0,
+                        help="Во сколько раз селектор может быть медленнее структурной альтернативы")
+    parser.add_argument("--timing-report", action="store_true", help="Показать отчет по длительности тестов")
+    parser.add_argument("--runs", type=int, default=10, help="Число прогонов для отчета по длительности")
     
     args = parser.parse_args()
     
@@ -142,6 +221,18 @@ def main():
     else:
         os.environ["HEADLESS"] = "false"
     
+    if args.offline:
+        os.environ["HAR_MODE"] = "replay"
+
+    if args.local:
+        os.environ["LOCAL_SITE"] = "true"
+
+    if args.route_profile:
+        os.environ["ROUTE_PROFILE"] = args.route_profile
+    
+    if args.browser:
+        os.environ["BROWSER"] = args.browser
+    
     success = True
     
     if args.install:
@@ -150,29 +241,26 @@ def main():
             print("❌ Ошибка установки зависимостей")
             sys.exit(1)
     
-    if args.smoke:
-        success = run_smoke_tests() and success
-    
-    if args.validation:
-        success = run_validation_tests() and success
+    if args.record_har:
+        success = record_har() and success
     
-    if args.delivery:
-        success = run_delivery_tests() and success
+    if args.timing_report:
+        success = show_timing_report(args.runs) and success
     
-    if args.payment:
-        success = run_payment_tests() and success
+    if args.profile_selectors:
+        success = profile_selectors(args.selector_repeat, args.selector_threshold) and success
     
-    if args.mobile:
-        success = run_mobile_tests() and success
+    if args.merge_shards:
+        success = merge_shard_reports(args.merge_shards) and success
     
-    if args.parallel:
-        success = run_parallel_tests() and success
-    
-    if args.browser:
-        success = run_with_browser(args.browser) and success
+    if args.load:
+        success = run_load_test(args.load_rate, args.load_duration, args.load_concurrency) and success
     
-    if args.all or not any([args.smoke, args.validation, args.delivery, args.payment, args.mobile, args.parallel, args.browser]):
-        success = run_all_tests() and success
+    # Выбранные наборы выполняются одной сессией pytest с общим выражением маркеров
+    suites = [] if args.all else [suite for suite in SUITES if getattr(args, suite)]
+    if args.all or suites or args.parallel or args.browser or args.engines or args.shard or not any([
+            args.record_har, args.timing_report, args.load, args.profile_selectors, args.merge_shards]):
+        success = run_test_session(suites, args.parallel, args.engines, args.shard) and success
     
     if success:
         print("\n🎉 Все тесты выполнены успешно!")
@@ -1,16 +1,18 @@
 import pytest
 from playwright.sync_api import Page
 from pages.order_page import OrderPage
+from utils.checkpoint import FormCheckpoints
 
 
 class BaseTest:
     """Базовый класс для всех тестов"""
     
     @pytest.fixture(autouse=True)
-    def setup(self, order_page: Page):
+    def setup(self, order_page: Page, form_checkpoints: FormCheckpoints):
         """Настройка для каждого теста"""
         self.page = order_page
         self.order_page = OrderPage(order_page)
+        self.checkpoints = form_checkpoints
     
     def take_screenshot(self, name: str) -> None:
         """Делает скриншот страницы"""
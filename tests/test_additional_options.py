@@ -8,18 +8,8 @@ class TestAdditionalOptions(BaseTest):
     @pytest.mark.regression
     def test_gift_wrapping_option(self):
         """Тест: опция подарочной упаковки"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_delivery_method("courier")
         self.order_page.select_payment_method("card")
@@ -28,28 +18,20 @@ class TestAdditionalOptions(BaseTest):
         assert not self.order_page.gift_wrapping.is_checked()
         
         # Выбираем подарочную упаковку
+        before = self.order_page.get_price_breakdown()
         self.order_page.set_additional_options(gift_wrapping=True)
         assert self.order_page.gift_wrapping.is_checked()
         
-        # Проверяем, что цена изменилась
-        total_price = self.order_page.get_total_price()
-        assert "500" in total_price  # +500 ₽ за подарочную упаковку
+        # Проверяем, что цена изменилась: +500 ₽ за подарочную упаковку
+        prices = self.order_page.wait_for_price_change(before)
+        assert prices.additional_services == 500
+        assert prices.total == before.total + 500
     
     @pytest.mark.regression
     def test_insurance_option(self):
         """Тест: опция страхования посылки"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_delivery_method("courier")
         self.order_page.select_payment_method("card")
@@ -58,28 +40,20 @@ class TestAdditionalOptions(BaseTest):
         assert not self.order_page.insurance.is_checked()
         
         # Выбираем страхование
+        before = self.order_page.get_price_breakdown()
         self.order_page.set_additional_options(insurance=True)
         assert self.order_page.insurance.is_checked()
         
-        # Проверяем, что цена изменилась
-        total_price = self.order_page.get_total_price()
-        assert "200" in total_price  # +200 ₽ за страхование
+        # Проверяем, что цена изменилась: +200 ₽ за страхование
+        prices = self.order_page.wait_for_price_change(before)
+        assert prices.additional_services == 200
+        assert prices.total == before.total + 200
     
     @pytest.mark.regression
     def test_newsletter_option(self):
         """Тест: опция подписки на рассылку"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_delivery_method("courier")
         self.order_page.select_payment_method("card")
@@ -91,30 +65,22 @@ class TestAdditionalOptions(BaseTest):
         self.order_page.set_additional_options(newsletter=True)
         assert self.order_page.newsletter.is_checked()
         
-        # Подписка не должна влиять на цену
-        total_price = self.order_page.get_total_price()
-        assert "89 990" in total_price  # Базовая цена товара
+        # Подписка не должна влиять на цену: итого равно базовой цене товара
+        prices = self.order_page.get_price_breakdown()
+        assert prices.additional_services == 0
+        assert prices.total == prices.product == 89990
     
     @pytest.mark.regression
     def test_multiple_additional_options(self):
         """Тест: выбор нескольких дополнительных опций"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_delivery_method("courier")
         self.order_page.select_payment_method("card")
         
         # Выбираем все дополнительные опции
+        before = self.order_page.get_price_breakdown()
         self.order_page.set_additional_options(
             gift_wrapping=True,
             insurance=True,
@@ -127,24 +93,15 @@ class TestAdditionalOptions(BaseTest):
         assert self.order_page.newsletter.is_checked()
         
         # Проверяем итоговую цену (89 990 + 500 + 200 = 90 690)
-        total_price = self.order_page.get_total_price()
-        assert "90 690" in total_price or "90690" in total_price
+        prices = self.order_page.wait_for_price_change(before)
+        assert prices.additional_services == 700
+        assert prices.total == 90690
     
     @pytest.mark.regression
     def test_additional_options_toggle(self):
         """Тест: переключение дополнительных опций"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_delivery_method("courier")
         self.order_page.select_payment_method("card")
@@ -168,18 +125,8 @@ class TestAdditionalOptions(BaseTest):
     @pytest.mark.regression
     def test_comment_field(self):
         """Тест: поле комментария к заказу"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_delivery_method("courier")
         self.order_page.select_payment_method("card")
@@ -197,18 +144,8 @@ class TestAdditionalOptions(BaseTest):
     @pytest.mark.regression
     def test_long_comment(self):
         """Тест: длинный комментарий к заказу"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_delivery_method("courier")
         self.order_page.select_payment_method("card")
@@ -223,18 +160,8 @@ class TestAdditionalOptions(BaseTest):
     @pytest.mark.regression
     def test_additional_options_with_different_delivery_methods(self):
         """Тест: дополнительные опции с разными способами доставки"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_payment_method("card")
         
@@ -0,0 +1,66 @@
+import pytest
+from pages.async_order_page import AsyncOrderPage
+from pages.order_page import OrderData
+
+
+CONTACTS = OrderData(
+    first_name="Тест",
+    last_name="Тестов",
+    email="test@example.com",
+    phone="+7 (999) 111-11-11",
+    city="Москва",
+    address="ул. Тестовая, д. 1"
+)
+
+
+@pytest.mark.async_scenario
+@pytest.mark.delivery
+@pytest.mark.parametrize("method, cash_enabled", [
+    ("courier", True),
+    ("pickup", False),
+    ("post", False),
+])
+async def test_cash_availability_by_delivery(async_order_page: AsyncOrderPage, method, cash_enabled):
+    """Сценарий: доступность оплаты наличными для каждого способа доставки"""
+    await async_order_page.fill_contact_info("Тест", "Тестов", "test@example.com", "+7 (999) 111-11-11")
+    await async_order_page.fill_address_info("Москва", "ул. Тестовая, д. 1")
+    await async_order_page.select_delivery_method(method)
+    
+    assert await async_order_page.cash_payment.is_enabled() == cash_enabled
+
+
+@pytest.mark.async_scenario
+@pytest.mark.payment
+@pytest.mark.parametrize("method", ["card", "cash", "bank"])
+async def test_payment_selection(async_order_page: AsyncOrderPage, method):
+    """Сценарий: выбор каждого способа оплаты при курьерской доставке"""
+    await async_order_page.fill_order(CONTACTS)
+    await async_order_page.select_delivery_method("courier")
+    await async_order_page.select_payment_method(method)
+    
+    snapshot = await async_order_page.snapshot()
+    assert snapshot.payment == method
+
+
+@pytest.mark.async_scenario
+@pytest.mark.form
+async def test_complete_order_form(async_order_page: AsyncOrderPage):
+    """Сценарий: полное заполнение формы заказа"""
+    order = OrderData(
+        first_name="Иван",
+        last_name="Петров",
+        email="ivan.petrov@example.com",
+        phone="+7 (999) 123-45-67",
+        city="Москва",
+        address="ул. Тверская, д. 1",
+        delivery="courier",
+        payment="card",
+        gift_wrapping=True,
+        insurance=True
+    )
+    await async_order_page.fill_order(order)
+    
+    snapshot = await async_order_page.snapshot()
+    assert snapshot.first_name == "Иван"
+    assert snapshot.delivery == "courier"
+    assert snapshot.gift_wrapping and snapshot.insurance
@@ -0,0 +1,49 @@
+import threading
+
+import utils.browser_server as browser_server
+from utils.browser_server import BrowserServerPool
+
+
+class SlowRestartServer:
+    """Сервер, который сразу "падает" и долго перезапускается"""
+
+    def __init__(self):
+        self.restarting = threading.Event()
+        self.release = threading.Event()
+        self.events: list[str] = []
+
+    def start(self) -> None:
+        pass
+
+    def is_healthy(self) -> bool:
+        return False
+
+    def restart(self) -> None:
+        self.restarting.set()
+        self.release.wait(5)
+        self.events.append("restart")
+
+    def stop(self) -> None:
+        self.events.append("stop")
+
+
+class TestBrowserServerPool:
+    """Тесты остановки набора браузерных серверов"""
+
+    def test_stop_waits_for_restart(self, monkeypatch):
+        """Тест: остановка дожидается начатого перезапуска и не оставляет запущенный сервер"""
+        monkeypatch.setattr(browser_server, "HEALTH_CHECK_INTERVAL", 0.01)
+        server = SlowRestartServer()
+        pool = BrowserServerPool(0)
+        pool.servers = [server]
+        pool.start()
+        assert server.restarting.wait(5)
+
+        stopper = threading.Thread(target=pool.stop)
+        stopper.start()
+        stopper.join(0.2)
+        assert stopper.is_alive() and server.events == []
+
+        server.release.set()
+        stopper.join(5)
+        assert server.events == ["restart", "stop"]
@@ -0,0 +1,53 @@
+import pytest
+
+from utils.context_configs import CONTEXT_CONFIGS, get_context_config, group_by_config
+
+
+class FakeItem:
+    """Минимальный тест с маркером context_config"""
+    
+    def __init__(self, nodeid: str, config: str = None):
+        self.nodeid = nodeid
+        self.marker = pytest.mark.context_config(config).mark if config else None
+    
+    def get_closest_marker(self, name):
+        return self.marker if name == "context_config" else None
+
+
+class TestContextConfigs:
+    """Тесты конфигураций контекста"""
+    
+    def test_desktop_matches_default_options(self):
+        """Тест: desktop не меняет параметры контекста по умолчанию"""
+        options = CONTEXT_CONFIGS["desktop"].options()
+        assert options["viewport"] == {"width": 1920, "height": 1080}
+        assert "is_mobile" not in options
+    
+    def test_mobile_options(self):
+        """Тест: мобильные конфигурации создают контекст сразу с нужным окном и касаниями"""
+        portrait = CONTEXT_CONFIGS["mobile_portrait"].options()
+        landscape = CONTEXT_CONFIGS["mobile_landscape"].options()
+        assert portrait["viewport"] == {"width": 375, "height": 667}
+        assert landscape["viewport"] == {"width": 667, "height": 375}
+        assert portrait["is_mobile"] and portrait["has_touch"]
+    
+    def test_marker_overrides_environment(self, monkeypatch):
+        """Тест: маркер теста важнее CONTEXT_CONFIG"""
+        monkeypatch.setenv("CONTEXT_CONFIG", "mobile_portrait")
+        assert get_context_config(FakeItem("a")).name == "mobile_portrait"
+        assert get_context_config(FakeItem("b", "desktop")).name == "desktop"
+        with pytest.raises(ValueError):
+            get_context_config(FakeItem("c", "tablet"))
+    
+    def test_items_grouped_by_config(self, monkeypatch):
+        """Тест: тесты одной конфигурации идут подряд, конфигурация по умолчанию - первой"""
+        monkeypatch.delenv("CONTEXT_CONFIG", raising=False)
+        items = [
+            FakeItem("m1", "mobile_portrait"),
+            FakeItem("d1"),
+            FakeItem("l1", "mobile_landscape"),
+            FakeItem("m2", "mobile_portrait"),
+            FakeItem("d2"),
+        ]
+        assert [item.nodeid for item in group_by_config(items)] == ["d1", "d2", "m1", "m2", "l1"]
+
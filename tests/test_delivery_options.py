@@ -1,5 +1,6 @@
 import pytest
 from tests.base_test import BaseTest
+from utils.perf_budget import price_shown
 
 
 class TestDeliveryOptions(BaseTest):
@@ -8,18 +9,8 @@ class TestDeliveryOptions(BaseTest):
     @pytest.mark.delivery
     def test_courier_delivery_selection(self):
         """Тест: выбор курьерской доставки"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         # Выбираем курьерскую доставку
         self.order_page.select_delivery_method("courier")
@@ -33,18 +24,8 @@ class TestDeliveryOptions(BaseTest):
     @pytest.mark.delivery
     def test_pickup_delivery_selection(self):
         """Тест: выбор самовывоза"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         # Выбираем самовывоз
         self.order_page.select_delivery_method("pickup")
@@ -58,18 +39,8 @@ class TestDeliveryOptions(BaseTest):
     @pytest.mark.delivery
     def test_post_delivery_selection(self):
         """Тест: выбор доставки почтой России"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         # Выбираем доставку почтой
         self.order_page.select_delivery_method("post")
@@ -83,18 +54,8 @@ class TestDeliveryOptions(BaseTest):
     @pytest.mark.delivery
     def test_delivery_method_switching(self):
         """Тест: переключение между способами доставки"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_payment_method("card")
         
@@ -115,51 +76,31 @@ class TestDeliveryOptions(BaseTest):
     @pytest.mark.delivery
     def test_delivery_price_calculation(self):
         """Тест: расчет стоимости доставки"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_payment_method("card")
         
         # Проверяем стоимость для курьерской доставки (бесплатно)
         self.order_page.select_delivery_method("courier")
-        delivery_price = self.order_page.delivery_price.text_content()
-        assert "0" in delivery_price or "бесплатно" in delivery_price.lower()
+        assert self.order_page.get_price_breakdown().delivery == 0
         
         # Проверяем стоимость для самовывоза (бесплатно)
         self.order_page.select_delivery_method("pickup")
-        delivery_price = self.order_page.delivery_price.text_content()
-        assert "0" in delivery_price or "бесплатно" in delivery_price.lower()
+        before = self.order_page.get_price_breakdown()
+        assert before.delivery == 0
         
         # Проверяем стоимость для доставки почтой (300 ₽)
         self.order_page.select_delivery_method("post")
-        delivery_price = self.order_page.delivery_price.text_content()
-        assert "300" in delivery_price
+        prices = self.order_page.wait_for_price_change(before)
+        assert prices.delivery == 300
+        assert prices.total == before.total + 300
     
     @pytest.mark.delivery
     def test_delivery_time_display(self):
         """Тест: отображение времени доставки"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_payment_method("card")
         
@@ -182,33 +123,51 @@ class TestDeliveryOptions(BaseTest):
     @pytest.mark.delivery
     def test_cash_payment_with_courier_delivery(self):
         """Тест: оплата наличными доступна только для курьерской доставки"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         # Выбираем курьерскую доставку
         self.order_page.select_delivery_method("courier")
         
         # Проверяем, что оплата наличными доступна
         assert self.order_page.cash_payment.is_enabled()
+        courier_state = self.order_page.snapshot()
         
-        # Переключаемся на самовывоз
-        self.order_page.select_delivery_method("pickup")
+        # Переключаемся на самовывоз и ждем, пока страница заблокирует наличные
+        with self.order_page.watch_region("payment"):
+            self.order_page.select_delivery_method("pickup")
         
         # Проверяем, что оплата наличными недоступна
         assert not self.order_page.cash_payment.is_enabled()
         
-        # Переключаемся на доставку почтой
-        self.order_page.select_delivery_method("post")
+        # Переключаемся на доставку почтой и ждем пересчета цен
+        with self.order_page.watch_region("prices"):
+            self.order_page.select_delivery_method("post")
         
         # Проверяем, что оплата наличными недоступна
         assert not self.order_page.cash_payment.is_enabled()
+        
+        # Между шагами изменились только доставка и доступность оплаты наличными
+        post_state = self.order_page.snapshot()
+        changes = courier_state.diff(post_state)
+        assert changes["delivery"] == ("courier", "post")
+        assert "payment:cash" in post_state.disabled
+        assert "first_name" not in changes
+    
+    @pytest.mark.delivery
+    @pytest.mark.perf_budget(ms=300, repeat=5)
+    def test_post_delivery_price_budget(self, perf_budget):
+        """Тест: стоимость доставки почтой пересчитывается в пределах бюджета"""
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
+        
+        self.order_page.select_delivery_method("courier")
+        self.order_page.select_payment_method("card")
+        
+        # От выбора почты до отображения 300 ₽ в сводке заказа
+        perf_budget.measure(
+            "почта -> стоимость доставки 300 ₽",
+            action=lambda: self.order_page.select_delivery_method("post"),
+            until=price_shown("delivery_price", "300 ₽"),
+            reset=lambda: self.order_page.select_delivery_method("courier"),
+        )
@@ -0,0 +1,67 @@
+import pytest
+from pages.async_order_page import AsyncOrderPage
+from pages.order_page import OrderData
+from utils.device_matrix import DeviceProfile
+
+
+ORDER = OrderData(
+    first_name="Мобильный",
+    last_name="Тест",
+    email="device@example.com",
+    phone="+7 (999) 555-55-55",
+    city="Москва",
+    address="ул. Устройств, д. 1",
+    delivery="courier",
+    payment="card"
+)
+
+# Ориентация окна и поддержка касаний, как их видит страница
+SCREEN_JS = """
+() => ({
+    landscape: window.innerWidth > window.innerHeight,
+    touch: navigator.maxTouchPoints > 0,
+})
+"""
+
+
+@pytest.mark.async_scenario
+@pytest.mark.device_matrix
+@pytest.mark.regression
+async def test_form_layout_on_device(async_order_page: AsyncOrderPage, device: DeviceProfile):
+    """Сценарий: основные элементы формы видны на устройстве в нужной ориентации"""
+    screen = await async_order_page.page.evaluate(SCREEN_JS)
+    assert screen["landscape"] == device.landscape
+    
+    for locator in (async_order_page.first_name_input, async_order_page.city_select,
+                    async_order_page.courier_delivery, async_order_page.card_payment,
+                    async_order_page.gift_wrapping, async_order_page.submit_order_btn):
+        assert await locator.is_visible()
+
+
+@pytest.mark.async_scenario
+@pytest.mark.device_matrix
+@pytest.mark.regression
+async def test_options_by_touch_or_click(async_order_page: AsyncOrderPage, device: DeviceProfile):
+    """Сценарий: опции выбираются касанием на сенсорных устройствах и кликом на остальных"""
+    screen = await async_order_page.page.evaluate(SCREEN_JS)
+    if device.has_touch is False:
+        assert not screen["touch"]
+    
+    for option in (async_order_page.gift_wrapping, async_order_page.insurance):
+        if screen["touch"]:
+            await option.tap()
+        else:
+            await option.click()
+        assert await option.is_checked()
+
+
+@pytest.mark.async_scenario
+@pytest.mark.device_matrix
+@pytest.mark.form
+async def test_order_confirmation_on_device(async_order_page: AsyncOrderPage, device: DeviceProfile):
+    """Сценарий: заказ доходит до окна подтверждения на устройстве"""
+    await async_order_page.fill_order(ORDER)
+    await async_order_page.submit_order()
+    
+    await async_order_page.confirmation_modal.wait_for()
+    assert await async_order_page.confirm_order_btn.is_visible()
@@ -0,0 +1,31 @@
+import pytest
+
+from utils.device_matrix import DEVICE_MATRIX, DeviceProfile, select_devices
+
+
+class TestDeviceMatrix:
+    """Тесты матрицы устройств"""
+    
+    DEVICES = {
+        "iPad (gen 7) landscape": {
+            "user_agent": "iPad", "viewport": {"width": 1080, "height": 810},
+            "device_scale_factor": 2, "is_mobile": True, "has_touch": True,
+            "default_browser_type": "webkit",
+        },
+    }
+    
+    def test_device_config_from_descriptor(self):
+        """Тест: конфигурация строится по дескриптору, касания переопределяются"""
+        device = DeviceProfile("ipad_no_touch", "iPad (gen 7) landscape", has_touch=False)
+        options = device.context_config(self.DEVICES).options()
+        assert device.landscape
+        assert options["viewport"] == {"width": 1080, "height": 810}
+        assert options["is_mobile"] and "has_touch" not in options
+        assert "default_browser_type" not in options
+    
+    def test_select_devices(self):
+        """Тест: маркер без имен берет всю матрицу, неизвестное имя - ошибка"""
+        assert select_devices(()) == DEVICE_MATRIX
+        assert [device.name for device in select_devices(("pixel_7",))] == ["pixel_7"]
+        with pytest.raises(ValueError):
+            select_devices(("nokia_3310",))
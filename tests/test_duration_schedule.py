@@ -0,0 +1,103 @@
+import json
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Каждый тест записывает свой nodeid (с суффиксом группы xdist) и воркер
+PLACEMENT_CONFTEST = """
+import json
+import os
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def record_placement(request):
+    yield
+    placement = os.path.join(str(request.config.rootpath), "placement")
+    os.makedirs(placement, exist_ok=True)
+    name = request.node.name
+    with open(os.path.join(placement, name + ".json"), "w") as file:
+        json.dump({"nodeid": request.node.nodeid, "worker": os.environ.get("PYTEST_XDIST_WORKER")}, file)
+"""
+
+SAMPLE_TESTS = """
+def test_slow():
+    pass
+
+
+def test_fast_0():
+    pass
+
+
+def test_fast_1():
+    pass
+
+
+def test_fast_2():
+    pass
+
+
+def test_fast_3():
+    pass
+"""
+
+# Те же тесты, быстрые помечены маркером fast
+MARKED_SAMPLE_TESTS = "import pytest\n" + SAMPLE_TESTS.replace("def test_fast", "@pytest.mark.fast\ndef test_fast")
+
+
+@pytest.fixture
+def scheduled_project(pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch) -> pytest.Pytester:
+    """Проект с историей: test_slow длиннее всех быстрых тестов вместе"""
+    monkeypatch.setenv("PYTHONPATH", str(ROOT))
+    pytester.makeconftest(PLACEMENT_CONFTEST)
+    pytester.makepyfile(test_sample=SAMPLE_TESTS)
+    history = {"test_sample.py::test_slow": 10.0}
+    history.update({f"test_sample.py::test_fast_{index}": 1.0 for index in range(4)})
+    reports = pytester.path / "reports"
+    reports.mkdir()
+    (reports / "durations.json").write_text(json.dumps(history), encoding="utf-8")
+    return pytester
+
+
+def read_placement(pytester: pytest.Pytester) -> dict[str, dict]:
+    return {path.stem: json.loads(path.read_text()) for path in (pytester.path / "placement").glob("*.json")}
+
+
+class TestDurationSchedule:
+    """Интеграционные тесты распределения по длительности под pytest-xdist"""
+
+    def test_lpt_groups_reach_xdist(self, scheduled_project: pytest.Pytester):
+        """Тест: группы LPT попадают в nodeid, долгий тест получает отдельный воркер"""
+        result = scheduled_project.runpytest_subprocess(
+            "-p", "utils.durations", "-n", "2", "--dist", "loadgroup", "--duration-schedule"
+        )
+        result.assert_outcomes(passed=5)
+        placement = read_placement(scheduled_project)
+        assert all("@lpt" in entry["nodeid"] for entry in placement.values())
+        slow = placement.pop("test_slow")
+        fast_groups = {entry["nodeid"].rsplit("@", 1)[1] for entry in placement.values()}
+        fast_workers = {entry["worker"] for entry in placement.values()}
+        assert len(fast_groups) == 1 and len(fast_workers) == 1
+        assert slow["nodeid"].rsplit("@", 1)[1] not in fast_groups
+        assert slow["worker"] not in fast_workers
+
+    def test_lpt_bins_only_selected_tests(self, scheduled_project: pytest.Pytester):
+        """Тест: с -m раскладываются только отобранные тесты, и работу получают оба воркера"""
+        scheduled_project.makeini("[pytest]\nmarkers =\n    fast: быстрый тест\n")
+        scheduled_project.makepyfile(test_sample=MARKED_SAMPLE_TESTS)
+        result = scheduled_project.runpytest_subprocess(
+            "-p", "utils.durations", "-n", "2", "--dist", "loadgroup", "--duration-schedule", "-m", "fast"
+        )
+        result.assert_outcomes(passed=4)
+        placement = read_placement(scheduled_project)
+        assert "test_slow" not in placement
+        groups = {}
+        for entry in placement.values():
+            groups.setdefault(entry["nodeid"].rsplit("@", 1)[1], set()).add(entry["worker"])
+        assert len(groups) == 2
+        assert all(len(workers) == 1 for workers in groups.values())
+        assert {entry["worker"] for entry in placement.values()} == {"gw0", "gw1"}
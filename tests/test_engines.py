@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from utils.browser_server import ENDPOINTS_ENV, get_worker_endpoint
+from utils.config import get_browser_engine
+from utils.context_configs import CONTEXT_CONFIGS
+from utils.engines import ENGINE_PROPERTY, EngineSummary, parse_engines
+
+
+class FakeReport:
+    """Минимальный отчет фазы теста с движком в user_properties"""
+
+    def __init__(self, nodeid: str, engine: str, when: str, outcome: str, start: float, stop: float):
+        self.nodeid = nodeid
+        self.when = when
+        self.outcome = outcome
+        self.passed = outcome == "passed"
+        self.failed = outcome == "failed"
+        self.skipped = outcome == "skipped"
+        self.start = start
+        self.stop = stop
+        self.duration = stop - start
+        self.user_properties = [(ENGINE_PROPERTY, engine)]
+
+
+class TestEngines:
+    """Тесты выбора движка и сводки по движкам"""
+
+    def test_browser_engine_from_environment(self, monkeypatch):
+        """Тест: движок берется из BROWSER, неизвестный отклоняется"""
+        monkeypatch.delenv("BROWSER", raising=False)
+        assert get_browser_engine() == "chromium"
+        monkeypatch.setenv("BROWSER", "WebKit")
+        assert get_browser_engine() == "webkit"
+        monkeypatch.setenv("BROWSER", "opera")
+        with pytest.raises(ValueError):
+            get_browser_engine()
+
+    def test_parse_engines(self):
+        """Тест: список движков без повторов в порядке перечисления"""
+        assert parse_engines("firefox, chromium,firefox") == ["firefox", "chromium"]
+        with pytest.raises(ValueError):
+            parse_engines("chromium,opera")
+
+    def test_firefox_context_without_is_mobile(self):
+        """Тест: в Firefox мобильная конфигурация не передает is_mobile"""
+        options = CONTEXT_CONFIGS["mobile_portrait"].options("firefox")
+        assert "is_mobile" not in options
+        assert options["has_touch"]
+        assert CONTEXT_CONFIGS["mobile_portrait"].options("webkit")["is_mobile"]
+
+    def test_worker_endpoint_of_engine(self, monkeypatch):
+        """Тест: воркер подключается к серверу своего движка"""
+        monkeypatch.setenv(ENDPOINTS_ENV, "ws://localhost:1/chromium-0,ws://localhost:2/firefox-0,"
+                                          "ws://localhost:3/firefox-1")
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+        assert get_worker_endpoint("firefox") == "ws://localhost:3/firefox-1"
+        assert get_worker_endpoint("chromium") == "ws://localhost:1/chromium-0"
+        assert get_worker_endpoint("webkit") is None
+
+    def test_summary_by_engine(self, tmp_path):
+        """Тест: сводка считает исходы и окно выполнения по движкам"""
+        summary = EngineSummary(config=None, path=tmp_path / "engines.json")
+        reports = [
+            FakeReport("t.py::a[chromium]", "chromium", "setup", "passed", 0.0, 0.5),
+            FakeReport("t.py::a[chromium]", "chromium", "call", "passed", 0.5, 2.0),
+            FakeReport("t.py::a[firefox]", "firefox", "call", "failed", 0.2, 3.0),
+            FakeReport("t.py::a[firefox]", "firefox", "teardown", "passed", 3.0, 3.5),
+            FakeReport("t.py::b[firefox]@firefox", "firefox", "setup", "skipped", 3.5, 3.6),
+        ]
+        for report in reports:
+            summary.pytest_runtest_logreport(report)
+        result = summary.as_dict()
+        assert result["engines"]["chromium"]["passed"] == 1
+        assert result["engines"]["firefox"]["failed"] == 1
+        assert result["engines"]["firefox"]["skipped"] == 1
+        assert result["engines"]["firefox"]["failures"] == ["t.py::a[firefox]"]
+        assert result["engines"]["firefox"]["wall_seconds"] == pytest.approx(3.4)
+        assert result["wall_seconds"] == pytest.approx(3.6)
+        json.dumps(result)
@@ -12,9 +12,19 @@ class TestFormValidation(BaseTest):
         self.order_page.submit_order()
         
         # Проверяем, что появились ошибки валидации
-        errors = self.order_page.get_validation_errors()
+        errors = self.order_page.get_validation_errors(wait_until_stable=True)
         assert len(errors) > 0, "Должны появиться ошибки валидации для обязательных полей"
     
+    @pytest.mark.validation
+    def test_required_fields_errors_structure(self):
+        """Тест: ошибки валидации содержат поле и видимы пользователю"""
+        self.order_page.submit_order()
+        
+        errors = self.order_page.collect_validation_errors(wait_until_stable=True)
+        assert errors, "Должны появиться ошибки валидации для обязательных полей"
+        assert any(error.visible for error in errors)
+        assert any(error.field == "firstName" for error in errors)
+    
     @pytest.mark.validation
     def test_email_validation(self):
         """Тест: валидация email адреса"""
@@ -38,7 +48,7 @@ class TestFormValidation(BaseTest):
         self.order_page.submit_order()
         
         # Проверяем наличие ошибки валидации email
-        errors = self.order_page.get_validation_errors()
+        errors = self.order_page.get_validation_errors(wait_until_stable=True)
         email_error = any("email" in error.lower() or "почта" in error.lower() for error in errors)
         assert email_error, "Должна появиться ошибка валидации для невалидного email"
     
@@ -65,7 +75,7 @@ class TestFormValidation(BaseTest):
         self.order_page.submit_order()
         
         # Проверяем наличие ошибки валидации телефона
-        errors = self.order_page.get_validation_errors()
+        errors = self.order_page.get_validation_errors(wait_until_stable=True)
         phone_error = any("телефон" in error.lower() or "phone" in error.lower() for error in errors)
         assert phone_error, "Должна появиться ошибка валидации для невалидного телефона"
     
@@ -92,7 +102,7 @@ class TestFormValidation(BaseTest):
         self.order_page.submit_order()
         
         # Проверяем наличие ошибок для пустых полей
-        errors = self.order_page.get_validation_errors()
+        errors = self.order_page.get_validation_errors(wait_until_stable=True)
         assert len(errors) > 0, "Должны появиться ошибки для пустых обязательных полей"
     
     @pytest.mark.validation
@@ -119,7 +129,7 @@ class TestFormValidation(BaseTest):
         self.order_page.submit_order()
         
         # Проверяем наличие ошибки для города
-        errors = self.order_page.get_validation_errors()
+        errors = self.order_page.get_validation_errors(wait_until_stable=True)
         city_error = any("город" in error.lower() or "city" in error.lower() for error in errors)
         assert city_error, "Должна появиться ошибка валидации для невыбранного города"
     
@@ -146,7 +156,7 @@ class TestFormValidation(BaseTest):
         self.order_page.submit_order()
         
         # Проверяем наличие ошибки для способа доставки
-        errors = self.order_page.get_validation_errors()
+        errors = self.order_page.get_validation_errors(wait_until_stable=True)
         delivery_error = any("доставк" in error.lower() or "delivery" in error.lower() for error in errors)
         assert delivery_error, "Должна появиться ошибка валидации для невыбранного способа доставки"
     
@@ -173,6 +183,6 @@ class TestFormValidation(BaseTest):
         self.order_page.submit_order()
         
         # Проверяем наличие ошибки для способа оплаты
-        errors = self.order_page.get_validation_errors()
+        errors = self.order_page.get_validation_errors(wait_until_stable=True)
         payment_error = any("оплат" in error.lower() or "payment" in error.lower() for error in errors)
         assert payment_error, "Должна появиться ошибка валидации для невыбранного способа оплаты"
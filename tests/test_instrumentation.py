@@ -0,0 +1,31 @@
+from utils.instrumentation import CallHistogram, CallRecorder
+
+
+class TestInstrumentation:
+    """Тесты учета вызовов Playwright"""
+
+    def test_histogram_buckets_and_percentiles(self):
+        """Тест: задержки раскладываются по степеням двойки в микросекундах"""
+        histogram = CallHistogram()
+        for elapsed_us in (3, 3, 3, 3, 3, 3, 3, 3, 3, 900):
+            histogram.add(elapsed_us * 1000)
+        assert histogram.count == 10
+        assert histogram.percentile_us(50) == 4
+        assert histogram.percentile_us(95) == 1024
+
+    def test_merge_from_report(self):
+        """Тест: гистограмма из отчета воркера складывается с накопленной"""
+        recorder = CallRecorder()
+        recorder.add("Locator.click", 5_000)
+        recorder.add("Locator.click", 7_000)
+        recorder.add("Page.goto", 300_000)
+        assert recorder.calls == 3
+
+        # Ключи корзин приходят строками после сериализации отчета
+        total = CallHistogram()
+        payload = recorder.methods["Locator.click"].as_dict()
+        total.merge({**payload, "buckets": {str(k): v for k, v in payload["buckets"].items()}})
+        total.merge(payload)
+        assert total.count == 4
+        assert total.total_ns == 24_000
+        assert total.buckets == {3: 4}
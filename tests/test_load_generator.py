@@ -0,0 +1,74 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from playwright.sync_api import sync_playwright
+
+from utils.config import get_browser_engine, get_launch_options
+from utils.har import record_har_bundle
+from utils.load_generator import (
+    LoadConfig,
+    LoadGenerator,
+    LoadReport,
+    arrival_offsets,
+    is_order_response,
+    load_order,
+)
+from utils.local_site import serve_local_site
+
+
+def run_load_on_har(monkeypatch, tmp_path) -> LoadReport:
+    """Записывает слепок локальной копии, останавливает ее и гоняет нагрузку на слепке"""
+    monkeypatch.setenv("HAR_DIR", str(tmp_path))
+    monkeypatch.delenv("LOCAL_SITE", raising=False)
+    monkeypatch.delenv("ROUTE_PROFILE", raising=False)
+    with serve_local_site() as site:
+        with sync_playwright() as p:
+            browser = p[get_browser_engine()].launch(**get_launch_options())
+            bundle = record_har_bundle(browser, url=site.url, version="load")
+            browser.close()
+    # Сервер остановлен: страницу отдает только слепок, POST /api/orders в нем нет
+    monkeypatch.setenv("BASE_URL", site.url)
+    return asyncio.run(LoadGenerator(LoadConfig(rate=2, duration=1, concurrency=2), bundle).run())
+
+
+class TestLoadGenerator:
+    """Тесты расчетов нагрузочного режима"""
+    
+    def test_arrivals_follow_rate(self):
+        """Тест: заказы приходят с постоянной частотой независимо от выполнения"""
+        assert arrival_offsets(rate=4, duration=1) == [0.0, 0.25, 0.5, 0.75]
+        assert arrival_offsets(rate=0.5, duration=10) == [0.0, 2.0, 4.0, 6.0, 8.0]
+    
+    def test_report_error_rate_and_throughput(self):
+        """Тест: доля ошибок считается по попыткам шага, пропускная способность - по завершенным"""
+        report = LoadReport(completed=3, elapsed=1.5)
+        for seconds in (0.1, 0.2, 0.3):
+            report.add_latency("submit", seconds)
+        report.add_error("submit")
+        
+        assert report.error_rate("submit") == 0.25
+        assert report.error_rate("confirm") == 0.0
+        assert report.throughput == 2.0
+        assert "submit" in report.format()
+    
+    def test_orders_are_unique(self):
+        """Тест: у каждого прихода свои данные заказа"""
+        assert load_order(1).email != load_order(2).email
+    
+    def test_order_response_matched(self):
+        """Тест: подтверждение ждет ответа на POST /api/orders, а не на другие запросы"""
+        def response(method, url):
+            return SimpleNamespace(request=SimpleNamespace(method=method), url=url)
+        assert is_order_response(response("POST", "http://127.0.0.1:8000/api/orders"))
+        assert not is_order_response(response("GET", "http://127.0.0.1:8000/api/orders"))
+        assert not is_order_response(response("POST", "http://127.0.0.1:8000/api/drafts"))
+    
+    def test_orders_complete_on_har_bundle(self, monkeypatch, tmp_path):
+        """Тест: на HAR-слепке заказы подтверждаются по закрытию окна, без ответа на отправку"""
+        # Sync API и asyncio.run не уживаются в одном потоке с браузерными фикстурами
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            report = executor.submit(run_load_on_har, monkeypatch, tmp_path).result()
+        
+        assert report.errors == {}
+        assert report.started == report.completed == 2
@@ -0,0 +1,71 @@
+import json
+import os
+import time
+import urllib.request
+
+import pytest
+
+from utils.local_site import LocalSite, parse_latency, serve_local_site
+
+
+@pytest.fixture
+def site():
+    """Локальная копия страницы заказа на свободном порту"""
+    site = LocalSite(latency={"/api/orders": 0.05}).start()
+    yield site
+    site.stop()
+
+
+def post_order(site, order):
+    """Отправляет заказ так же, как кнопка подтверждения"""
+    request = urllib.request.Request(
+        site.url + "api/orders",
+        data=json.dumps(order).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request) as response:
+        return response.status, json.loads(response.read())
+
+
+class TestLocalSite:
+    """Тесты локальной копии страницы заказа"""
+    
+    def test_serves_order_page(self, site):
+        """Тест: страница заказа и ее ресурсы отдаются сервером"""
+        with urllib.request.urlopen(site.url) as response:
+            html = response.read().decode()
+        assert 'name="firstName"' in html
+        assert "Оформить заказ" in html
+        with urllib.request.urlopen(site.url + "app.js") as response:
+            assert response.status == 200
+    
+    def test_orders_are_numbered(self, site):
+        """Тест: заказы получают последовательные номера"""
+        assert post_order(site, {"firstName": "Иван"}) == (201, {"id": 1})
+        assert post_order(site, {"firstName": "Анна"}) == (201, {"id": 2})
+        assert [order["firstName"] for order in site.orders] == ["Иван", "Анна"]
+    
+    def test_latency_per_endpoint(self, site):
+        """Тест: задержка применяется только к настроенному адресу"""
+        start = time.perf_counter()
+        post_order(site, {})
+        assert time.perf_counter() - start >= 0.05
+    
+    def test_parse_latency(self):
+        """Тест: задержки задаются в миллисекундах по адресам"""
+        assert parse_latency("/=50, /api/orders=200,*=10") == {"/": 0.05, "/api/orders": 0.2, "*": 0.01}
+        assert parse_latency("") == {}
+        with pytest.raises(ValueError):
+            parse_latency("50")
+    
+    def test_serve_restores_base_url(self, monkeypatch):
+        """Тест: на время блока BASE_URL указывает на копию, затем возвращается заданный пользователем"""
+        monkeypatch.setenv("BASE_URL", "https://stage.example.com/")
+        with serve_local_site() as site:
+            assert os.environ["BASE_URL"] == site.url
+        assert os.environ["BASE_URL"] == "https://stage.example.com/"
+        monkeypatch.delenv("BASE_URL")
+        with serve_local_site():
+            pass
+        assert "BASE_URL" not in os.environ
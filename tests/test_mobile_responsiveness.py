@@ -3,16 +3,11 @@ from playwright.sync_api import Page
 from tests.base_test import BaseTest
 
 
+@pytest.mark.mobile
+@pytest.mark.context_config("mobile_portrait")  # iPhone SE размер
 class TestMobileResponsiveness(BaseTest):
     """Тесты мобильной адаптивности"""
     
-    @pytest.fixture(autouse=True)
-    def setup_mobile(self, context):
-        """Настройка мобильного контекста"""
-        # Устанавливаем мобильный viewport
-        context.set_viewport_size({"width": 375, "height": 667})  # iPhone SE размер
-        yield context
-    
     @pytest.mark.regression
     def test_mobile_form_layout(self):
         """Тест: макет формы на мобильном устройстве"""
@@ -118,14 +113,15 @@ class TestMobileResponsiveness(BaseTest):
         self.order_page.add_comment("Мобильный заказ")
         
         # Проверяем, что форма заполнена корректно
-        assert self.order_page.first_name_input.input_value() == "Мобильный"
-        assert self.order_page.last_name_input.input_value() == "Тест"
-        assert self.order_page.email_input.input_value() == "mobile@example.com"
-        assert self.order_page.phone_input.input_value() == "+7 (999) 555-55-55"
-        assert self.order_page.city_select.input_value() == "Санкт-Петербург"
-        assert self.order_page.address_input.input_value() == "Невский проспект, д. 1"
-        assert self.order_page.gift_wrapping.is_checked()
-        assert self.order_page.newsletter.is_checked()
+        snapshot = self.order_page.snapshot()
+        assert snapshot.first_name == "Мобильный"
+        assert snapshot.last_name == "Тест"
+        assert snapshot.email == "mobile@example.com"
+        assert snapshot.phone == "+7 (999) 555-55-55"
+        assert snapshot.city == "Санкт-Петербург"
+        assert snapshot.address == "Невский проспект, д. 1"
+        assert snapshot.gift_wrapping
+        assert snapshot.newsletter
     
     @pytest.mark.regression
     def test_mobile_price_display(self):
@@ -136,8 +132,7 @@ class TestMobileResponsiveness(BaseTest):
         assert self.order_page.total_price.is_visible()
         
         # Проверяем базовую цену товара
-        product_price = self.order_page.product_price.text_content()
-        assert "89 990" in product_price or "89990" in product_price
+        assert self.order_page.get_price_breakdown().product == 89990
     
     @pytest.mark.regression
     def test_mobile_scrolling(self):
@@ -175,11 +170,9 @@ class TestMobileResponsiveness(BaseTest):
         assert self.order_page.insurance.is_checked()
     
     @pytest.mark.regression
+    @pytest.mark.context_config("mobile_landscape")
     def test_mobile_landscape_orientation(self):
-        """Тест: поворот экрана в альбомную ориентацию"""
-        # Поворачиваем экран в альбомную ориентацию
-        self.page.set_viewport_size({"width": 667, "height": 375})
-        
+        """Тест: форма в альбомной ориентации"""
         # Проверяем, что форма все еще работает
         assert self.order_page.first_name_input.is_visible()
         assert self.order_page.submit_order_btn.is_visible()
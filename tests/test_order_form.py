@@ -1,4 +1,5 @@
 import pytest
+from pages.order_page import OrderData
 from tests.base_test import BaseTest
 
 
@@ -60,16 +61,17 @@ class TestOrderForm(BaseTest):
         # Добавляем комментарий
         self.order_page.add_comment("Просьба доставить до 18:00")
         
-        # Проверяем, что форма заполнена
-        assert self.order_page.first_name_input.input_value() == "Иван"
-        assert self.order_page.last_name_input.input_value() == "Петров"
-        assert self.order_page.email_input.input_value() == "ivan.petrov@example.com"
-        assert self.order_page.phone_input.input_value() == "+7 (999) 123-45-67"
-        assert self.order_page.city_select.input_value() == "Москва"
-        assert self.order_page.address_input.input_value() == "ул. Тверская, д. 1"
-        assert self.order_page.gift_wrapping.is_checked()
-        assert self.order_page.insurance.is_checked()
-        assert self.order_page.newsletter.is_checked()
+        # Проверяем, что форма заполнена (один снимок вместо запроса на каждое поле)
+        snapshot = self.order_page.snapshot()
+        assert snapshot.first_name == "Иван"
+        assert snapshot.last_name == "Петров"
+        assert snapshot.email == "ivan.petrov@example.com"
+        assert snapshot.phone == "+7 (999) 123-45-67"
+        assert snapshot.city == "Москва"
+        assert snapshot.address == "ул. Тверская, д. 1"
+        assert snapshot.gift_wrapping
+        assert snapshot.insurance
+        assert snapshot.newsletter
     
     @pytest.mark.form
     def test_minimal_order_form_filling(self):
@@ -98,6 +100,36 @@ class TestOrderForm(BaseTest):
         assert self.order_page.city_select.input_value() == "Санкт-Петербург"
         assert self.order_page.address_input.input_value() == "Невский проспект, д. 28"
     
+    @pytest.mark.form
+    @pytest.mark.parametrize("batch", [True, False], ids=["batch", "per_field"])
+    def test_fill_order(self, batch):
+        """Тест: заполнение формы по описанию заказа (пакетно и по одному полю)"""
+        order = OrderData(
+            first_name="Иван",
+            last_name="Петров",
+            email="ivan.petrov@example.com",
+            phone="+7 (999) 123-45-67",
+            city="Москва",
+            address="ул. Тверская, д. 1",
+            postal_code="101000",
+            delivery="courier",
+            payment="cash",
+            gift_wrapping=True,
+            comment="Просьба доставить до 18:00"
+        )
+        self.order_page.fill_order(order, batch=batch)
+        
+        # Проверяем, что форма заполнена
+        assert self.order_page.first_name_input.input_value() == "Иван"
+        assert self.order_page.email_input.input_value() == "ivan.petrov@example.com"
+        assert self.order_page.city_select.input_value() == "Москва"
+        assert self.order_page.postal_code_input.input_value() == "101000"
+        assert self.order_page.courier_delivery.is_checked()
+        assert self.order_page.cash_payment.is_checked()
+        assert self.order_page.gift_wrapping.is_checked()
+        assert not self.order_page.insurance.is_checked()
+        assert self.order_page.comment_textarea.input_value() == "Просьба доставить до 18:00"
+    
     @pytest.mark.form
     def test_draft_saving(self):
         """Тест: сохранение черновика заказа"""
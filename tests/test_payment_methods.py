@@ -1,5 +1,6 @@
 import pytest
 from tests.base_test import BaseTest
+from utils.perf_budget import element_shown
 
 
 class TestPaymentMethods(BaseTest):
@@ -8,18 +9,8 @@ class TestPaymentMethods(BaseTest):
     @pytest.mark.payment
     def test_card_payment_selection(self):
         """Тест: выбор оплаты банковской картой"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_delivery_method("courier")
         
@@ -34,18 +25,8 @@ class TestPaymentMethods(BaseTest):
     @pytest.mark.payment
     def test_cash_payment_selection(self):
         """Тест: выбор оплаты наличными"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         # Выбираем курьерскую доставку (необходимо для оплаты наличными)
         self.order_page.select_delivery_method("courier")
@@ -61,18 +42,8 @@ class TestPaymentMethods(BaseTest):
     @pytest.mark.payment
     def test_bank_transfer_payment_selection(self):
         """Тест: выбор оплаты банковским переводом"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_delivery_method("courier")
         
@@ -87,18 +58,8 @@ class TestPaymentMethods(BaseTest):
     @pytest.mark.payment
     def test_payment_method_switching(self):
         """Тест: переключение между способами оплаты"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_delivery_method("courier")
         
@@ -119,26 +80,18 @@ class TestPaymentMethods(BaseTest):
     @pytest.mark.payment
     def test_cash_payment_availability_with_delivery_methods(self):
         """Тест: доступность оплаты наличными в зависимости от способа доставки"""
-        # Заполняем минимальную форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         # Проверяем доступность оплаты наличными для курьерской доставки
         self.order_page.select_delivery_method("courier")
         assert self.order_page.cash_payment.is_enabled()
         
         # Проверяем недоступность оплаты наличными для самовывоза
-        self.order_page.select_delivery_method("pickup")
+        with self.order_page.watch_region("payment") as change:
+            self.order_page.select_delivery_method("pickup")
         assert not self.order_page.cash_payment.is_enabled()
+        assert change.elapsed_ms is not None
         
         # Проверяем недоступность оплаты наличными для доставки почтой
         self.order_page.select_delivery_method("post")
@@ -160,24 +113,15 @@ class TestPaymentMethods(BaseTest):
     @pytest.mark.payment
     def test_payment_method_validation(self):
         """Тест: валидация выбора способа оплаты"""
-        # Заполняем форму без выбора способа оплаты
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем форму из контрольной точки без выбора способа оплаты
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_delivery_method("courier")
         # Не выбираем способ оплаты
         
-        # Пытаемся отправить форму
-        self.order_page.submit_order()
+        # Пытаемся отправить форму и ждем появления ошибок
+        with self.order_page.watch_region("errors"):
+            self.order_page.submit_order()
         
         # Проверяем наличие ошибки валидации
         errors = self.order_page.get_validation_errors()
@@ -187,18 +131,8 @@ class TestPaymentMethods(BaseTest):
     @pytest.mark.payment
     def test_payment_method_with_additional_services(self):
         """Тест: работа способов оплаты с дополнительными услугами"""
-        # Заполняем форму с дополнительными услугами
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_delivery_method("courier")
         
@@ -222,30 +156,55 @@ class TestPaymentMethods(BaseTest):
     @pytest.mark.payment
     def test_total_price_calculation_with_payment_methods(self):
         """Тест: расчет итоговой цены с разными способами оплаты"""
-        # Заполняем форму
-        self.order_page.fill_contact_info(
-            first_name="Тест",
-            last_name="Тестов",
-            email="test@example.com",
-            phone="+7 (999) 111-11-11"
-        )
-        
-        self.order_page.fill_address_info(
-            city="Москва",
-            address="ул. Тестовая, д. 1"
-        )
+        # Заполняем форму из контрольной точки
+        self.checkpoints.restore("contact_address")
         
         self.order_page.select_delivery_method("courier")
         
         # Проверяем, что итоговая цена одинакова для всех способов оплаты
         self.order_page.select_payment_method("card")
-        card_total = self.order_page.get_total_price()
+        card_total = self.order_page.get_price_breakdown().total
         
         self.order_page.select_payment_method("cash")
-        cash_total = self.order_page.get_total_price()
+        cash_total = self.order_page.get_price_breakdown().total
         
         self.order_page.select_payment_method("bank")
-        bank_total = self.order_page.get_total_price()
+        bank_total = self.order_page.get_price_breakdown().total
         
         # Итоговая цена должна быть одинаковой для всех способов оплаты
         assert card_total == cash_total == bank_total
+    
+    @pytest.mark.payment
+    @pytest.mark.perf_budget(ms=300, repeat=5)
+    def test_cash_payment_enable_budget(self, perf_budget):
+        """Тест: оплата наличными становится доступной в пределах бюджета"""
+        # Заполняем минимальную форму из контрольной точки
+        self.checkpoints.restore("contact_address")
+        
+        self.order_page.select_delivery_method("post")
+        
+        # От выбора курьера до разблокировки оплаты наличными
+        perf_budget.measure(
+            "курьер -> оплата наличными доступна",
+            action=lambda: self.order_page.select_delivery_method("courier"),
+            until=element_shown('input[name="payment"][value="cash"]:not([disabled])'),
+            reset=lambda: self.order_page.select_delivery_method("post"),
+        )
+    
+    @pytest.mark.payment
+    @pytest.mark.perf_budget(ms=500, repeat=3)
+    def test_submit_confirmation_modal_budget(self, perf_budget):
+        """Тест: окно подтверждения заказа появляется в пределах бюджета"""
+        # Заполняем контакты и адрес из контрольной точки
+        self.checkpoints.restore("contact_address")
+        
+        self.order_page.select_delivery_method("courier")
+        self.order_page.select_payment_method("card")
+        
+        # От отправки формы до окна подтверждения; между повторами окно закрывается
+        perf_budget.measure(
+            "отправка -> окно подтверждения",
+            action=self.order_page.submit_order,
+            until=element_shown("h3", "Подтверждение заказа"),
+            reset=self.order_page.cancel_order_btn.click,
+        )
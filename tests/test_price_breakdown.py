@@ -0,0 +1,52 @@
+import pytest
+
+from pages.order_page import PRICE_LABELS, PriceBreakdown, parse_price, price_label_pattern
+
+
+class TestPriceBreakdown:
+    """Тесты разбора цен из сводки заказа"""
+    
+    @pytest.mark.parametrize("text, rubles", [
+        ("89 990 ₽", 89990),
+        ("89,990 ₽", 89990),
+        ("89 990 ₽", 89990),
+        ("89 990 ₽", 89990),
+        ("1.234.567 ₽", 1234567),
+        ("300 ₽", 300),
+        ("0 ₽", 0),
+        ("Бесплатно", 0),
+        ("1 234,50 ₽", 1235),
+    ])
+    def test_parse_price(self, text, rubles):
+        """Тест: разделители разрядов и копейки в разных локалях"""
+        assert parse_price(text) == rubles
+    
+    @pytest.mark.parametrize("text", [None, "", "₽", "цена по запросу"])
+    def test_parse_price_rejects_garbage(self, text):
+        """Тест: строка без цены не превращается в ноль"""
+        with pytest.raises(ValueError):
+            parse_price(text)
+    
+    def test_breakdown_from_summary(self):
+        """Тест: строки сводки переводятся в рубли и обратно в ключи PRICE_LABELS"""
+        prices = PriceBreakdown.from_prices({
+            "product_price": "89 990 ₽",
+            "delivery_price": "300 ₽",
+            "additional_services_price": "бесплатно",
+            "total_price": "90,290 ₽",
+        })
+        assert prices == PriceBreakdown(product=89990, delivery=300, additional_services=0, total=90290)
+        assert prices.as_previous()["total_price"] == 90290
+    
+    def test_breakdown_missing_row(self):
+        """Тест: отсутствующая строка сводки называется в ошибке"""
+        with pytest.raises(ValueError, match="delivery_price"):
+            PriceBreakdown.from_prices({"product_price": "89 990 ₽", "total_price": "89,990 ₽"})
+    
+    def test_label_pattern_matches_every_variant(self):
+        """Тест: локатор строки сводки находит подпись любого варианта, как и чтение цен"""
+        product = price_label_pattern(PRICE_LABELS["product_price"])
+        assert product.search("Товар:") and product.search("Стоимость товара")
+        assert price_label_pattern(PRICE_LABELS["total_price"]).search("Итого:")
+        assert not price_label_pattern(("Доп. услуги",)).search("Доп-услуги")
+        assert not product.search("Ваш товар")
@@ -0,0 +1,36 @@
+from run_tests import build_pytest_command
+from utils.results import summarize
+
+
+TESTS = {
+    "tests/test_a.py::test_smoke": {"outcome": "passed", "duration": 1.5, "markers": ["smoke"]},
+    "tests/test_a.py::test_both": {"outcome": "failed", "duration": 2.0, "markers": ["delivery", "smoke"]},
+    "tests/test_b.py::test_delivery": {"outcome": "skipped", "duration": 0.5, "markers": ["delivery"]},
+}
+
+
+class TestResults:
+    """Тесты итогов прогона по наборам"""
+
+    def test_summary_by_marker(self):
+        """Тест: сводка набора учитывает только тесты с его маркером"""
+        smoke = summarize(TESTS, "smoke")
+        assert (smoke["passed"], smoke["failed"], smoke["skipped"]) == (1, 1, 0)
+        assert smoke["seconds"] == 3.5
+        delivery = summarize(TESTS, "delivery")
+        assert (delivery["passed"], delivery["failed"], delivery["skipped"]) == (0, 1, 1)
+
+    def test_summary_of_all_tests(self):
+        """Тест: без маркера считаются все тесты прогона"""
+        summary = summarize(TESTS)
+        assert summary["passed"] + summary["failed"] + summary["skipped"] == 3
+        assert summary["seconds"] == 4.0
+
+    def test_suites_in_one_session(self):
+        """Тест: наборы объединяются в одно выражение маркеров одной команды"""
+        command = build_pytest_command(["smoke", "mobile"], parallel=True)
+        assert '-m "smoke or mobile"' in command
+        assert "-n auto --dist loadgroup" in command
+        assert "-m" not in build_pytest_command([])
+        engines = build_pytest_command([], engines=["chromium", "webkit"])
+        assert "-n 2 --dist loadgroup --engines chromium,webkit" in engines
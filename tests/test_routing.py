@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+import pytest
+
+import utils.routing as routing
+from utils.routing import PROFILES, BlockStats, ResourceBlocker, get_route_profile
+
+
+SITE = "https://qa-mts.netlify.app/"
+
+
+class FakeRoute:
+    """Маршрут с запросом и ответом на HEAD-запрос; записывает вызовы обработчика"""
+
+    def __init__(self, url: str, resource_type: str, headers: dict[str, str]):
+        self.request = SimpleNamespace(url=url, resource_type=resource_type)
+        self.headers = headers
+        self.calls = []
+
+    def fetch(self, method: str, timeout: float):
+        self.calls.append(("fetch", method))
+        return SimpleNamespace(headers=self.headers)
+
+    def fulfill(self, **kwargs) -> None:
+        self.calls.append(("fulfill", kwargs["content_type"]))
+
+    def abort(self, error_code: str) -> None:
+        self.calls.append(("abort", error_code))
+
+    def fallback(self) -> None:
+        self.calls.append(("fallback",))
+
+
+class TestRouting:
+    """Тесты профилей блокировки ресурсов"""
+
+    def test_full_profile_passes_everything(self):
+        """Тест: профиль full ничего не блокирует"""
+        blocker = ResourceBlocker(PROFILES["full"], SITE)
+        assert blocker.action("https://qa-mts.netlify.app/logo.png", "image") is None
+        assert blocker.action("https://www.googletagmanager.com/gtm.js", "script") is None
+
+    def test_functional_profile_stubs_images_and_drops_analytics(self):
+        """Тест: functional подменяет картинки и обрывает шрифты и аналитику"""
+        blocker = ResourceBlocker(PROFILES["functional"], SITE)
+        assert blocker.action("https://qa-mts.netlify.app/logo.png", "image") == "stub"
+        assert blocker.action("https://fonts.gstatic.com/roboto.woff2", "font") == "abort"
+        assert blocker.action("https://www.googletagmanager.com/gtm.js", "script") == "abort"
+        assert blocker.action("https://cdn.example.com/app.js", "script") is None
+        assert blocker.action("https://qa-mts.netlify.app/app.js", "script") is None
+
+    def test_minimal_profile_drops_third_party(self):
+        """Тест: minimal обрывает сторонние хосты, но пропускает сам сайт"""
+        blocker = ResourceBlocker(PROFILES["minimal"], SITE)
+        assert blocker.action("https://cdn.example.com/app.js", "script") == "abort"
+        assert blocker.action(SITE, "document") is None
+        assert blocker.action("https://qa-mts.netlify.app/styles.css", "stylesheet") is None
+
+    def test_profile_from_env(self, monkeypatch):
+        """Тест: профиль по умолчанию берется из ROUTE_PROFILE"""
+        monkeypatch.setenv("ROUTE_PROFILE", "minimal")
+        assert get_route_profile().name == "minimal"
+        monkeypatch.setenv("ROUTE_PROFILE", "unknown")
+        with pytest.raises(ValueError):
+            get_route_profile()
+
+    def test_sizes_without_har(self, monkeypatch, tmp_path):
+        """Тест: без HAR-слепка размер заблокированного ресурса берется из HEAD-запроса, один раз на URL"""
+        monkeypatch.setenv("HAR_DIR", str(tmp_path))
+        monkeypatch.setenv("ROUTE_MEASURE_BLOCKED", "true")
+        stats = BlockStats()
+        monkeypatch.setattr(routing, "BLOCK_STATS", stats)
+        blocker = ResourceBlocker(PROFILES["functional"], SITE)
+        font = FakeRoute("https://fonts.gstatic.com/roboto.woff2", "font", {"content-length": "2048"})
+        repeated = FakeRoute(font.request.url, "font", {"content-length": "2048"})
+        for route in (font, repeated, FakeRoute("https://fonts.gstatic.com/inter.woff2", "font", {})):
+            blocker.handle(route)
+
+        assert font.calls == [("fetch", "HEAD"), ("abort", "blockedbyclient")]
+        assert repeated.calls == [("abort", "blockedbyclient")]
+        assert stats.requests == 3
+        assert stats.bytes == 2 * 2048
+
+    def test_sizes_probe_disabled(self, monkeypatch, tmp_path):
+        """Тест: по умолчанию заблокированные ресурсы не запрашиваются"""
+        monkeypatch.setenv("HAR_DIR", str(tmp_path))
+        monkeypatch.delenv("ROUTE_MEASURE_BLOCKED", raising=False)
+        stats = BlockStats()
+        monkeypatch.setattr(routing, "BLOCK_STATS", stats)
+        image = FakeRoute("https://qa-mts.netlify.app/logo.png", "image", {"content-length": "4096"})
+        ResourceBlocker(PROFILES["functional"], SITE).handle(image)
+
+        assert [call[0] for call in image.calls] == ["fulfill"]
+        assert stats.requests == 1 and stats.bytes == 0
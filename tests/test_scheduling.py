@@ -0,0 +1,57 @@
+from utils.scheduling import (
+    DEFAULT_DURATION,
+    WorkUnit,
+    affinity_key,
+    assign_bins,
+    build_units,
+    estimate_durations,
+    lpt_schedule,
+    makespan,
+)
+
+
+class TestScheduling:
+    """Тесты распределения тестов по воркерам"""
+    
+    def test_affinity_key_groups_by_class(self):
+        """Тест: тесты класса группируются по классу, функции - по файлу"""
+        assert affinity_key("tests/test_a.py::TestA::test_one[x]") == "tests/test_a.py::TestA"
+        assert affinity_key("tests/test_a.py::test_one") == "tests/test_a.py"
+    
+    def test_unknown_tests_get_median_duration(self):
+        """Тест: тестам без истории назначается медиана известных длительностей"""
+        durations = estimate_durations(["a", "b", "c", "new"], {"a": 1.0, "b": 3.0, "c": 10.0})
+        assert durations["new"] == 3.0
+        assert estimate_durations(["x"], {}) == {"x": DEFAULT_DURATION}
+    
+    def test_lpt_balances_load(self):
+        """Тест: LPT раскладывает единицы работы с минимальным перекосом"""
+        units = [WorkUnit(key, [key], duration) for key, duration in
+                 [("a", 7), ("b", 5), ("c", 4), ("d", 3), ("e", 3), ("f", 2)]]
+        schedule = lpt_schedule(units, 3)
+        assert makespan(schedule) == 9
+        assert sorted(unit.key for units in schedule for unit in units) == ["a", "b", "c", "d", "e", "f"]
+    
+    def test_class_stays_together_unless_too_long(self):
+        """Тест: класс остается одной единицей, пока не превышает среднюю загрузку"""
+        durations = {
+            "t.py::TestSlow::test_1": 5.0,
+            "t.py::TestSlow::test_2": 5.0,
+            "t.py::TestFast::test_1": 1.0,
+            "t.py::TestFast::test_2": 1.0,
+        }
+        keys = sorted(unit.key for unit in build_units(durations, bins=2))
+        assert keys == ["t.py::TestFast", "t.py::TestSlow::test_1", "t.py::TestSlow::test_2"]
+    
+    def test_unsplittable_groups_are_kept(self):
+        """Тест: группы xdist не делятся между воркерами"""
+        durations = {"a": 5.0, "b": 5.0, "c": 1.0}
+        assignment = assign_bins(durations, 2, key=lambda nodeid: "group" if nodeid != "c" else "c",
+                                 unsplittable={"group"})
+        assert assignment["a"] == assignment["b"]
+        assert assignment["c"] != assignment["a"]
+    
+    def test_assignment_is_deterministic(self):
+        """Тест: одинаковые входные данные дают одинаковое распределение"""
+        durations = {f"t.py::test_{index}": 1.0 for index in range(10)}
+        assert assign_bins(durations, 3) == assign_bins(dict(reversed(durations.items())), 3)
@@ -0,0 +1,54 @@
+from utils.selector_profiler import SelectorProfile, base_selector, locator_selector, selector_flags
+
+
+def make_profile(**overrides) -> SelectorProfile:
+    values = dict(attribute="email_input", selector='input[name="email"]', matches=1, median_ms=0.3,
+                  stability=1.0, structural='input[name="email"]', structural_ms=0.3)
+    values.update(overrides)
+    return SelectorProfile(**values)
+
+
+class FakeLocator:
+    """Объект с repr() локатора Playwright"""
+
+    def __init__(self, selector: str):
+        self.selector = selector
+
+    def __repr__(self) -> str:
+        return f"<Locator frame=<Frame name= url='http://127.0.0.1:8000/'> selector={self.selector!r}>"
+
+
+class TestSelectorProfiler:
+    """Тесты оценки селекторов"""
+    
+    def test_base_selector_drops_nth(self):
+        """Тест: совпадения считаются по селектору без .first"""
+        assert base_selector("text=0 ₽ >> nth=0") == "text=0 ₽"
+        assert base_selector('input[name="email"]') == 'input[name="email"]'
+    
+    def test_selector_from_locator_repr(self):
+        """Тест: селектор читается из repr() локатора вместе с кавычками и вложенными частями"""
+        selector = 'internal:text="Итого:"s >> nth=-1 >> xpath=..'
+        assert locator_selector(FakeLocator(selector)) == selector
+        assert locator_selector(FakeLocator("button:has-text('Отмена')")) == "button:has-text('Отмена')"
+    
+    def test_structural_selector_is_clean(self):
+        """Тест: однозначный стабильный селектор не помечается"""
+        assert selector_flags(make_profile(), threshold=2.0, min_delta_ms=0.2) == []
+    
+    def test_text_selector_flags(self):
+        """Тест: общий медленный текстовый селектор помечается"""
+        profile = make_profile(attribute="delivery_price", selector="text=0 ₽ >> nth=0", matches=3,
+                               median_ms=2.5, stability=0.5, structural="#summary > div:nth-of-type(2)",
+                               structural_ms=0.4, shared_with=("additional_services_price",))
+        assert selector_flags(profile, threshold=2.0, min_delta_ms=0.2) == ["ambiguous", "unstable", "slow"]
+    
+    def test_small_difference_is_not_slow(self):
+        """Тест: разница меньше min_delta_ms не считается замедлением"""
+        profile = make_profile(median_ms=0.15, structural_ms=0.05)
+        assert selector_flags(profile, threshold=2.0, min_delta_ms=0.2) == []
+    
+    def test_missing_element(self):
+        """Тест: отсутствующий элемент помечается без структурной альтернативы"""
+        profile = make_profile(matches=0, structural=None, structural_ms=None)
+        assert selector_flags(profile, threshold=2.0, min_delta_ms=0.2) == ["missing"]
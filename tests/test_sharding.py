@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from tests.test_duration_schedule import (  # noqa: F401 - фикстура проекта
+    MARKED_SAMPLE_TESTS,
+    read_placement,
+    scheduled_project,
+)
+from utils.sharding import merge_durations, merge_results, parse_shard, select_shard
+
+
+NODEIDS = [f"tests/test_{module}.py::test_{index}" for module in "abcd" for index in range(5)]
+
+
+class TestSharding:
+    """Тесты разбиения прогона на части"""
+
+    def test_parse_shard(self):
+        """Тест: часть задается как i/n с нумерацией с единицы"""
+        assert parse_shard("2/4") == (2, 4)
+        for value in ("0/4", "5/4", "2", "a/b"):
+            with pytest.raises(ValueError):
+                parse_shard(value)
+
+    def test_shards_partition_tests(self):
+        """Тест: части не пересекаются и вместе покрывают все тесты"""
+        shards = [select_shard(NODEIDS, index, 3, {}) for index in (1, 2, 3)]
+        assert set().union(*shards) == set(NODEIDS)
+        assert sum(len(shard) for shard in shards) == len(NODEIDS)
+
+    def test_without_history_balanced_by_count(self):
+        """Тест: без истории части выравниваются по числу тестов"""
+        sizes = sorted(len(select_shard(NODEIDS, index, 4, {})) for index in (1, 2, 3, 4))
+        assert sizes == [5, 5, 5, 5]
+
+    def test_stable_and_balanced_by_history(self):
+        """Тест: разбиение не зависит от порядка тестов и выравнивает длительность"""
+        history = {nodeid: 10.0 if nodeid.startswith("tests/test_a.py") else 1.0 for nodeid in NODEIDS}
+        first = select_shard(NODEIDS, 1, 2, history)
+        assert first == select_shard(list(reversed(NODEIDS)), 1, 2, history)
+        loads = [sum(history[nodeid] for nodeid in select_shard(NODEIDS, index, 2, history)) for index in (1, 2)]
+        assert max(loads) - min(loads) <= 10.0
+
+    def test_merge_results_and_durations(self):
+        """Тест: общие итоги содержат тесты всех частей, история обновляется по частям"""
+        first = {"created": "2024-01-01T10:00:00", "duration": 30.0, "shard": "1/2",
+                 "tests": {"a": {"outcome": "passed", "duration": 3.0, "markers": []}}}
+        second = {"created": "2024-01-01T10:01:00", "duration": 40.0, "shard": "2/2",
+                  "tests": {"b": {"outcome": "failed", "duration": 4.0, "markers": []}}}
+        merged = merge_results([first, second])
+        assert merged["duration"] == 40.0
+        assert merged["sequential_duration"] == 70.0
+        assert merged["tests"]["b"]["shard"] == "2/2"
+        assert [shard["failed"] for shard in merged["shards"]] == [0, 1]
+        history = merge_durations({"a": 1.0, "b": 1.0, "c": 5.0},
+                                  [({"a": 3.0, "b": 9.0}, first), ({"a": 7.0, "b": 4.0}, second)])
+        assert history == {"a": 3.0, "b": 4.0, "c": 5.0}
+        assert merged["problems"] == [] and merged["duplicates"] == {}
+
+    def test_merge_reports_duplicates_and_missing(self):
+        """Тест: тест из двух частей и тест без части попадают в проблемы, а не перезаписываются"""
+        entry = {"duration": 1.0, "markers": []}
+        first = {"created": "", "duration": 1.0, "shard": "1/2",
+                 "tests": {"a": {**entry, "outcome": "failed"}, "b": {**entry, "outcome": "passed"}}}
+        second = {"created": "", "duration": 1.0, "shard": "2/2",
+                  "tests": {"a": {**entry, "outcome": "passed"}}}
+        plans = [{"shard": "1/2", "collected": ["a", "b", "c"], "assigned": ["a", "b"]},
+                 {"shard": "2/2", "collected": ["a", "b", "c"], "assigned": ["a"]}]
+        merged = merge_results([first, second], plans)
+        assert merged["tests"]["a"]["outcome"] == "failed"
+        assert merged["duplicates"] == {"a": {"1/2": "failed", "2/2": "passed"}}
+        assert merged["missing"] == ["c"]
+        assert len(merged["problems"]) == 2
+
+    def test_merge_reports_incomplete_shards(self):
+        """Тест: неполный набор частей и части разных разбиений попадают в проблемы"""
+        results = {"created": "", "duration": 1.0, "tests": {}}
+        assert merge_results([{**results, "shard": "1/3"}, {**results, "shard": "3/3"}])["problems"] == [
+            "Не хватает частей: 2/3"
+        ]
+        problems = merge_results([{**results, "shard": "1/2"}, {**results, "shard": "2/3"}])["problems"]
+        assert problems[0].startswith("Части из разных разбиений")
+
+    def test_shard_before_duration_schedule(self, scheduled_project: pytest.Pytester):
+        """Тест: под xdist воркеры раскладывают по длительности только тесты своей части"""
+        result = scheduled_project.runpytest_subprocess(
+            "-p", "utils.durations", "-p", "utils.sharding", "--shard", "2/2",
+            "-n", "2", "--dist", "loadgroup", "--duration-schedule"
+        )
+        # Часть 1/2 - долгий тест, часть 2/2 - четыре быстрых, по два на воркер
+        result.assert_outcomes(passed=4)
+        placement = read_placement(scheduled_project)
+        assert "test_slow" not in placement
+        groups = {}
+        for entry in placement.values():
+            group = entry["nodeid"].rsplit("@", 1)[1]
+            assert group.startswith("lpt")
+            groups.setdefault(group, set()).add(entry["worker"])
+        assert len(groups) == 2
+        assert all(len(workers) == 1 for workers in groups.values())
+        plan = json.loads((scheduled_project.path / "reports" / "shard.json").read_text())
+        assert plan["shard"] == "2/2" and len(plan["collected"]) == 5 and len(plan["assigned"]) == 4
+
+    def test_shards_split_selected_tests(self, scheduled_project: pytest.Pytester):
+        """Тест: с -m части делят только отобранные тесты, а не весь набор"""
+        scheduled_project.makeini("[pytest]\nmarkers =\n    fast: быстрый тест\n")
+        scheduled_project.makepyfile(test_sample=MARKED_SAMPLE_TESTS)
+        assigned = []
+        for shard in ("1/2", "2/2"):
+            result = scheduled_project.runpytest_subprocess("-p", "utils.sharding", "--shard", shard, "-m", "fast")
+            # Долгий тест не отобран и не перетягивает на себя целую часть
+            result.assert_outcomes(passed=2)
+            plan = json.loads((scheduled_project.path / "reports" / "shard.json").read_text())
+            assert len(plan["collected"]) == 4
+            assigned.extend(plan["assigned"])
+        assert sorted(assigned) == [f"test_sample.py::test_fast_{index}" for index in range(4)]
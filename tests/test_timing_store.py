@@ -0,0 +1,93 @@
+import sqlite3
+
+import pytest
+from utils.stats import percentile
+from utils.timing import TimingStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Пустая база длительностей во временном каталоге"""
+    store = TimingStore(tmp_path / "timings.sqlite")
+    yield store
+    store.close()
+
+
+def record(store, timings):
+    """Сохраняет прогон с одинаковыми метаданными"""
+    return store.record_run(timings, {}, git_sha="abc", browser="chromium")
+
+
+class TestTimingStore:
+    """Тесты базы длительностей тестов"""
+    
+    def test_percentile_interpolation(self):
+        """Тест: перцентили считаются с линейной интерполяцией"""
+        assert percentile([1, 2, 3, 4], 50) == 2.5
+        assert percentile([5], 95) == 5
+        assert percentile([1, 2, 3, 4, 5], 100) == 5
+    
+    def test_slowest_uses_latest_run(self, store):
+        """Тест: самые медленные тесты берутся из последнего прогона"""
+        record(store, {"a": {"body": 5.0}, "b": {"body": 1.0}})
+        record(store, {"a": {"body": 1.0}, "b": {"setup": 1.0, "navigation": 2.0, "body": 1.0}})
+        
+        slowest = store.slowest()
+        assert [nodeid for nodeid, _ in slowest] == ["b", "a"]
+        assert slowest[0][1] == {"setup": 1.0, "navigation": 2.0, "body": 1.0}
+    
+    def test_summary_percentiles(self, store):
+        """Тест: p50/p95 считаются по суммарной длительности за прогоны"""
+        for seconds in [1.0, 2.0, 3.0]:
+            record(store, {"a": {"setup": seconds, "body": seconds}})
+        
+        summary = store.summary(runs=10)[0]
+        assert summary.runs == 3
+        assert summary.p50 == 4.0
+        assert summary.latest == 6.0
+    
+    def test_regressions_against_previous_runs(self, store):
+        """Тест: регрессия определяется относительно медианы предыдущих прогонов"""
+        for _ in range(3):
+            record(store, {"slow": {"body": 1.0}, "stable": {"body": 1.0}})
+        record(store, {"slow": {"body": 2.0}, "stable": {"body": 1.05}})
+        
+        regressions = store.regressions(runs=3)
+        assert [regression.nodeid for regression in regressions] == ["slow"]
+        assert regressions[0].ratio == 2.0
+    
+    def test_web_vitals_trend(self, store):
+        """Тест: метрики страницы сравниваются по медиане с предыдущими прогонами"""
+        for lcp in [100.0, 300.0]:
+            store.record_run({"a": {"body": 1.0}}, {}, git_sha="abc", browser="chromium",
+                             vitals={"a": {"lcp": lcp}, "b": {"lcp": lcp}})
+        store.record_run({"a": {"body": 1.0}}, {}, git_sha="abc", browser="chromium",
+                         vitals={"a": {"lcp": 500.0, "cls": 0.1}, "b": {"lcp": 700.0}})
+        
+        trend = {vitals.metric: vitals for vitals in store.vitals_trend(runs=10)}
+        assert trend["lcp"].latest == 600.0
+        assert trend["lcp"].baseline == 200.0
+        assert trend["cls"].baseline is None
+    
+    def test_viewport_per_test(self, store):
+        """Тест: окно записывается для каждого теста, у прогона - все окна его тестов"""
+        run_id = store.record_run({"desktop": {"body": 1.0}, "mobile": {"body": 1.0}}, {}, git_sha="abc",
+                                  browser="chromium", viewports={"desktop": "1920x1080", "mobile": "375x667"})
+        rows = store.connection.execute("SELECT DISTINCT nodeid, viewport FROM timings WHERE run_id = ?", (run_id,))
+        assert dict(rows) == {"desktop": "1920x1080", "mobile": "375x667"}
+        run = store.connection.execute("SELECT viewport FROM runs WHERE id = ?", (run_id,)).fetchone()
+        assert run == ("1920x1080,375x667",)
+    
+    def test_old_database_gets_viewport_column(self, tmp_path):
+        """Тест: в базу без окна у тестов колонка добавляется при открытии"""
+        path = tmp_path / "timings.sqlite"
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE timings (run_id INTEGER NOT NULL, nodeid TEXT NOT NULL, "
+                           "phase TEXT NOT NULL, seconds REAL NOT NULL, outcome TEXT NOT NULL)")
+        connection.close()
+        store = TimingStore(path)
+        try:
+            record(store, {"a": {"body": 1.0}})
+            assert store.connection.execute("SELECT viewport FROM timings").fetchone() == (None,)
+        finally:
+            store.close()
@@ -0,0 +1,197 @@
+"""
+Плагин pytest для конкурентного выполнения асинхронных сценариев
+
+Тест, помеченный @pytest.mark.async_scenario, - это async-функция, которая
+принимает фикстуру async_order_page (и, при необходимости, параметры
+parametrize). Когда pytest доходит до первого такого теста, плагин запускает
+в отдельном потоке цикл asyncio и выполняет сразу все ожидающие сценарии
+процесса: каждый в своем контексте одного браузера, не более
+ASYNC_CONCURRENCY одновременно. Остальные тесты получают уже готовый результат.
+
+Под pytest-xdist сценарии объединяются в одну группу и выполняются пачкой
+только с --dist loadgroup; при другом распределении каждый сценарий
+выполняется отдельно. В матрице движков (--engines) у каждого движка своя
+пачка и свой браузер.
+"""
+import asyncio
+import threading
+import time
+from typing import Optional
+
+import pytest
+from playwright.async_api import Browser, async_playwright
+
+from pages.async_order_page import AsyncOrderPage
+from utils.browser_server import get_worker_endpoint
+from utils.config import get_async_concurrency, get_launch_options, is_local_site_enabled
+from utils.context_configs import get_context_config
+from utils.context_factory import new_async_order_context, open_async_order_page
+from utils.device_matrix import DURATION_PROPERTY, WINDOW_PROPERTY, scenario_device
+from utils.engines import item_engine
+from utils.har import HarBundle, get_har_bundle, get_har_mode
+from utils.routing import get_route_profile
+from utils.timing import record_viewport
+
+
+MARKER = "async_scenario"
+XDIST_GROUP = "async_scenarios"
+
+# Фикстура, которую подставляет раннер, а не pytest
+PAGE_ARGUMENT = "async_order_page"
+
+_runner_key = pytest.StashKey["AsyncScenarioRunner"]()
+
+
+class AsyncScenarioRunner:
+    """Выполняет асинхронные сценарии пачками и хранит их результаты"""
+
+    def __init__(self, config: pytest.Config):
+        self.config = config
+        self.concurrency = get_async_concurrency()
+        # nodeid -> (ошибка, длительность, (начало, конец) по часам системы, окно страницы)
+        self._results: dict[str, tuple[Optional[BaseException], float, tuple[float, float], Optional[dict]]] = {}
+
+    def run(self, item: pytest.Function) -> None:
+        """Возвращает результат сценария, при необходимости выполнив пачку"""
+        if item.nodeid not in self._results:
+            batch = self._pending_batch(item)
+            self._execute(batch)
+
+        error, duration, window, viewport = self._results.pop(item.nodeid)
+        item.user_properties.append((DURATION_PROPERTY, duration))
+        item.user_properties.append((WINDOW_PROPERTY, window))
+        record_viewport(item, viewport)
+        if error is not None:
+            raise error
+
+    def _pending_batch(self, item: pytest.Function) -> list[pytest.Function]:
+        """Собирает сценарии, которые можно выполнить вместе с текущим"""
+        if hasattr(self.config, "workerinput") and self.config.getoption("dist", None) != "loadgroup":
+            return [item]
+        batch = [item]
+        engine = item_engine(item)
+        for other in item.session.items:
+            if other is item or other.nodeid in self._results or item_engine(other) != engine:
+                continue
+            if isinstance(other, pytest.Function) and _is_batchable(other) and not _is_skipped(other):
+                batch.append(other)
+        return batch
+
+    def _execute(self, batch: list[pytest.Function]) -> None:
+        """Выполняет пачку в отдельном потоке со своим циклом asyncio
+
+        Отдельный поток нужен, чтобы не пересекаться с циклом событий
+        синхронного Playwright, который может быть уже запущен фикстурами.
+        """
+        har_bundle = get_har_bundle() if get_har_mode() != "off" and not is_local_site_enabled() else None
+        if har_bundle is not None and not har_bundle.exists():
+            har_bundle = None
+
+        failure: list[BaseException] = []
+
+        def target() -> None:
+            try:
+                asyncio.run(self._run_batch(batch, har_bundle))
+            except BaseException as error:
+                failure.append(error)
+
+        thread = threading.Thread(target=target, name="async-scenarios")
+        thread.start()
+        thread.join()
+
+        for item in batch:
+            if item.nodeid not in self._results:
+                error = failure[0] if failure else RuntimeError("Сценарий не был выполнен")
+                self._results[item.nodeid] = (error, 0.0, (0.0, 0.0), None)
+
+    async def _run_batch(self, batch: list[pytest.Function], har_bundle: Optional[HarBundle]) -> None:
+        engine = item_engine(batch[0])
+        endpoint = get_worker_endpoint(engine)
+        async with async_playwright() as p:
+            if endpoint:
+                browser = await p[engine].connect(endpoint)
+            else:
+                browser = await p[engine].launch(**get_launch_options())
+            semaphore = asyncio.Semaphore(self.concurrency)
+            try:
+                await asyncio.gather(*(
+                    self._run_scenario(browser, semaphore, item, har_bundle, p.devices) for item in batch
+                ))
+            finally:
+                await browser.close()
+
+    async def _run_scenario(self, browser: Browser, semaphore: asyncio.Semaphore,
+                            item: pytest.Function, har_bundle: Optional[HarBundle], devices: dict) -> None:
+        async with semaphore:
+            started = time.time()
+            start = time.perf_counter()
+            error = None
+            viewport = None
+            device = scenario_device(item)
+            context_config = device.context_config(devices) if device is not None else get_context_config(item)
+            context = await new_async_order_context(browser, har_bundle, get_route_profile(item), context_config)
+            try:
+                page = await open_async_order_page(await context.new_page())
+                viewport = page.viewport_size
+                await item.obj(**_scenario_kwargs(item, AsyncOrderPage(page)))
+            except BaseException as exc:
+                error = exc
+            finally:
+                await context.close()
+            self._results[item.nodeid] = (error, time.perf_counter() - start, (started, time.time()), viewport)
+
+
+def _is_batchable(item: pytest.Function) -> bool:
+    """Сценарий можно выполнить без фикстур pytest: только страница и параметры"""
+    if item.get_closest_marker(MARKER) is None:
+        return False
+    params = item.callspec.params if hasattr(item, "callspec") else {}
+    return all(name == PAGE_ARGUMENT or name in params for name in item._fixtureinfo.argnames)
+
+
+def _is_skipped(item: pytest.Function) -> bool:
+    """Пропуски вычисляются при setup, поэтому такие тесты в пачку не берем"""
+    return any(item.iter_markers(name="skip")) or any(item.iter_markers(name="skipif"))
+
+
+def _scenario_kwargs(item: pytest.Function, order_page: AsyncOrderPage) -> dict:
+    """Аргументы вызова сценария: страница и значения parametrize"""
+    params = item.callspec.params if hasattr(item, "callspec") else {}
+    kwargs = {name: params[name] for name in item._fixtureinfo.argnames if name in params}
+    kwargs[PAGE_ARGUMENT] = order_page
+    return kwargs
+
+
+@pytest.fixture
+def async_order_page(browser_engine: str) -> None:
+    """Асинхронная страница заказа; значение подставляет раннер async_scenario
+
+    Зависит от browser_engine, чтобы сценарии разворачивались по матрице движков.
+    """
+    return None
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", f"{MARKER}: асинхронный сценарий, выполняется конкурентно с другими в одном процессе"
+    )
+    config.stash[_runner_key] = AsyncScenarioRunner(config)
+
+
+# Группа назначается при сборе, до распределения по длительности (utils/durations.py)
+def pytest_itemcollected(item: pytest.Item) -> None:
+    if item.get_closest_marker(MARKER) is not None:
+        item.add_marker(pytest.mark.xdist_group(XDIST_GROUP))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem: pytest.Function) -> Optional[bool]:
+    if pyfuncitem.get_closest_marker(MARKER) is None:
+        return None
+    if not _is_batchable(pyfuncitem):
+        pytest.fail(
+            f"Сценарий async_scenario может принимать только {PAGE_ARGUMENT} и параметры parametrize",
+            pytrace=False
+        )
+    pyfuncitem.config.stash[_runner_key].run(pyfuncitem)
+    return True
@@ -0,0 +1,255 @@
+"""
+Общие браузерные серверы для воркеров pytest-xdist (BROWSER_SERVERS=N)
+
+Главный процесс pytest запускает N серверов Playwright (BrowserType.launchServer
+из драйвера Playwright) на фиксированных портах и передает их адреса воркерам
+через переменную окружения BROWSER_WS_ENDPOINTS. Каждый воркер подключается к
+своему серверу по websocket и создает в нем изолированные контексты.
+Серверы запускаются для каждого движка прогона (см. utils/engines.py), движок
+записан в пути адреса: ws://localhost:PORT/firefox-0.
+
+Фоновый поток проверяет серверы и перезапускает упавшие на том же адресе,
+а воркер при потере соединения переподключается.
+"""
+import inspect
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+import playwright
+from playwright.sync_api import Browser, Error, Playwright
+
+from utils.config import get_browser_engine, get_launch_options
+from utils.engines import get_run_engines
+
+
+ENDPOINTS_ENV = "BROWSER_WS_ENDPOINTS"
+
+HEALTH_CHECK_INTERVAL = 5.0
+START_TIMEOUT = 60.0
+RECONNECT_TIMEOUT = 60.0
+
+# Запускает сервер браузера через Node.js-драйвер Playwright и печатает его адрес
+LAUNCH_SERVER_JS = """
+const [packagePath, engine, options] = process.argv.slice(1);
+const playwright = require(packagePath);
+(async () => {
+    const server = await playwright[engine].launchServer(JSON.parse(options));
+    console.log(server.wsEndpoint());
+    const shutdown = async () => {
+        await server.close();
+        process.exit(0);
+    };
+    process.on('SIGTERM', shutdown);
+    process.on('SIGINT', shutdown);
+})().catch(error => {
+    console.error(error);
+    process.exit(1);
+});
+"""
+
+
+def get_browser_server_count() -> int:
+    """Возвращает число общих браузерных серверов (0 - у каждого процесса свой браузер)"""
+    return int(os.getenv("BROWSER_SERVERS", "0"))
+
+
+def _driver_paths() -> tuple[Path, Path]:
+    """Пути к node и пакету драйвера, поставляемым вместе с playwright"""
+    driver = Path(inspect.getfile(playwright)).parent / "driver"
+    node = driver / ("node.exe" if sys.platform == "win32" else "node")
+    return node, driver / "package"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class BrowserServer:
+    """Один сервер браузера с постоянным адресом"""
+
+    def __init__(self, index: int, engine: str = "chromium"):
+        self.engine = engine
+        self.port = _free_port()
+        self.ws_path = f"/{engine}-{index}"
+        self.process: Optional[subprocess.Popen] = None
+        self.restarts = 0
+
+    @property
+    def endpoint(self) -> str:
+        return f"ws://localhost:{self.port}{self.ws_path}"
+
+    def start(self) -> None:
+        """Запускает сервер и ждет, пока он начнет принимать подключения"""
+        node, package = _driver_paths()
+        launch = get_launch_options()
+        options = {
+            "headless": launch["headless"],
+            "port": self.port,
+            "wsPath": self.ws_path,
+        }
+        self.process = subprocess.Popen(
+            [str(node), "-e", LAUNCH_SERVER_JS, str(package), self.engine, json.dumps(options)],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        endpoint: list[str] = []
+        reader = threading.Thread(target=lambda: endpoint.append(self.process.stdout.readline().strip()),
+                                  daemon=True)
+        reader.start()
+        reader.join(START_TIMEOUT)
+        if not endpoint or not endpoint[0].startswith("ws://"):
+            self.stop()
+            raise RuntimeError(f"Не удалось запустить сервер {self.engine} на порту {self.port}")
+
+    def is_healthy(self) -> bool:
+        """Процесс жив и порт принимает соединения"""
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            with socket.create_connection(("localhost", self.port), timeout=2):
+                return True
+        except OSError:
+            return False
+
+    def restart(self) -> None:
+        self.stop()
+        self.start()
+        self.restarts += 1
+
+    def stop(self) -> None:
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+
+class BrowserServerPool:
+    """Набор серверов с фоновыми проверками и перезапуском"""
+
+    def __init__(self, count: int, engine: str = "chromium"):
+        self.servers = [BrowserServer(index, engine) for index in range(count)]
+        self._stopped = threading.Event()
+        # Перезапуск и остановка не выполняются одновременно
+        self._lock = threading.Lock()
+        self._monitor = threading.Thread(target=self._watch, name="browser-server-monitor", daemon=True)
+
+    @property
+    def endpoints(self) -> list[str]:
+        return [server.endpoint for server in self.servers]
+
+    def start(self) -> None:
+        for server in self.servers:
+            server.start()
+        self._monitor.start()
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(HEALTH_CHECK_INTERVAL):
+            for server in self.servers:
+                with self._lock:
+                    if self._stopped.is_set():
+                        return
+                    if server.is_healthy():
+                        continue
+                    try:
+                        server.restart()
+                    except RuntimeError as error:
+                        print(f"\n⚠️ {error}", file=sys.stderr)
+
+    def stop(self) -> None:
+        """Останавливает монитор, дожидаясь начатого перезапуска, и затем серверы"""
+        self._stopped.set()
+        if self._monitor.is_alive():
+            self._monitor.join(START_TIMEOUT + HEALTH_CHECK_INTERVAL)
+        with self._lock:
+            for server in self.servers:
+                server.stop()
+
+
+def get_worker_endpoint(engine: Optional[str] = None) -> Optional[str]:
+    """Адрес сервера движка для текущего процесса: воркеры распределяются по серверам по кругу"""
+    engine = engine or get_browser_engine()
+    endpoints = [endpoint for endpoint in os.getenv(ENDPOINTS_ENV, "").split(",")
+                 if urlparse(endpoint).path.startswith(f"/{engine}-")]
+    if not endpoints:
+        return None
+    worker = os.getenv("PYTEST_XDIST_WORKER", "gw0")
+    index = int(worker[2:]) if worker[2:].isdigit() else 0
+    return endpoints[index % len(endpoints)]
+
+
+class BrowserProvider:
+    """Выдает подключенный браузер: свой или с общего сервера, с переподключением"""
+
+    def __init__(self, playwright: Playwright, engine: Optional[str] = None):
+        self.playwright = playwright
+        self.engine = engine or get_browser_engine()
+        self.endpoint = get_worker_endpoint(self.engine)
+        self._browser: Optional[Browser] = None
+
+    def get(self) -> Browser:
+        """Возвращает браузер, при потере соединения подключается заново"""
+        if self._browser is None or not self._browser.is_connected():
+            self._browser = self._connect() if self.endpoint else self._launch()
+        return self._browser
+
+    def _launch(self) -> Browser:
+        return self.playwright[self.engine].launch(**get_launch_options())
+
+    def _connect(self) -> Browser:
+        deadline = time.monotonic() + RECONNECT_TIMEOUT
+        while True:
+            try:
+                return self.playwright[self.engine].connect(self.endpoint, timeout=10000)
+            except Error:
+                # Сервер мог упасть и сейчас перезапускается монитором
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.5)
+
+    def close(self) -> None:
+        """Закрывает свой браузер или отключается от общего сервера"""
+        if self._browser is not None and self._browser.is_connected():
+            self._browser.close()
+        self._browser = None
+
+
+_pools: list[BrowserServerPool] = []
+
+
+def pytest_configure(config) -> None:
+    count = get_browser_server_count()
+    if count <= 0 or hasattr(config, "workerinput") or os.getenv(ENDPOINTS_ENV):
+        return
+    for engine in get_run_engines(config):
+        pool = BrowserServerPool(count, engine)
+        _pools.append(pool)
+        pool.start()
+    # Воркеры xdist наследуют окружение главного процесса
+    os.environ[ENDPOINTS_ENV] = ",".join(endpoint for pool in _pools for endpoint in pool.endpoints)
+
+
+def pytest_unconfigure(config) -> None:
+    if not _pools:
+        return
+    for pool in _pools:
+        pool.stop()
+    restarts = sum(server.restarts for pool in _pools for server in pool.servers)
+    if restarts:
+        print(f"\nБраузерные серверы перезапускались {restarts} раз")
+    os.environ.pop(ENDPOINTS_ENV, None)
+    _pools.clear()
@@ -0,0 +1,107 @@
+"""
+Общие настройки окружения для фикстур и утилит
+"""
+import os
+from pathlib import Path
+from typing import Optional
+
+
+ORDER_PAGE_URL = "https://qa-mts.netlify.app/"
+
+REPORTS_DIR = Path("reports")
+
+BROWSER_ENGINES = ("chromium", "firefox", "webkit")
+
+
+def get_browser_engine() -> str:
+    """Возвращает движок браузера из BROWSER: chromium, firefox или webkit"""
+    engine = os.getenv("BROWSER", "chromium").lower()
+    if engine not in BROWSER_ENGINES:
+        raise ValueError(f"Неизвестный браузер {engine!r}, ожидается одно из {BROWSER_ENGINES}")
+    return engine
+
+
+def get_launch_options() -> dict:
+    """Возвращает параметры запуска браузера"""
+    return {
+        "headless": os.getenv("HEADLESS", "true").lower() == "true",
+        "slow_mo": 1000 if os.getenv("SLOW_MO") else 0,
+    }
+
+
+def get_context_options() -> dict:
+    """Возвращает параметры создания контекста браузера"""
+    return {
+        "viewport": {"width": 1920, "height": 1080},
+        "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+    }
+
+
+def get_har_config() -> dict:
+    """Возвращает конфигурацию записи/воспроизведения HAR"""
+    return {
+        "mode": os.getenv("HAR_MODE", "off").lower(),
+        "version": os.getenv("HAR_VERSION", "v1"),
+        "dir": Path(os.getenv("HAR_DIR", str(REPORTS_DIR / "har"))),
+    }
+
+
+def is_page_reuse_enabled() -> bool:
+    """Проверяет, включено ли переиспользование страницы между тестами"""
+    return os.getenv("PAGE_REUSE", "false").lower() == "true"
+
+
+def is_blocked_size_probe_enabled() -> bool:
+    """Проверяет, запрашиваются ли размеры заблокированных ресурсов без HAR-слепка (HEAD)"""
+    return os.getenv("ROUTE_MEASURE_BLOCKED", "false").lower() == "true"
+
+
+def get_async_concurrency() -> int:
+    """Возвращает число одновременно выполняемых асинхронных сценариев в процессе"""
+    return int(os.getenv("ASYNC_CONCURRENCY", "8"))
+
+
+def is_web_vitals_enabled() -> bool:
+    """Проверяет, собираются ли метрики производительности страницы в тестах"""
+    return os.getenv("WEB_VITALS", "true").lower() == "true"
+
+
+def get_perf_budget_scale() -> float:
+    """Возвращает множитель бюджетов взаимодействий (например, 2 для медленных стендов)"""
+    return float(os.getenv("PERF_BUDGET_SCALE", "1"))
+
+
+def get_base_url() -> str:
+    """Возвращает адрес страницы заказа: основной стенд или BASE_URL (например, локальная копия)"""
+    return os.getenv("BASE_URL", ORDER_PAGE_URL)
+
+
+def is_local_site_enabled() -> bool:
+    """Проверяет, запускаются ли тесты на локальной копии страницы заказа"""
+    return os.getenv("LOCAL_SITE", "false").lower() == "true"
+
+
+def get_local_site_latency() -> str:
+    """Возвращает задержки локальной копии по адресам, например "/=50,/api/orders=200,*=10" """
+    return os.getenv("LOCAL_SITE_LATENCY", "")
+
+
+def get_prefetch_pool_size() -> int:
+    """Возвращает число заранее загружаемых страниц на процесс (0 - пул выключен)"""
+    return int(os.getenv("PREFETCH_POOL", "0"))
+
+
+def get_prefetch_max_age() -> float:
+    """Возвращает, сколько секунд заранее загруженная страница считается свежей"""
+    return float(os.getenv("PREFETCH_MAX_AGE", "120"))
+
+
+def is_instrumentation_enabled() -> bool:
+    """Проверяет, учитываются ли вызовы Playwright в тестах"""
+    return os.getenv("PW_INSTRUMENT", "false").lower() == "true"
+
+
+def get_round_trip_budget() -> Optional[int]:
+    """Возвращает допустимое число вызовов Playwright в теле теста (None - без ограничения)"""
+    budget = os.getenv("PW_ROUND_TRIP_BUDGET")
+    return int(budget) if budget else None
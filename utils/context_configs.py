@@ -0,0 +1,121 @@
+"""
+Конфигурации контекста браузера, которые объявляют тесты
+
+Конфигурация выбирается маркером @pytest.mark.context_config("mobile_portrait")
+(на тесте или классе) или переменной CONTEXT_CONFIG:
+
+- desktop - 1920x1080, как в get_context_options (по умолчанию);
+- mobile_portrait - телефон 375x667 с касаниями;
+- mobile_landscape - тот же телефон в альбомной ориентации.
+
+Контекст сразу создается с нужным окном, поэтому тестам не нужно менять
+размер после загрузки страницы. Тесты упорядочиваются по движку и конфигурации,
+чтобы браузер, пулы страниц и прогретые страницы использовались подряд.
+"""
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+
+from utils.config import get_context_options
+from utils.engines import item_engine
+
+
+MARKER = "context_config"
+
+MOBILE_USER_AGENT = (
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/16.0 Mobile/15E148 Safari/604.1"
+)
+
+
+@dataclass(frozen=True)
+class ContextConfig:
+    """Параметры контекста поверх get_context_options; None - значение по умолчанию"""
+    name: str
+    viewport: Optional[tuple[int, int]] = None
+    user_agent: Optional[str] = None
+    device_scale_factor: Optional[float] = None
+    is_mobile: bool = False
+    has_touch: bool = False
+    locale: Optional[str] = None
+
+    def options(self, engine: str = "chromium") -> dict:
+        """Параметры browser.new_context для этой конфигурации в указанном движке"""
+        options = get_context_options()
+        if self.viewport is not None:
+            width, height = self.viewport
+            options["viewport"] = {"width": width, "height": height}
+        if self.user_agent is not None:
+            options["user_agent"] = self.user_agent
+        if self.device_scale_factor is not None:
+            options["device_scale_factor"] = self.device_scale_factor
+        # Firefox не поддерживает is_mobile: остаются окно, user agent и касания
+        if self.is_mobile and engine != "firefox":
+            options["is_mobile"] = True
+        if self.has_touch:
+            options["has_touch"] = True
+        if self.locale is not None:
+            options["locale"] = self.locale
+        return options
+
+
+CONTEXT_CONFIGS = {
+    "desktop": ContextConfig("desktop"),
+    "mobile_portrait": ContextConfig(
+        "mobile_portrait",
+        viewport=(375, 667),
+        user_agent=MOBILE_USER_AGENT,
+        device_scale_factor=2,
+        is_mobile=True,
+        has_touch=True,
+    ),
+    "mobile_landscape": ContextConfig(
+        "mobile_landscape",
+        viewport=(667, 375),
+        user_agent=MOBILE_USER_AGENT,
+        device_scale_factor=2,
+        is_mobile=True,
+        has_touch=True,
+    ),
+}
+
+
+def get_context_config(item: Optional[pytest.Item] = None) -> ContextConfig:
+    """Возвращает конфигурацию контекста теста: маркер context_config или CONTEXT_CONFIG"""
+    marker = item.get_closest_marker(MARKER) if item is not None else None
+    name = marker.args[0] if marker is not None else os.getenv("CONTEXT_CONFIG", "desktop")
+    if name not in CONTEXT_CONFIGS:
+        raise ValueError(f"Неизвестная конфигурация {name!r}, ожидается одно из {tuple(CONTEXT_CONFIGS)}")
+    return CONTEXT_CONFIGS[name]
+
+
+def group_by_config(items: list[pytest.Item]) -> list[pytest.Item]:
+    """Упорядочивает тесты по движку и конфигурации, сохраняя порядок внутри групп
+
+    Движки идут в порядке первого появления. Первой в движке идет
+    конфигурация по умолчанию, остальные - в порядке первого появления.
+    """
+    default = get_context_config().name
+    order = {default: 0}
+    engines: dict[str, int] = {}
+    keys = {}
+    for item in items:
+        name = get_context_config(item).name
+        engine = item_engine(item)
+        order.setdefault(name, len(order))
+        engines.setdefault(engine, len(engines))
+        keys[item.nodeid] = (engine, name)
+    return sorted(items, key=lambda item: (engines[keys[item.nodeid][0]], order[keys[item.nodeid][1]]))
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "context_config(name): конфигурация контекста браузера (desktop, mobile_portrait, mobile_landscape)"
+    )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    items[:] = group_by_config(items)
@@ -0,0 +1,58 @@
+"""
+Создание контекстов и загрузка страницы заказа
+"""
+import time
+from typing import Optional
+
+from playwright.async_api import Browser as AsyncBrowser
+from playwright.async_api import BrowserContext as AsyncBrowserContext
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import Browser, BrowserContext, Page
+
+from utils.config import get_base_url, is_web_vitals_enabled
+from utils.context_configs import CONTEXT_CONFIGS, ContextConfig
+from utils.har import HarBundle, apply_har_replay
+from utils.routing import PROFILES, RouteProfile, install_async_resource_blocker, install_resource_blocker
+from utils.timing import record_navigation
+from utils.web_vitals import install_web_vitals
+
+
+def new_order_context(browser: Browser, har_bundle: Optional[HarBundle] = None,
+                      route_profile: RouteProfile = PROFILES["full"],
+                      context_config: ContextConfig = CONTEXT_CONFIGS["desktop"]) -> BrowserContext:
+    """Создает контекст браузера для страницы заказа"""
+    context = browser.new_context(**context_config.options(browser.browser_type.name))
+    if har_bundle is not None:
+        apply_har_replay(context, har_bundle)
+    # Подключается после HAR: последний зарегистрированный маршрут срабатывает первым
+    install_resource_blocker(context, route_profile)
+    if is_web_vitals_enabled():
+        install_web_vitals(context)
+    return context
+
+
+def open_order_page(page: Page) -> Page:
+    """Открывает страницу заказа и ждет окончания загрузки"""
+    start = time.perf_counter()
+    page.goto(get_base_url())
+    page.wait_for_load_state("networkidle")
+    record_navigation(time.perf_counter() - start)
+    return page
+
+
+async def new_async_order_context(browser: AsyncBrowser, har_bundle: Optional[HarBundle] = None,
+                                  route_profile: RouteProfile = PROFILES["full"],
+                                  context_config: ContextConfig = CONTEXT_CONFIGS["desktop"]) -> AsyncBrowserContext:
+    """Создает контекст браузера для страницы заказа (async API)"""
+    context = await browser.new_context(**context_config.options(browser.browser_type.name))
+    if har_bundle is not None:
+        await context.route_from_har(har_bundle.har_path, url="**/*", not_found="abort")
+    await install_async_resource_blocker(context, route_profile)
+    return context
+
+
+async def open_async_order_page(page: AsyncPage) -> AsyncPage:
+    """Открывает страницу заказа и ждет окончания загрузки (async API)"""
+    await page.goto(get_base_url())
+    await page.wait_for_load_state("networkidle")
+    return page
@@ -0,0 +1,160 @@
+"""
+Матрица устройств для асинхронных сценариев: @pytest.mark.device_matrix
+
+Устройства объявляются один раз в DEVICE_MATRIX. Параметры берутся из
+дескрипторов Playwright (playwright.devices), ориентация - из имени
+дескриптора ("... landscape"), касания можно отключить. Сценарий
+async_scenario с маркером device_matrix получает параметр device и
+разворачивается по одному тесту на устройство. Все такие тесты попадают в
+одну пачку раннера (utils/async_scenarios.py) и выполняются одновременно в
+отдельных контекстах одного браузера, поэтому матрица занимает примерно
+столько же времени, сколько самое медленное устройство, а не сумму по всем.
+
+В конце прогона выводится сводка по устройствам: пройдено и упало, суммарное
+время сценариев устройства и общее время матрицы.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+
+from utils.context_configs import ContextConfig
+
+
+MARKER = "device_matrix"
+
+# Параметр сценария, в который подставляется DeviceProfile
+DEVICE_ARGUMENT = "device"
+
+DEVICE_PROPERTY = "device"
+WINDOW_PROPERTY = "scenario_window"
+DURATION_PROPERTY = "scenario_duration"
+
+
+@dataclass(frozen=True)
+class DeviceProfile:
+    """Устройство матрицы: дескриптор Playwright и переопределение касаний"""
+    name: str
+    descriptor: str
+    has_touch: Optional[bool] = None
+
+    @property
+    def landscape(self) -> bool:
+        return self.descriptor.endswith(" landscape")
+
+    def context_config(self, devices: dict) -> ContextConfig:
+        """Конфигурация контекста по дескриптору из playwright.devices"""
+        descriptor = devices[self.descriptor]
+        viewport = descriptor["viewport"]
+        return ContextConfig(
+            self.name,
+            viewport=(viewport["width"], viewport["height"]),
+            user_agent=descriptor["user_agent"],
+            device_scale_factor=descriptor["device_scale_factor"],
+            is_mobile=descriptor["is_mobile"],
+            has_touch=descriptor["has_touch"] if self.has_touch is None else self.has_touch,
+        )
+
+
+DEVICE_MATRIX = (
+    DeviceProfile("iphone_13", "iPhone 13"),
+    DeviceProfile("iphone_13_landscape", "iPhone 13 landscape"),
+    DeviceProfile("pixel_7", "Pixel 7"),
+    DeviceProfile("pixel_7_landscape", "Pixel 7 landscape"),
+    DeviceProfile("ipad_7", "iPad (gen 7)"),
+    # Планшет с клавиатурой и трекпадом: без касаний
+    DeviceProfile("ipad_7_landscape_no_touch", "iPad (gen 7) landscape", has_touch=False),
+    DeviceProfile("galaxy_tab_s4", "Galaxy Tab S4"),
+)
+
+
+def select_devices(names: tuple[str, ...]) -> tuple[DeviceProfile, ...]:
+    """Устройства матрицы по именам; без имен - вся матрица"""
+    if not names:
+        return DEVICE_MATRIX
+    devices = {device.name: device for device in DEVICE_MATRIX}
+    unknown = [name for name in names if name not in devices]
+    if unknown:
+        raise ValueError(f"Неизвестные устройства {unknown}, есть: {', '.join(devices)}")
+    return tuple(devices[name] for name in names)
+
+
+def scenario_device(item: pytest.Item) -> Optional[DeviceProfile]:
+    """Устройство, на котором выполняется сценарий матрицы"""
+    params = item.callspec.params if hasattr(item, "callspec") else {}
+    device = params.get(DEVICE_ARGUMENT)
+    return device if isinstance(device, DeviceProfile) else None
+
+
+@dataclass
+class DeviceResult:
+    """Итоги сценариев одного устройства"""
+    passed: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+    slowest: float = 0.0
+
+
+class DeviceMatrixSummary:
+    """Собирает результаты сценариев матрицы по устройствам (в том числе с воркеров xdist)"""
+
+    def __init__(self):
+        self.devices: dict[str, DeviceResult] = {}
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "call":
+            return
+        properties = dict(report.user_properties)
+        name = properties.get(DEVICE_PROPERTY)
+        if name is None:
+            return
+        result = self.devices.setdefault(name, DeviceResult())
+        if report.passed:
+            result.passed += 1
+        else:
+            result.failed += 1
+        duration = properties.get(DURATION_PROPERTY, report.duration)
+        result.seconds += duration
+        result.slowest = max(result.slowest, duration)
+        if WINDOW_PROPERTY in properties:
+            start, end = properties[WINDOW_PROPERTY]
+            self.started = start if self.started is None else min(self.started, start)
+            self.finished = end if self.finished is None else max(self.finished, end)
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.devices:
+            return
+        write = terminalreporter.write_line
+        terminalreporter.write_sep("-", "Матрица устройств")
+        write(f"{'устройство':<28} {'пройдено':>9} {'упало':>6} {'время, с':>9} {'макс., с':>9}")
+        for name, result in self.devices.items():
+            write(f"{name:<28} {result.passed:>9} {result.failed:>6} {result.seconds:>9.2f} {result.slowest:>9.2f}")
+        if self.started is not None:
+            slowest = max(result.seconds for result in self.devices.values())
+            total = sum(result.seconds for result in self.devices.values())
+            write(f"Матрица: {self.finished - self.started:.2f} с, самое медленное устройство: {slowest:.2f} с, "
+                  f"последовательно было бы {total:.2f} с")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", f"{MARKER}(*names): сценарий async_scenario на каждом устройстве матрицы (параметр device)"
+    )
+    config.pluginmanager.register(DeviceMatrixSummary(), "device_matrix_summary")
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    marker = metafunc.definition.get_closest_marker(MARKER)
+    if marker is None:
+        return
+    devices = select_devices(marker.args)
+    metafunc.parametrize(DEVICE_ARGUMENT, devices, ids=[device.name for device in devices])
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    for item in items:
+        device = scenario_device(item)
+        if device is not None:
+            item.user_properties.append((DEVICE_PROPERTY, device.name))
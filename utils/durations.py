@@ -0,0 +1,147 @@
+"""
+История длительности тестов и распределение по воркерам xdist
+
+После каждого прогона суммарная длительность теста (setup + call + teardown)
+сглаженно записывается в reports/durations.json. С опцией --duration-schedule
+воркеры по этой истории раскладывают тесты в группы схемой LPT
+(см. utils/scheduling.py) и помечают их xdist_group - по группе на воркер.
+Опция работает вместе с --dist loadgroup. Группы, которые назначили другие
+плагины (асинхронные сценарии, движки), не делятся между воркерами.
+Раскладываются только тесты, оставшиеся после отбора -m и -k.
+"""
+import json
+import re
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from _pytest.mark import deselect_by_keyword, deselect_by_mark
+
+from utils.config import REPORTS_DIR
+from utils.scheduling import affinity_key, assign_bins, estimate_durations
+
+
+DURATIONS_PATH = REPORTS_DIR / "durations.json"
+
+# Вес нового измерения при сглаживании
+SMOOTHING = 0.5
+
+GROUP_PREFIX = "lpt"
+
+GROUP_SUFFIX = re.compile(r"@[\w-]+$")
+
+# С этой версии xdist объединяет несколько маркеров xdist_group теста в одну
+# группу; раньше учитывался только ближайший, и группа lptN терялась
+MIN_XDIST_VERSION = (3, 7)
+
+
+def strip_group(nodeid: str) -> str:
+    """Убирает суффикс @группа, который xdist добавляет в режиме loadgroup"""
+    return GROUP_SUFFIX.sub("", nodeid)
+
+
+class DurationStore:
+    """Сглаженные длительности тестов: nodeid -> секунды"""
+
+    def __init__(self, path: Path = DURATIONS_PATH):
+        self.path = path
+        self.durations: dict[str, float] = {}
+        if path.is_file():
+            self.durations = json.loads(path.read_text(encoding="utf-8"))
+
+    def update(self, measured: dict[str, float]) -> None:
+        """Добавляет измерения прогона"""
+        for nodeid, seconds in measured.items():
+            previous = self.durations.get(nodeid)
+            if previous is None:
+                self.durations[nodeid] = seconds
+            else:
+                self.durations[nodeid] = SMOOTHING * seconds + (1 - SMOOTHING) * previous
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.durations, ensure_ascii=False, indent=2, sort_keys=True),
+                             encoding="utf-8")
+
+
+def _xdist_group(item: pytest.Item) -> Optional[str]:
+    """Группа xdist, уже назначенная тесту другим плагином"""
+    names = sorted(str(mark.args[0] if mark.args else mark.kwargs.get("name", "default"))
+                   for mark in item.iter_markers("xdist_group"))
+    return "_".join(names) if names else None
+
+
+def apply_selection(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Снимает тесты, не прошедшие отбор -k и -m, раньше плагина маркеров pytest
+
+    Плагин маркеров отбирает тесты в обычной реализации pytest_collection_modifyitems,
+    то есть после распределения; повторный отбор там уже ничего не снимает.
+    """
+    deselect_by_keyword(items, config)
+    deselect_by_mark(items, config)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--duration-schedule", action="store_true", default=False,
+        help="распределить тесты по воркерам xdist по истории длительностей (с --dist loadgroup)"
+    )
+
+
+class DurationRecorder:
+    """Собирает длительности тестов прогона и сохраняет их в конце сессии"""
+
+    def __init__(self, config: pytest.Config):
+        self.config = config
+        self.measured: dict[str, float] = {}
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        # Под xdist отчеты воркеров приходят и в главный процесс, там и считаем
+        nodeid = strip_group(report.nodeid)
+        self.measured[nodeid] = self.measured.get(nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if hasattr(self.config, "workerinput") or not self.measured:
+            return
+        store = DurationStore()
+        store.update(self.measured)
+        store.save()
+
+
+def _xdist_version() -> Optional[tuple[int, ...]]:
+    try:
+        return tuple(int(part) for part in version("pytest-xdist").split(".")[:2])
+    except PackageNotFoundError:
+        return None
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.pluginmanager.register(DurationRecorder(config), "duration_recorder")
+    installed = _xdist_version()
+    if config.getoption("duration_schedule") and installed is not None and installed < MIN_XDIST_VERSION:
+        raise pytest.UsageError(
+            f"--duration-schedule требует pytest-xdist>={'.'.join(map(str, MIN_XDIST_VERSION))}: "
+            f"старые версии учитывают только одну группу xdist_group теста"
+        )
+
+
+# Раньше обычных реализаций: xdist в своем pytest_collection_modifyitems дописывает
+# к nodeid суффикс @группа, и группы, добавленные после него, уже не учитываются.
+# Группы других плагинов назначаются при сборе тестов (pytest_itemcollected).
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if not config.getoption("duration_schedule") or not hasattr(config, "workerinput"):
+        return
+
+    apply_selection(config, items)
+    groups = {item.nodeid: _xdist_group(item) for item in items}
+    durations = estimate_durations([item.nodeid for item in items], DurationStore().durations)
+    assignment = assign_bins(
+        durations,
+        config.workerinput["workercount"],
+        key=lambda nodeid: groups[nodeid] or affinity_key(nodeid),
+        unsplittable={group for group in groups.values() if group},
+    )
+    for item in items:
+        item.add_marker(pytest.mark.xdist_group(f"{GROUP_PREFIX}{assignment[item.nodeid]}"))
@@ -0,0 +1,172 @@
+"""
+Движки браузера: BROWSER и матрица движков (--engines)
+
+Движок прогона задается переменной BROWSER (chromium, firefox, webkit), ее
+выставляет run_tests.py --browser. С опцией --engines chromium,firefox,webkit
+каждый тест, которому нужен браузер, разворачивается по экземпляру на движок:
+параметр browser_engine уровня сессии, id теста получает суффикс [firefox].
+Тесты движка помечаются xdist_group с его именем, поэтому с
+-n <число движков> --dist loadgroup у каждого движка свой воркер и все движки
+выполняются одновременно в одной сессии с общим отчетом.
+
+В конце прогона выводится сводка по движкам: пройдено, упало, пропущено,
+суммарное время тестов и время от первого до последнего теста движка. Она же
+записывается в reports/engines.json вместе со списком упавших тестов.
+"""
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from utils.config import BROWSER_ENGINES, REPORTS_DIR, get_browser_engine
+from utils.durations import strip_group
+
+
+# Параметр сессии с движком теста; фикстуры браузера зависят от него
+ENGINE_ARGUMENT = "browser_engine"
+ENGINE_PROPERTY = "engine"
+
+ENGINES_REPORT_PATH = REPORTS_DIR / "engines.json"
+
+
+def parse_engines(value: str) -> list[str]:
+    """Движки из строки "chromium,firefox" без повторов, в порядке перечисления"""
+    engines = list(dict.fromkeys(name.strip().lower() for name in value.split(",") if name.strip()))
+    unknown = [name for name in engines if name not in BROWSER_ENGINES]
+    if unknown:
+        raise ValueError(f"Неизвестные движки {unknown}, ожидается одно из {BROWSER_ENGINES}")
+    return engines
+
+
+def get_run_engines(config: pytest.Config) -> list[str]:
+    """Движки прогона: из --engines или один движок из BROWSER"""
+    value = config.getoption("engines", None)
+    return parse_engines(value) if value else [get_browser_engine()]
+
+
+def item_engine(item: pytest.Item) -> str:
+    """Движок, в котором выполняется тест"""
+    params = item.callspec.params if hasattr(item, "callspec") else {}
+    return params.get(ENGINE_ARGUMENT) or get_browser_engine()
+
+
+@dataclass
+class EngineResult:
+    """Итоги тестов одного движка"""
+    outcomes: dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    def count(self, outcome: str) -> int:
+        return sum(1 for value in self.outcomes.values() if value == outcome)
+
+    @property
+    def wall(self) -> float:
+        return self.finished - self.started if self.started is not None else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "passed": self.count("passed"),
+            "failed": self.count("failed"),
+            "skipped": self.count("skipped"),
+            "seconds": round(self.seconds, 3),
+            "wall_seconds": round(self.wall, 3),
+            "failures": sorted(nodeid for nodeid, outcome in self.outcomes.items() if outcome == "failed"),
+        }
+
+
+class EngineSummary:
+    """Собирает результаты по движкам (в том числе с воркеров xdist) и пишет общий отчет"""
+
+    def __init__(self, config: pytest.Config, path: Path = ENGINES_REPORT_PATH):
+        self.config = config
+        self.path = path
+        self.engines: dict[str, EngineResult] = {}
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        engine = dict(report.user_properties).get(ENGINE_PROPERTY)
+        if engine is None:
+            return
+        result = self.engines.setdefault(engine, EngineResult())
+        result.seconds += report.duration
+        start = getattr(report, "start", None)
+        if start is not None:
+            result.started = start if result.started is None else min(result.started, start)
+            result.finished = report.stop if result.finished is None else max(result.finished, report.stop)
+        if report.failed or report.when == "call" or (report.skipped and report.when == "setup"):
+            nodeid = strip_group(report.nodeid)
+            if result.outcomes.get(nodeid) != "failed":
+                result.outcomes[nodeid] = report.outcome
+
+    def as_dict(self) -> dict:
+        windows = [result for result in self.engines.values() if result.started is not None]
+        wall = (max(result.finished for result in windows) - min(result.started for result in windows)
+                if windows else 0.0)
+        return {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "wall_seconds": round(wall, 3),
+            "engines": {engine: result.as_dict() for engine, result in self.engines.items()},
+        }
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if hasattr(self.config, "workerinput") or not self.engines:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.as_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.engines:
+            return
+        write = terminalreporter.write_line
+        terminalreporter.write_sep("-", "Движки браузера")
+        write(f"{'движок':<10} {'пройдено':>9} {'упало':>6} {'пропущено':>10} {'тесты, с':>9} {'окно, с':>8}")
+        for engine, result in self.engines.items():
+            write(f"{engine:<10} {result.count('passed'):>9} {result.count('failed'):>6} "
+                  f"{result.count('skipped'):>10} {result.seconds:>9.2f} {result.wall:>8.2f}")
+        summary = self.as_dict()
+        sequential = sum(result.wall for result in self.engines.values())
+        write(f"Все движки: {summary['wall_seconds']:.2f} с, последовательно было бы {sequential:.2f} с")
+        write(f"Отчет по движкам: {self.path}")
+
+
+@pytest.fixture(scope="session")
+def browser_engine(request: pytest.FixtureRequest) -> str:
+    """Движок браузера: параметр матрицы --engines или BROWSER"""
+    return getattr(request, "param", None) or get_browser_engine()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--engines", default=None,
+        help="выполнить тесты в нескольких движках за один прогон, например chromium,firefox,webkit"
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # Проверяем список сразу, чтобы опечатка не всплыла при параметризации
+    try:
+        get_run_engines(config)
+    except ValueError as error:
+        raise pytest.UsageError(str(error)) from error
+    config.pluginmanager.register(EngineSummary(config), "engine_summary")
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    value = metafunc.config.getoption("engines")
+    if not value or ENGINE_ARGUMENT not in metafunc.fixturenames:
+        return
+    engines = parse_engines(value)
+    metafunc.parametrize(ENGINE_ARGUMENT, engines, indirect=True, scope="session", ids=engines)
+
+
+# Группа назначается при сборе, до распределения по длительности (utils/durations.py)
+def pytest_itemcollected(item: pytest.Item) -> None:
+    params = item.callspec.params if hasattr(item, "callspec") else {}
+    engine = params.get(ENGINE_ARGUMENT)
+    if engine is not None:
+        item.user_properties.append((ENGINE_PROPERTY, engine))
+        item.add_marker(pytest.mark.xdist_group(engine))
@@ -0,0 +1,99 @@
+"""
+Запись и воспроизведение HAR-слепка страницы заказа
+
+Слепок хранится в reports/har/<версия>/: файл order_page.har, ресурсы
+страницы (update_content="attach") и manifest.json с метаданными записи.
+В режиме replay все запросы контекста обслуживаются из слепка, сеть не нужна.
+"""
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from playwright.sync_api import Browser, BrowserContext
+
+from utils.config import ORDER_PAGE_URL, get_context_options, get_har_config
+
+
+HAR_MODES = ("off", "record", "replay")
+
+HAR_FILE_NAME = "order_page.har"
+MANIFEST_FILE_NAME = "manifest.json"
+
+
+@dataclass(frozen=True)
+class HarBundle:
+    """Версионированный HAR-слепок страницы заказа"""
+
+    directory: Path
+    version: str
+
+    @property
+    def har_path(self) -> Path:
+        return self.directory / HAR_FILE_NAME
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / MANIFEST_FILE_NAME
+
+    def exists(self) -> bool:
+        """Проверяет, что слепок записан полностью"""
+        return self.har_path.is_file() and self.manifest_path.is_file()
+
+    def read_manifest(self) -> dict:
+        """Читает метаданные слепка"""
+        return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+
+
+def get_har_mode() -> str:
+    """Возвращает режим работы с HAR: off, record или replay"""
+    mode = get_har_config()["mode"]
+    if mode not in HAR_MODES:
+        raise ValueError(f"Неизвестный HAR_MODE={mode!r}, ожидается одно из {HAR_MODES}")
+    return mode
+
+
+def get_har_bundle(version: Optional[str] = None) -> HarBundle:
+    """Возвращает слепок указанной (или текущей) версии"""
+    config = get_har_config()
+    version = version or config["version"]
+    return HarBundle(directory=config["dir"] / version, version=version)
+
+
+def record_har_bundle(browser: Browser, url: str = ORDER_PAGE_URL,
+                      version: Optional[str] = None) -> HarBundle:
+    """Загружает страницу заказа один раз и сохраняет все запросы в слепок"""
+    bundle = get_har_bundle(version)
+    bundle.directory.mkdir(parents=True, exist_ok=True)
+
+    context = browser.new_context(**get_context_options())
+    context.route_from_har(
+        bundle.har_path,
+        url="**/*",
+        update=True,
+        update_content="attach",
+        update_mode="full",
+    )
+    page = context.new_page()
+    page.goto(url)
+    page.wait_for_load_state("networkidle")
+    # HAR дописывается на диск только при закрытии контекста
+    context.close()
+
+    har = json.loads(bundle.har_path.read_text(encoding="utf-8"))
+    manifest = {
+        "version": bundle.version,
+        "url": url,
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "browser": browser.browser_type.name,
+        "browser_version": browser.version,
+        "entries": len(har["log"]["entries"]),
+    }
+    bundle.manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    return bundle
+
+
+def apply_har_replay(context: BrowserContext, bundle: HarBundle) -> None:
+    """Подключает воспроизведение слепка: запросы вне слепка обрываются"""
+    context.route_from_har(bundle.har_path, url="**/*", not_found="abort")
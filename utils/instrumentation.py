@@ -0,0 +1,216 @@
+"""
+Учет вызовов Playwright в тестах (PW_INSTRUMENT=true)
+
+Методы синхронных Page и Locator, которыми пользуются OrderPage и BaseTest,
+оборачиваются счетчиком: для каждого теста собирается число вызовов и
+гистограмма задержек каждого метода (корзины по степеням двойки в
+микросекундах - запись стоит одно сложение). В конце сессии выводится сводная
+таблица по методам и самые «разговорчивые» тесты.
+
+Бюджет вызовов в теле теста задается маркером
+@pytest.mark.round_trip_budget(20) или переменной PW_ROUND_TRIP_BUDGET;
+тест, который его превысил, помечается упавшим.
+"""
+import functools
+import time
+from typing import Optional
+
+import pytest
+from playwright.sync_api import Locator, Page
+
+from utils.config import get_round_trip_budget, is_instrumentation_enabled
+
+
+MARKER = "round_trip_budget"
+
+CALLS_PROPERTY = "pw_calls"
+
+INSTRUMENTED_METHODS = {
+    Locator: (
+        "fill", "check", "uncheck", "set_checked", "click", "select_option",
+        "is_visible", "is_checked", "is_enabled", "text_content", "input_value",
+        "count", "wait_for", "evaluate",
+    ),
+    Page: (
+        "goto", "reload", "evaluate", "wait_for_load_state", "wait_for_url",
+        "wait_for_timeout", "screenshot", "set_viewport_size",
+    ),
+}
+
+
+class CallHistogram:
+    """Число вызовов метода и гистограмма задержек по степеням двойки в микросекундах"""
+
+    __slots__ = ("count", "total_ns", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.buckets: dict[int, int] = {}
+
+    def add(self, elapsed_ns: int) -> None:
+        self.count += 1
+        self.total_ns += elapsed_ns
+        bucket = (elapsed_ns // 1000).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def merge(self, other: dict) -> None:
+        """Добавляет гистограмму, пришедшую из отчета теста"""
+        self.count += other["count"]
+        self.total_ns += other["total_ns"]
+        for bucket, count in other["buckets"].items():
+            self.buckets[int(bucket)] = self.buckets.get(int(bucket), 0) + count
+
+    def as_dict(self) -> dict:
+        return {"count": self.count, "total_ns": self.total_ns, "buckets": dict(self.buckets)}
+
+    def percentile_us(self, q: float) -> int:
+        """Верхняя граница корзины, в которую попадает перцентиль q, в микросекундах"""
+        threshold = self.count * q / 100
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= threshold:
+                return 1 << bucket
+        return 0
+
+
+class CallRecorder:
+    """Вызовы Playwright одного теста по методам"""
+
+    def __init__(self):
+        self.methods: dict[str, CallHistogram] = {}
+        self.calls = 0
+
+    def add(self, method: str, elapsed_ns: int) -> None:
+        self.calls += 1
+        histogram = self.methods.get(method)
+        if histogram is None:
+            histogram = self.methods[method] = CallHistogram()
+        histogram.add(elapsed_ns)
+
+
+_recorder: Optional[CallRecorder] = None
+
+
+def _instrument(cls: type, name: str) -> None:
+    original = getattr(cls, name)
+    if hasattr(original, "__wrapped__"):
+        return
+    method = f"{cls.__name__}.{name}"
+
+    @functools.wraps(original)
+    def wrapper(self, *args, **kwargs):
+        recorder = _recorder
+        if recorder is None:
+            return original(self, *args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            recorder.add(method, time.perf_counter_ns() - start)
+
+    setattr(cls, name, wrapper)
+
+
+def install() -> None:
+    """Оборачивает методы Page и Locator счетчиком"""
+    for cls, names in INSTRUMENTED_METHODS.items():
+        for name in names:
+            _instrument(cls, name)
+
+
+def uninstall() -> None:
+    """Возвращает исходные методы"""
+    for cls, names in INSTRUMENTED_METHODS.items():
+        for name in names:
+            wrapped = getattr(getattr(cls, name), "__wrapped__", None)
+            if wrapped is not None:
+                setattr(cls, name, wrapped)
+
+
+def _budget(item: pytest.Item) -> Optional[int]:
+    marker = item.get_closest_marker(MARKER)
+    if marker is not None:
+        return marker.args[0]
+    return get_round_trip_budget()
+
+
+class InstrumentationPlugin:
+    """Плагин: включает учет на время теста и выводит сводку сессии"""
+
+    def __init__(self):
+        self.totals: dict[str, CallHistogram] = {}
+        self.tests: dict[str, int] = {}
+        self._body_calls = 0
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item: pytest.Item):
+        global _recorder
+        _recorder = CallRecorder()
+        try:
+            yield
+        finally:
+            _recorder = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item: pytest.Item):
+        before = _recorder.calls if _recorder is not None else 0
+        yield
+        self._body_calls = (_recorder.calls if _recorder is not None else 0) - before
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item: pytest.Item, call: pytest.CallInfo):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when == "call" and report.passed:
+            budget = _budget(item)
+            if budget is not None and self._body_calls > budget:
+                report.outcome = "failed"
+                report.longrepr = (f"Вызовов Playwright в теле теста: {self._body_calls}, "
+                                   f"бюджет {budget}")
+        if report.when == "teardown" and _recorder is not None:
+            # Передаем через отчет, чтобы сводка собиралась и в главном процессе xdist
+            calls = {method: histogram.as_dict() for method, histogram in _recorder.methods.items()}
+            report.user_properties.append((CALLS_PROPERTY, calls))
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "teardown":
+            return
+        for name, calls in report.user_properties:
+            if name != CALLS_PROPERTY:
+                continue
+            for method, histogram in calls.items():
+                self.totals.setdefault(method, CallHistogram()).merge(histogram)
+            self.tests[report.nodeid] = sum(histogram["count"] for histogram in calls.values())
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.totals:
+            return
+        write = terminalreporter.write_line
+        terminalreporter.write_sep("-", "Вызовы Playwright")
+        write(f"{'метод':<32} {'вызовов':>8} {'всего, мс':>10} {'среднее, мкс':>13} {'p50 до, мкс':>12} "
+              f"{'p95 до, мкс':>12}")
+        for method, histogram in sorted(self.totals.items(), key=lambda item: -item[1].total_ns):
+            write(f"{method:<32} {histogram.count:>8} {histogram.total_ns / 1e6:>10.1f} "
+                  f"{histogram.total_ns / histogram.count / 1000:>13.0f} {histogram.percentile_us(50):>12} "
+                  f"{histogram.percentile_us(95):>12}")
+        write("")
+        write("Больше всего вызовов:")
+        for nodeid, calls in sorted(self.tests.items(), key=lambda item: -item[1])[:5]:
+            write(f"{calls:>6}  {nodeid}")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "round_trip_budget(calls): допустимое число вызовов Playwright в теле теста (PW_INSTRUMENT=true)"
+    )
+    if not is_instrumentation_enabled():
+        return
+    install()
+    config.pluginmanager.register(InstrumentationPlugin(), "playwright_instrumentation")
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    if config.pluginmanager.has_plugin("playwright_instrumentation"):
+        uninstall()
@@ -0,0 +1,204 @@
+"""
+Нагрузочный режим: сценарий заказа через AsyncOrderPage во множестве контекстов
+
+Сценарии запускаются по открытой модели: новые заказы приходят с заданной
+частотой независимо от того, успевают ли завершиться предыдущие. Одновременно
+открыто не больше concurrency контекстов одного браузера; пришедшие сверх
+лимита заказы ждут в очереди, и это ожидание входит в полное время заказа.
+
+Для каждого шага (open, fill, delivery, payment, submit, confirm) собираются
+задержки и ошибки, для прогона - пропускная способность. Без сети сценарий
+можно гонять на локальной копии страницы (LOCAL_SITE=true) или на
+HAR-слепке (HAR_MODE=replay).
+
+Шаг confirm на локальной копии ждет ответа на POST /api/orders, и заказы,
+отклоненные сервером, попадают в его ошибки. На HAR-слепке (в нем записана
+только загрузка страницы) и на основном стенде заказ считается
+подтвержденным, когда закрывается окно подтверждения.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import Browser, Response, async_playwright
+
+from pages.async_order_page import AsyncOrderPage
+from pages.order_page import OrderData
+from utils.config import get_browser_engine, get_launch_options, get_local_site_latency, is_local_site_enabled
+from utils.context_factory import new_async_order_context, open_async_order_page
+from utils.har import HarBundle, get_har_bundle, get_har_mode
+from utils.local_site import ORDERS_ENDPOINT, parse_latency, serve_local_site
+from utils.routing import get_route_profile
+from utils.stats import percentile
+
+
+STEPS = ("open", "fill", "delivery", "payment", "submit", "confirm")
+
+# Полное время заказа от запланированного прихода до подтверждения
+SCENARIO = "scenario"
+
+
+@dataclass(frozen=True)
+class LoadConfig:
+    """Параметры нагрузки: частота прихода заказов в секунду, длительность и лимит контекстов"""
+    rate: float = 5.0
+    duration: float = 60.0
+    concurrency: int = 50
+
+
+@dataclass
+class LoadReport:
+    """Задержки шагов (секунды) и ошибки нагрузочного прогона"""
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+    started: int = 0
+    completed: int = 0
+    elapsed: float = 0.0
+
+    def add_latency(self, step: str, seconds: float) -> None:
+        self.latencies.setdefault(step, []).append(seconds)
+
+    def add_error(self, step: str) -> None:
+        self.errors[step] = self.errors.get(step, 0) + 1
+
+    @property
+    def throughput(self) -> float:
+        """Завершенных заказов в секунду"""
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    def error_rate(self, step: str) -> float:
+        """Доля неудачных попыток шага"""
+        attempts = len(self.latencies.get(step, [])) + self.errors.get(step, 0)
+        return self.errors.get(step, 0) / attempts if attempts else 0.0
+
+    def format(self) -> str:
+        """Таблица задержек по шагам в миллисекундах"""
+        lines = [
+            f"Заказов: начато {self.started}, завершено {self.completed} за {self.elapsed:.1f} с "
+            f"({self.throughput:.2f} заказов/с)",
+            f"{'шаг':<10} {'успешно':>8} {'ошибки':>12} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}",
+        ]
+        for step in STEPS + (SCENARIO,):
+            values = self.latencies.get(step, [])
+            errors = self.errors.get(step, 0)
+            if not values and not errors:
+                continue
+            stats = [percentile(values, q) * 1000 for q in (50, 95, 99)] + [max(values) * 1000] if values else []
+            cells = " ".join(f"{value:>9.0f}" for value in stats) if stats else f"{'-':>9}"
+            lines.append(f"{step:<10} {len(values):>8} {f'{errors} ({self.error_rate(step):.0%})':>12} {cells}")
+        return "\n".join(lines)
+
+
+def arrival_offsets(rate: float, duration: float) -> list[float]:
+    """Моменты прихода заказов от начала прогона при постоянной частоте"""
+    return [index / rate for index in range(int(rate * duration))]
+
+
+def load_order(index: int) -> OrderData:
+    """Уникальные данные заказа для очередного прихода"""
+    return OrderData(
+        first_name="Нагрузка",
+        last_name=f"Тест{index}",
+        email=f"load{index}@example.com",
+        phone="+7 (999) 000-00-00",
+        city="Москва",
+        address=f"ул. Нагрузочная, д. {index}",
+    )
+
+
+def is_order_response(response: Response) -> bool:
+    """Ответ на отправку заказа из окна подтверждения"""
+    return response.request.method == "POST" and urlparse(response.url).path.endswith(ORDERS_ENDPOINT)
+
+
+class LoadGenerator:
+    """Запускает сценарии заказа с заданной частотой и собирает отчет"""
+
+    def __init__(self, config: LoadConfig, har_bundle: Optional[HarBundle] = None, check_orders: bool = False):
+        self.config = config
+        self.har_bundle = har_bundle
+        # Ответ на отправку заказа проверяется только там, где есть POST /api/orders
+        self.check_orders = check_orders
+        self.report = LoadReport()
+
+    async def run(self) -> LoadReport:
+        async with async_playwright() as p:
+            browser = await p[get_browser_engine()].launch(**get_launch_options())
+            semaphore = asyncio.Semaphore(self.config.concurrency)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            tasks = []
+            try:
+                for index, offset in enumerate(arrival_offsets(self.config.rate, self.config.duration)):
+                    await asyncio.sleep(max(0.0, start + offset - loop.time()))
+                    tasks.append(asyncio.create_task(self._order(browser, semaphore, index, loop.time())))
+                await asyncio.gather(*tasks)
+            finally:
+                await browser.close()
+            self.report.elapsed = loop.time() - start
+        return self.report
+
+    async def _order(self, browser: Browser, semaphore: asyncio.Semaphore, index: int, arrived: float) -> None:
+        async with semaphore:
+            self.report.started += 1
+            context = await new_async_order_context(browser, self.har_bundle, get_route_profile())
+            try:
+                page = await context.new_page()
+                order_page = AsyncOrderPage(page)
+                steps = (
+                    ("open", lambda: open_async_order_page(page)),
+                    ("fill", lambda: order_page.fill_order(load_order(index))),
+                    ("delivery", lambda: order_page.select_delivery_method("courier")),
+                    ("payment", lambda: order_page.select_payment_method("card")),
+                    ("submit", lambda: self._submit(order_page)),
+                    ("confirm", lambda: self._confirm(order_page)),
+                )
+                for step, action in steps:
+                    if not await self._step(step, action):
+                        return
+            finally:
+                await context.close()
+            self.report.completed += 1
+            self.report.add_latency(SCENARIO, asyncio.get_running_loop().time() - arrived)
+
+    async def _step(self, step: str, action) -> bool:
+        """Выполняет шаг и учитывает его задержку или ошибку"""
+        start = time.perf_counter()
+        try:
+            await action()
+        except Exception:
+            self.report.add_error(step)
+            return False
+        self.report.add_latency(step, time.perf_counter() - start)
+        return True
+
+    @staticmethod
+    async def _submit(order_page: AsyncOrderPage) -> None:
+        await order_page.submit_order()
+        await order_page.confirmation_modal.wait_for(state="visible")
+
+    async def _confirm(self, order_page: AsyncOrderPage) -> None:
+        """Подтверждает заказ: по ответу сервера на его отправку или по закрытию окна подтверждения"""
+        if not self.check_orders:
+            await order_page.confirm_order()
+            await order_page.confirmation_modal.wait_for(state="hidden")
+            return
+        async with order_page.page.expect_response(is_order_response) as response_info:
+            await order_page.confirm_order()
+        response = await response_info.value
+        if not response.ok:
+            raise RuntimeError(f"Заказ отклонен: {response.status} {response.status_text}")
+
+
+def run_load(config: LoadConfig) -> LoadReport:
+    """Запускает нагрузочный прогон на локальной копии, HAR-слепке или основном стенде"""
+    if is_local_site_enabled():
+        with serve_local_site(parse_latency(get_local_site_latency())):
+            return asyncio.run(LoadGenerator(config, check_orders=True).run())
+    har_bundle = get_har_bundle() if get_har_mode() == "replay" else None
+    if har_bundle is not None and not har_bundle.exists():
+        raise RuntimeError(f"HAR-слепок не найден в {har_bundle.directory}: "
+                           f"запишите его командой python run_tests.py --record-har")
+    return asyncio.run(LoadGenerator(config, har_bundle).run())
@@ -0,0 +1,125 @@
+"""
+Локальная копия страницы заказа (LOCAL_SITE=true)
+
+Статические файлы из каталога local_site/ отдаются многопоточным HTTP-сервером
+внутри процесса тестов; подтверждение заказа отправляется в POST /api/orders.
+Искусственную задержку можно задать для каждого адреса переменной
+LOCAL_SITE_LATENCY в миллисекундах, например "/=50,/api/orders=200,*=10"
+(* - для остальных адресов).
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from pathlib import Path
+from typing import Generator, Optional
+from urllib.parse import urlparse
+
+
+LOCAL_SITE_DIR = Path(__file__).resolve().parent.parent / "local_site"
+
+ORDERS_ENDPOINT = "/api/orders"
+
+
+def parse_latency(spec: str) -> dict[str, float]:
+    """Разбирает задержки вида "/=50,/api/orders=200,*=10" в секунды по адресам"""
+    latency = {}
+    for part in filter(None, (part.strip() for part in spec.split(","))):
+        path, _, milliseconds = part.rpartition("=")
+        if not path:
+            raise ValueError(f"Ожидается адрес=миллисекунды, получено {part!r}")
+        latency[path] = float(milliseconds) / 1000
+    return latency
+
+
+class OrderSiteHandler(SimpleHTTPRequestHandler):
+    """Отдает файлы страницы и принимает заказы с настроенной задержкой"""
+
+    def __init__(self, *args, site: "LocalSite", **kwargs):
+        self.site = site
+        super().__init__(*args, directory=str(LOCAL_SITE_DIR), **kwargs)
+
+    def _delay(self) -> None:
+        path = urlparse(self.path).path
+        delay = self.site.latency.get(path, self.site.latency.get("*", 0.0))
+        if delay:
+            time.sleep(delay)
+
+    def do_GET(self) -> None:
+        self._delay()
+        super().do_GET()
+
+    def do_POST(self) -> None:
+        self._delay()
+        if urlparse(self.path).path != ORDERS_ENDPOINT:
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            order = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self.send_error(400, "Некорректный JSON")
+            return
+        body = json.dumps({"id": self.site.accept(order)}).encode()
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        # Журнал запросов засорял бы вывод pytest
+        pass
+
+
+class LocalSite:
+    """HTTP-сервер локальной страницы заказа в фоновом потоке"""
+
+    def __init__(self, latency: Optional[dict[str, float]] = None, port: int = 0):
+        self.latency = latency or {}
+        self.orders: list[dict] = []
+        self._ids = count(1)
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), partial(OrderSiteHandler, site=self))
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, name="local-site", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def accept(self, order: dict) -> int:
+        """Сохраняет заказ и возвращает его номер"""
+        with self._lock:
+            order_id = next(self._ids)
+            self.orders.append(order)
+        return order_id
+
+    def start(self) -> "LocalSite":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@contextmanager
+def serve_local_site(latency: Optional[dict[str, float]] = None) -> Generator[LocalSite, None, None]:
+    """Запускает локальную копию на время блока и направляет на нее BASE_URL, затем возвращает прежний"""
+    site = LocalSite(latency).start()
+    previous = os.environ.get("BASE_URL")
+    os.environ["BASE_URL"] = site.url
+    try:
+        yield site
+    finally:
+        if previous is None:
+            os.environ.pop("BASE_URL", None)
+        else:
+            os.environ["BASE_URL"] = previous
+        site.stop()
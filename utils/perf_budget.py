@@ -0,0 +1,138 @@
+"""
+Бюджеты задержки взаимодействий с формой: @pytest.mark.perf_budget(ms=300, repeat=5)
+
+Фикстура perf_budget измеряет время от действия пользователя до нужного
+изменения страницы прямо в странице: перед действием подключаются
+перехватчики событий ввода (начало отсчета) и MutationObserver, который
+фиксирует момент выполнения условия (конец отсчета). Действие повторяется
+repeat раз, берется медиана; если она больше бюджета, тест падает.
+
+Бюджеты умножаются на PERF_BUDGET_SCALE, чтобы их можно было ослабить
+на медленных стендах, не меняя тесты.
+"""
+from statistics import median
+from typing import Callable, Optional
+
+import pytest
+from playwright.sync_api import Page
+
+from pages.order_page import PRICE_LABELS, READ_PRICES_JS
+from utils.config import get_perf_budget_scale
+
+
+MARKER = "perf_budget"
+
+DEFAULT_REPEAT = 5
+PROBE_TIMEOUT = 10000
+
+# Ждет, пока условие станет ложным (страница вернулась в исходное состояние),
+# затем засекает первое событие ввода и момент, когда условие выполнилось
+ARM_PROBE_JS = """
+async ({condition, timeout}) => {
+    const readPrices = %s;
+    const normalize = text => (text || '').replace(/[\\s\\u00a0\\u202f]+/g, ' ').trim();
+    const visible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const met = () => condition.price
+        ? normalize(readPrices({[condition.price]: condition.labels})[condition.price]) === normalize(condition.value)
+        : Array.from(document.querySelectorAll(condition.selector)).some(el =>
+            visible(el) && (!condition.text || normalize(el.textContent).includes(normalize(condition.text))));
+    const waitFor = (predicate, message) => new Promise((resolve, reject) => {
+        if (predicate()) {
+            resolve(performance.now());
+            return;
+        }
+        const observer = new MutationObserver(() => {
+            if (predicate()) {
+                const now = performance.now();
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(now);
+            }
+        });
+        const timer = setTimeout(() => {
+            observer.disconnect();
+            reject(new Error(message));
+        }, timeout);
+        observer.observe(document.documentElement,
+            {subtree: true, childList: true, characterData: true, attributes: true});
+    });
+
+    await waitFor(() => !met(), 'условие выполнено еще до действия');
+    let start = null;
+    const events = ['pointerdown', 'mousedown', 'keydown', 'click', 'input', 'change'];
+    const onEvent = () => {
+        if (start === null) start = performance.now();
+    };
+    events.forEach(type => document.addEventListener(type, onEvent, true));
+    const probe = waitFor(() => start !== null && met(), 'условие не выполнилось после действия')
+        .then(end => end - start)
+        .finally(() => events.forEach(type => document.removeEventListener(type, onEvent, true)));
+    probe.catch(() => {});
+    window.__perfProbe = probe;
+}
+""" % READ_PRICES_JS
+
+
+def price_shown(key: str, value: str) -> dict:
+    """Условие: в сводке заказа строка key (см. PRICE_LABELS) показывает value"""
+    return {"price": key, "labels": PRICE_LABELS[key], "value": value}
+
+
+def element_shown(selector: str, text: Optional[str] = None) -> dict:
+    """Условие: виден элемент по CSS-селектору (и содержит text)"""
+    return {"selector": selector, "text": text}
+
+
+class InteractionBudget:
+    """Измеряет задержки взаимодействий и проверяет их по бюджету теста"""
+
+    def __init__(self, page: Page, budget_ms: Optional[float], repeat: int, item: pytest.Item):
+        self.page = page
+        self.budget_ms = budget_ms * get_perf_budget_scale() if budget_ms is not None else None
+        self.repeat = repeat
+        self.item = item
+
+    def sample(self, action: Callable[[], None], until: dict) -> float:
+        """Одно измерение: миллисекунды от первого события действия до выполнения условия"""
+        self.page.evaluate(ARM_PROBE_JS, {"condition": until, "timeout": PROBE_TIMEOUT})
+        action()
+        return self.page.evaluate("() => window.__perfProbe")
+
+    def measure(self, name: str, action: Callable[[], None], until: dict,
+                reset: Optional[Callable[[], None]] = None) -> float:
+        """Медиана repeat измерений; тест падает, если она больше бюджета
+
+        reset возвращает страницу в состояние до действия перед каждым повтором.
+        """
+        samples = []
+        for index in range(self.repeat):
+            if index and reset is not None:
+                reset()
+            samples.append(self.sample(action, until))
+        result = median(samples)
+        self.item.user_properties.append((f"perf:{name}", result))
+        if self.budget_ms is not None and result > self.budget_ms:
+            pytest.fail(
+                f"{name}: медиана {result:.1f} мс больше бюджета {self.budget_ms:.0f} мс "
+                f"(замеры: {', '.join(f'{value:.1f}' for value in samples)})",
+                pytrace=False,
+            )
+        return result
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "perf_budget(ms, repeat=5): бюджет задержки взаимодействия в миллисекундах"
+    )
+
+
+@pytest.fixture
+def perf_budget(request: pytest.FixtureRequest, order_page: Page) -> InteractionBudget:
+    """Фикстура измерения задержек взаимодействий по бюджету из маркера perf_budget"""
+    marker = request.node.get_closest_marker(MARKER)
+    budget_ms = None
+    repeat = DEFAULT_REPEAT
+    if marker is not None:
+        budget_ms = marker.kwargs.get("ms", marker.args[0] if marker.args else None)
+        repeat = marker.kwargs.get("repeat", DEFAULT_REPEAT)
+    return InteractionBudget(order_page, budget_ms, repeat, request.node)
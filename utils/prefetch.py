@@ -0,0 +1,137 @@
+"""
+Пул заранее загруженных страниц заказа (PREFETCH_POOL=K)
+
+Каждый процесс держит до K контекстов, в которых уже запущена загрузка
+страницы заказа. Тест получает страницу из пула, и сразу же запускается
+загрузка следующей: браузер грузит ее параллельно с выполнением теста.
+К моменту передачи страница обычно уже дошла до networkidle, и ожидание
+почти нулевое.
+
+Страницы старше PREFETCH_MAX_AGE секунд, закрытые или упавшие выбрасываются.
+Число контекстов в пуле не больше K, поэтому память ограничена.
+
+У каждой конфигурации контекста (см. utils/context_configs.py) свой пул.
+Тесты упорядочены по конфигурации, поэтому держится только пул текущей:
+при переходе к следующей конфигурации пул предыдущей закрывается.
+"""
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+from playwright.sync_api import BrowserContext, Error, Page
+
+from utils.browser_server import BrowserProvider
+from utils.config import get_base_url, get_prefetch_max_age
+from utils.context_configs import CONTEXT_CONFIGS, ContextConfig
+from utils.context_factory import new_order_context
+from utils.har import HarBundle
+from utils.routing import get_route_profile
+from utils.timing import record_navigation
+
+
+# Тест получил страницу из пула: ее не нужно загружать заново
+PREFETCHED_KEY = pytest.StashKey[bool]()
+
+# Запускает навигацию, не дожидаясь ее окончания
+START_NAVIGATION_JS = "url => { location.href = url; }"
+
+
+@dataclass
+class PrefetchedPage:
+    """Страница, загрузка которой запущена заранее"""
+    context: BrowserContext
+    page: Page
+    started: float
+
+
+class PrefetchPool:
+    """Ограниченный пул контекстов с заранее загружаемой страницей заказа"""
+
+    def __init__(self, browser_provider: BrowserProvider, har_bundle: Optional[HarBundle],
+                 size: int, max_age: Optional[float] = None,
+                 context_config: ContextConfig = CONTEXT_CONFIGS["desktop"]):
+        self.browser_provider = browser_provider
+        self.har_bundle = har_bundle
+        self.size = size
+        self.context_config = context_config
+        self.max_age = max_age if max_age is not None else get_prefetch_max_age()
+        self.discarded = 0
+        self._pages: deque[PrefetchedPage] = deque()
+
+    def _start(self) -> PrefetchedPage:
+        context = new_order_context(self.browser_provider.get(), self.har_bundle, get_route_profile(),
+                                    self.context_config)
+        page = context.new_page()
+        page.evaluate(START_NAVIGATION_JS, get_base_url())
+        return PrefetchedPage(context, page, time.monotonic())
+
+    def fill(self) -> None:
+        """Дополняет пул до размера, запуская загрузку новых страниц"""
+        while len(self._pages) < self.size:
+            self._pages.append(self._start())
+
+    def _discard(self, entry: PrefetchedPage) -> None:
+        self.discarded += 1
+        try:
+            entry.context.close()
+        except Error:
+            # Браузер мог отключиться вместе со страницей
+            pass
+
+    def _is_stale(self, entry: PrefetchedPage) -> bool:
+        return (time.monotonic() - entry.started > self.max_age
+                or entry.page.is_closed()
+                or not entry.context.browser.is_connected())
+
+    def acquire(self) -> Page:
+        """Выдает загруженную страницу в собственном контексте и запускает загрузку следующей"""
+        for _ in range(self.size + 1):
+            if not self._pages:
+                self.fill()
+            entry = self._pages.popleft()
+            if self._is_stale(entry):
+                self._discard(entry)
+                continue
+            start = time.perf_counter()
+            try:
+                entry.page.wait_for_url(f"{get_base_url()}**", wait_until="networkidle")
+            except Error:
+                self._discard(entry)
+                continue
+            record_navigation(time.perf_counter() - start)
+            self.fill()
+            return entry.page
+        raise RuntimeError(f"Не удалось загрузить страницу заказа: выброшено {self.discarded} страниц пула")
+
+    def close(self) -> None:
+        while self._pages:
+            entry = self._pages.popleft()
+            try:
+                entry.context.close()
+            except Error:
+                pass
+
+
+class PrefetchPools:
+    """Пулы заранее загруженных страниц по конфигурациям контекста; открыт только пул текущей"""
+
+    def __init__(self, browser_provider: BrowserProvider, har_bundle: Optional[HarBundle], size: int):
+        self.browser_provider = browser_provider
+        self.har_bundle = har_bundle
+        self.size = size
+        self._current: Optional[PrefetchPool] = None
+
+    def acquire(self, context_config: ContextConfig) -> Page:
+        """Выдает загруженную страницу в контексте нужной конфигурации"""
+        if self._current is None or self._current.context_config != context_config:
+            self.close()
+            self._current = PrefetchPool(self.browser_provider, self.har_bundle, self.size,
+                                         context_config=context_config)
+        return self._current.acquire()
+
+    def close(self) -> None:
+        if self._current is not None:
+            self._current.close()
+            self._current = None
@@ -0,0 +1,89 @@
+"""
+Итоги прогона в JSON (--results-json PATH)
+
+Для каждого теста записываются исход (passed, failed, skipped), суммарная
+длительность фаз и маркеры теста. Под pytest-xdist маркеры передаются с
+воркеров через user_properties, а файл пишет главный процесс. По файлу
+run_tests.py печатает сводку по наборам тестов одного прогона.
+"""
+import json
+import time
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from utils.durations import strip_group
+
+
+MARKERS_PROPERTY = "markers"
+
+OUTCOMES = ("passed", "failed", "skipped")
+
+
+class ResultsRecorder:
+    """Собирает исходы тестов прогона и пишет их в JSON в конце сессии"""
+
+    def __init__(self, config: pytest.Config, path: Path):
+        self.config = config
+        self.path = path
+        self.started = time.time()
+        self.tests: dict[str, dict] = {}
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        nodeid = strip_group(report.nodeid)
+        markers = dict(report.user_properties).get(MARKERS_PROPERTY, [])
+        entry = self.tests.setdefault(nodeid, {"outcome": "passed", "duration": 0.0, "markers": markers})
+        entry["duration"] += report.duration
+        if report.failed or report.when == "call" or (report.skipped and report.when == "setup"):
+            if entry["outcome"] != "failed":
+                entry["outcome"] = report.outcome
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if hasattr(self.config, "workerinput"):
+            return
+        results = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "duration": round(time.time() - self.started, 3),
+            "shard": self.config.getoption("shard", None),
+            "tests": self.tests,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def read_results(path: Path) -> dict:
+    """Читает итоги прогона, записанные с --results-json"""
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def summarize(tests: dict[str, dict], marker: Optional[str] = None) -> dict:
+    """Число тестов по исходам и суммарное время; с marker - только тесты с этим маркером"""
+    summary = dict.fromkeys(OUTCOMES, 0)
+    summary["seconds"] = 0.0
+    for entry in tests.values():
+        if marker is not None and marker not in entry["markers"]:
+            continue
+        summary[entry["outcome"]] += 1
+        summary["seconds"] += entry["duration"]
+    return summary
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--results-json", default=None, metavar="PATH",
+        help="записать исходы, длительности и маркеры тестов прогона в JSON"
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    path = config.getoption("results_json")
+    if path:
+        config.pluginmanager.register(ResultsRecorder(config, Path(path)), "results_recorder")
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if not config.getoption("results_json"):
+        return
+    for item in items:
+        item.user_properties.append((MARKERS_PROPERTY, sorted({mark.name for mark in item.iter_markers()})))
@@ -0,0 +1,254 @@
+"""
+Профили блокировки ресурсов при загрузке страницы заказа
+
+Профиль выбирается маркером @pytest.mark.route_profile("minimal") или
+переменной ROUTE_PROFILE:
+
+- full - страница загружается целиком (по умолчанию);
+- functional - картинки подменяются пустым GIF, медиа, шрифты и счетчики
+  аналитики не загружаются;
+- minimal - дополнительно отбрасываются все запросы к сторонним хостам.
+
+В конце прогона выводится число заблокированных запросов и оценка
+сэкономленных байт: по размерам из HAR-слепка, если он записан, а без него
+при ROUTE_MEASURE_BLOCKED=true - по Content-Length из HEAD-запроса к ресурсу.
+"""
+import base64
+import json
+import os
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlparse
+
+import pytest
+from playwright.async_api import BrowserContext as AsyncBrowserContext
+from playwright.async_api import Route as AsyncRoute
+from playwright.sync_api import BrowserContext, Error, Route
+
+from utils.config import get_base_url, is_blocked_size_probe_enabled
+from utils.har import get_har_bundle
+
+
+@dataclass(frozen=True)
+class RouteProfile:
+    """Правила профиля: какие типы ресурсов подменять и отбрасывать"""
+    name: str
+    stub_types: frozenset[str] = frozenset()
+    abort_types: frozenset[str] = frozenset()
+    abort_hosts: tuple[str, ...] = ()
+    abort_third_party: bool = False
+
+
+ANALYTICS_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "mc.yandex.ru",
+    "connect.facebook.net",
+)
+
+PROFILES = {
+    "full": RouteProfile("full"),
+    "functional": RouteProfile(
+        "functional",
+        stub_types=frozenset({"image"}),
+        abort_types=frozenset({"media", "font"}),
+        abort_hosts=ANALYTICS_HOSTS,
+    ),
+    "minimal": RouteProfile(
+        "minimal",
+        stub_types=frozenset({"image"}),
+        abort_types=frozenset({"media", "font", "manifest", "other"}),
+        abort_hosts=ANALYTICS_HOSTS,
+        abort_third_party=True,
+    ),
+}
+
+# Ожидание ответа на HEAD-запрос размера ресурса, мс
+SIZE_PROBE_TIMEOUT = 5000
+
+# Прозрачный GIF 1x1 вместо картинок, чтобы не срабатывали обработчики ошибок загрузки
+EMPTY_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+BLOCKED_REQUESTS_PROPERTY = "blocked_requests"
+BLOCKED_BYTES_PROPERTY = "blocked_bytes"
+
+
+def get_route_profile(item: Optional[pytest.Item] = None) -> RouteProfile:
+    """Возвращает профиль теста: маркер route_profile или ROUTE_PROFILE"""
+    marker = item.get_closest_marker("route_profile") if item is not None else None
+    name = marker.args[0] if marker is not None else os.getenv("ROUTE_PROFILE", "full")
+    if name not in PROFILES:
+        raise ValueError(f"Неизвестный профиль {name!r}, ожидается одно из {tuple(PROFILES)}")
+    return PROFILES[name]
+
+
+def content_length(headers: dict[str, str]) -> int:
+    """Размер ответа по заголовку Content-Length, 0 - если он не указан"""
+    value = headers.get("content-length", "")
+    return int(value) if value.isdigit() else 0
+
+
+class ResourceSizes:
+    """Размеры ответов по URL из HAR-слепка и HEAD-запросов для оценки сэкономленного трафика"""
+
+    def __init__(self):
+        self._sizes: Optional[dict[str, int]] = None
+
+    def get(self, url: str) -> int:
+        return self._loaded().get(url, 0)
+
+    def knows(self, url: str) -> bool:
+        return url in self._loaded()
+
+    def remember(self, url: str, size: int) -> None:
+        self._loaded()[url] = size
+
+    def _loaded(self) -> dict[str, int]:
+        if self._sizes is None:
+            self._sizes = self._load()
+        return self._sizes
+
+    @staticmethod
+    def _load() -> dict[str, int]:
+        bundle = get_har_bundle()
+        if not bundle.har_path.is_file():
+            return {}
+        har = json.loads(bundle.har_path.read_text(encoding="utf-8"))
+        sizes = {}
+        for entry in har["log"]["entries"]:
+            response = entry["response"]
+            sizes[entry["request"]["url"]] = max(response.get("bodySize", 0), response["content"].get("size", 0))
+        return sizes
+
+
+class BlockStats:
+    """Счетчики заблокированных запросов процесса"""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.sizes = ResourceSizes()
+
+    def add(self, url: str) -> None:
+        self.requests += 1
+        self.bytes += self.sizes.get(url)
+
+
+BLOCK_STATS = BlockStats()
+
+
+class ResourceBlocker:
+    """Обработчик маршрутов контекста по правилам профиля"""
+
+    def __init__(self, profile: RouteProfile, site_url: Optional[str] = None):
+        self.profile = profile
+        self.site_host = urlparse(site_url or get_base_url()).hostname
+        self.probe_sizes = is_blocked_size_probe_enabled()
+
+    def _needs_probe(self, url: str) -> bool:
+        """Размер ресурса неизвестен и его разрешено узнать HEAD-запросом"""
+        return self.probe_sizes and not BLOCK_STATS.sizes.knows(url)
+
+    def action(self, url: str, resource_type: str) -> Optional[str]:
+        """Решение по запросу: stub, abort или None - пропустить дальше"""
+        host = urlparse(url).hostname or ""
+        if resource_type == "document" and host == self.site_host:
+            return None
+        if resource_type in self.profile.stub_types:
+            return "stub"
+        if (resource_type in self.profile.abort_types
+                or any(host == blocked or host.endswith("." + blocked) for blocked in self.profile.abort_hosts)
+                or (self.profile.abort_third_party and host != self.site_host)):
+            return "abort"
+        return None
+
+    def handle(self, route: Route) -> None:
+        action = self.action(route.request.url, route.request.resource_type)
+        if action is None:
+            # Следующим идет обработчик HAR-слепка, если он подключен
+            route.fallback()
+            return
+        url = route.request.url
+        if self._needs_probe(url):
+            try:
+                response = route.fetch(method="HEAD", timeout=SIZE_PROBE_TIMEOUT)
+                BLOCK_STATS.sizes.remember(url, content_length(response.headers))
+            except Error:
+                BLOCK_STATS.sizes.remember(url, 0)
+        BLOCK_STATS.add(url)
+        if action == "stub":
+            route.fulfill(status=200, content_type="image/gif", body=EMPTY_GIF)
+        else:
+            route.abort("blockedbyclient")
+
+    async def handle_async(self, route: AsyncRoute) -> None:
+        action = self.action(route.request.url, route.request.resource_type)
+        if action is None:
+            await route.fallback()
+            return
+        url = route.request.url
+        if self._needs_probe(url):
+            try:
+                response = await route.fetch(method="HEAD", timeout=SIZE_PROBE_TIMEOUT)
+                BLOCK_STATS.sizes.remember(url, content_length(response.headers))
+            except Error:
+                BLOCK_STATS.sizes.remember(url, 0)
+        BLOCK_STATS.add(url)
+        if action == "stub":
+            await route.fulfill(status=200, content_type="image/gif", body=EMPTY_GIF)
+        else:
+            await route.abort("blockedbyclient")
+
+
+def install_resource_blocker(context: BrowserContext, profile: RouteProfile) -> None:
+    """Подключает профиль к контексту; для full маршруты не перехватываются вовсе"""
+    if profile.name != "full":
+        context.route("**/*", ResourceBlocker(profile).handle)
+
+
+async def install_async_resource_blocker(context: AsyncBrowserContext, profile: RouteProfile) -> None:
+    """Подключает профиль к контексту (async API)"""
+    if profile.name != "full":
+        await context.route("**/*", ResourceBlocker(profile).handle_async)
+
+
+class BlockedResourcesSummary:
+    """Плагин: собирает счетчики тестов и выводит итог прогона"""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self._reported = (0, 0)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item: pytest.Item):
+        yield
+        # Передаем прирост счетчиков через отчет, чтобы он дошел до главного процесса xdist
+        requests, size = BLOCK_STATS.requests, BLOCK_STATS.bytes
+        item.user_properties.append((BLOCKED_REQUESTS_PROPERTY, requests - self._reported[0]))
+        item.user_properties.append((BLOCKED_BYTES_PROPERTY, size - self._reported[1]))
+        self._reported = (requests, size)
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == BLOCKED_REQUESTS_PROPERTY:
+                self.requests += value
+            elif name == BLOCKED_BYTES_PROPERTY:
+                self.bytes += value
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.requests:
+            return
+        saved = f"{self.bytes / 1024:.1f} КБ" if self.bytes else "неизвестно (нет HAR-слепка, см. ROUTE_MEASURE_BLOCKED)"
+        terminalreporter.write_sep("-", "Блокировка ресурсов")
+        terminalreporter.write_line(f"Заблокировано запросов: {self.requests}, сэкономлено: {saved}")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "route_profile(name): профиль блокировки ресурсов страницы (full, functional, minimal)"
+    )
+    config.pluginmanager.register(BlockedResourcesSummary(), "blocked_resources_summary")
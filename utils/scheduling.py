@@ -0,0 +1,94 @@
+"""
+Распределение тестов по исполнителям с учетом длительности
+
+Используется схема LPT (longest processing time first): единицы работы
+сортируются по убыванию длительности и по очереди отдаются наименее
+загруженному исполнителю. Тесты одного класса образуют одну единицу, чтобы
+общие фикстуры оставались прогретыми; класс, который один длиннее средней
+загрузки исполнителя, делится на отдельные тесты.
+"""
+import heapq
+from dataclasses import dataclass, field
+from statistics import median
+from typing import Callable, Collection
+
+
+DEFAULT_DURATION = 1.0
+
+
+@dataclass
+class WorkUnit:
+    """Группа тестов, которая выполняется на одном исполнителе"""
+    key: str
+    tests: list[str] = field(default_factory=list)
+    duration: float = 0.0
+
+
+def affinity_key(nodeid: str) -> str:
+    """Ключ группировки теста: файл::Класс или файл для тестов-функций"""
+    parts = nodeid.split("::")
+    if len(parts) > 2:
+        return "::".join(parts[:2])
+    return parts[0]
+
+
+def estimate_durations(nodeids: list[str], history: dict[str, float]) -> dict[str, float]:
+    """Оценивает длительность тестов; для новых тестов берется медиана истории"""
+    known = [history[nodeid] for nodeid in nodeids if nodeid in history]
+    fallback = median(known) if known else DEFAULT_DURATION
+    return {nodeid: history.get(nodeid, fallback) for nodeid in nodeids}
+
+
+def build_units(durations: dict[str, float], bins: int,
+                key: Callable[[str], str] = affinity_key,
+                unsplittable: Collection[str] = ()) -> list[WorkUnit]:
+    """Группирует тесты в единицы работы по ключу, разбивая слишком крупные
+
+    Единицы с ключами из unsplittable никогда не делятся.
+    """
+    grouped: dict[str, WorkUnit] = {}
+    for nodeid, duration in durations.items():
+        unit = grouped.setdefault(key(nodeid), WorkUnit(key(nodeid)))
+        unit.tests.append(nodeid)
+        unit.duration += duration
+
+    target = sum(durations.values()) / max(bins, 1)
+    units = []
+    for unit in grouped.values():
+        if unit.duration > target and len(unit.tests) > 1 and unit.key not in unsplittable:
+            units.extend(WorkUnit(nodeid, [nodeid], durations[nodeid]) for nodeid in unit.tests)
+        else:
+            units.append(unit)
+    return units
+
+
+def lpt_schedule(units: list[WorkUnit], bins: int) -> list[list[WorkUnit]]:
+    """Раскладывает единицы работы по bins исполнителям, минимизируя максимум загрузки
+
+    Результат детерминирован: при равных длительностях порядок задается ключом.
+    """
+    schedule: list[list[WorkUnit]] = [[] for _ in range(bins)]
+    heap = [(0.0, index) for index in range(bins)]
+    for unit in sorted(units, key=lambda u: (-u.duration, u.key)):
+        load, index = heapq.heappop(heap)
+        schedule[index].append(unit)
+        heapq.heappush(heap, (load + unit.duration, index))
+    return schedule
+
+
+def assign_bins(durations: dict[str, float], bins: int,
+                key: Callable[[str], str] = affinity_key,
+                unsplittable: Collection[str] = ()) -> dict[str, int]:
+    """Возвращает номер исполнителя для каждого теста"""
+    assignment = {}
+    units = build_units(durations, bins, key, unsplittable)
+    for index, scheduled in enumerate(lpt_schedule(units, bins)):
+        for unit in scheduled:
+            for nodeid in unit.tests:
+                assignment[nodeid] = index
+    return assignment
+
+
+def makespan(schedule: list[list[WorkUnit]]) -> float:
+    """Длительность прогона: загрузка самого занятого исполнителя"""
+    return max((sum(unit.duration for unit in units) for units in schedule), default=0.0)
@@ -0,0 +1,243 @@
+"""
+Профилирование селекторов OrderPage (python run_tests.py --profile-selectors)
+
+Каждый локатор, зарегистрированный в BaseOrderPage.__init__, многократно
+разрешается на загруженной странице. Стоимость разрешения - медиана времени
+count() за вычетом пустого вызова в странице (сам обмен сообщениями с
+браузером). Для первого найденного элемента строится структурный
+CSS-селектор (id, name или путь по nth-of-type), и его стоимость меряется так
+же.
+
+Стабильность - доля состояний формы (исходное и после заполнения), в которых
+селектор находит тот же элемент и то же число совпадений. Флаги:
+- ambiguous: совпадений больше одного или селектор общий у нескольких атрибутов;
+- missing: совпадений нет;
+- unstable: в другом состоянии формы находится другой элемент;
+- slow: медленнее структурной альтернативы больше чем в threshold раз.
+"""
+import ast
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from playwright.sync_api import Locator, Page, sync_playwright
+
+from pages.order_page import OrderData, OrderPage
+from utils.config import get_browser_engine, get_launch_options, get_local_site_latency, is_local_site_enabled
+from utils.context_factory import new_order_context, open_order_page
+from utils.har import HarBundle, get_har_bundle, get_har_mode
+from utils.local_site import parse_latency, serve_local_site
+from utils.routing import get_route_profile
+from utils.stats import percentile
+
+
+NTH_SUFFIX = " >> nth="
+
+# Селектор в конце repr() локатора: <Locator frame=<Frame ...> selector='...'>
+LOCATOR_REPR_SELECTOR = re.compile(r" selector=(?P<selector>'.*'|\".*\")>$", re.DOTALL)
+
+# Состояния формы, в которых проверяется стабильность; применяются по очереди
+PROFILE_STATES = {
+    "почта, упаковка, страховка": OrderData(delivery="post", gift_wrapping=True, insurance=True),
+    "курьер, наличные": OrderData(
+        first_name="Тест", last_name="Тестов", email="test@example.com", phone="+7 (999) 111-11-11",
+        city="Москва", address="ул. Тестовая, д. 1", delivery="courier", payment="cash",
+        gift_wrapping=False, insurance=False,
+    ),
+}
+
+# Структурный CSS-селектор первого найденного элемента: id, name (для
+# радиокнопок с value) или путь по nth-of-type от ближайшего предка с id
+STRUCTURAL_SELECTOR_JS = """
+(elements) => {
+    const el = elements[0];
+    if (!el) {
+        return null;
+    }
+    const unique = (css) => document.querySelectorAll(css).length === 1;
+    const byId = (node) => node.id && unique(`#${CSS.escape(node.id)}`) ? `#${CSS.escape(node.id)}` : null;
+    const tag = el.tagName.toLowerCase();
+    if (byId(el)) {
+        return byId(el);
+    }
+    if (el.name) {
+        let css = `${tag}[name="${el.name}"]`;
+        if (el.type === 'radio') {
+            css += `[value="${el.value}"]`;
+        }
+        if (unique(css)) {
+            return css;
+        }
+    }
+    const steps = [];
+    for (let node = el; node && node !== document.body; node = node.parentElement) {
+        const anchor = byId(node);
+        if (anchor) {
+            steps.unshift(anchor);
+            return steps.join(' > ');
+        }
+        const siblings = Array.from(node.parentElement.children).filter(c => c.tagName === node.tagName);
+        steps.unshift(`${node.tagName.toLowerCase()}:nth-of-type(${siblings.indexOf(node) + 1})`);
+    }
+    steps.unshift('body');
+    return steps.join(' > ');
+}
+"""
+
+
+@dataclass
+class SelectorProfile:
+    """Результат профилирования одного локатора"""
+    attribute: str
+    selector: str
+    matches: int
+    median_ms: float
+    stability: float
+    structural: Optional[str] = None
+    structural_ms: Optional[float] = None
+    shared_with: tuple[str, ...] = ()
+    flags: list[str] = field(default_factory=list)
+
+
+def base_selector(selector: str) -> str:
+    """Селектор без выбора по индексу (.first/.nth): по нему считаются все совпадения"""
+    return selector.split(NTH_SUFFIX)[0]
+
+
+def locator_selector(locator: Locator) -> str:
+    """Полный селектор локатора (с .first, .last и вложенными локаторами) из его repr()"""
+    match = LOCATOR_REPR_SELECTOR.search(repr(locator))
+    if match is None:
+        raise ValueError(f"Не удалось прочитать селектор из {locator!r}")
+    return ast.literal_eval(match.group("selector"))
+
+
+def registered_locators(order_page: OrderPage) -> dict[str, str]:
+    """Атрибуты страницы, хранящие локаторы, и их селекторы"""
+    return {
+        name: locator_selector(value)
+        for name, value in vars(order_page).items()
+        if isinstance(value, Locator)
+    }
+
+
+def selector_flags(profile: SelectorProfile, threshold: float, min_delta_ms: float) -> list[str]:
+    """Флаги проблем селектора по результатам замеров"""
+    flags = []
+    if profile.matches == 0:
+        flags.append("missing")
+    if profile.matches > 1 or profile.shared_with:
+        flags.append("ambiguous")
+    if profile.stability < 1.0:
+        flags.append("unstable")
+    if (profile.structural_ms is not None
+            and profile.median_ms > profile.structural_ms * threshold
+            and profile.median_ms - profile.structural_ms > min_delta_ms):
+        flags.append("slow")
+    return flags
+
+
+class SelectorProfiler:
+    """Замеряет стоимость и стабильность локаторов страницы заказа"""
+
+    def __init__(self, page: Page, repeat: int = 20, threshold: float = 2.0, min_delta_ms: float = 0.2):
+        self.page = page
+        self.repeat = repeat
+        self.threshold = threshold
+        self.min_delta_ms = min_delta_ms
+        self.order_page = OrderPage(page)
+
+    def _median_ms(self, selector: str) -> float:
+        locator = self.page.locator(selector)
+        samples = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            locator.count()
+            samples.append((time.perf_counter() - start) * 1000)
+        return percentile(samples, 50)
+
+    def _baseline_ms(self) -> float:
+        samples = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            self.page.evaluate("() => 0")
+            samples.append((time.perf_counter() - start) * 1000)
+        return percentile(samples, 50)
+
+    def _resolve(self, selector: str) -> tuple[int, Optional[str]]:
+        """Число совпадений и структурный селектор найденного элемента"""
+        locator = self.page.locator(selector)
+        return locator.count(), locator.evaluate_all(STRUCTURAL_SELECTOR_JS)
+
+    def run(self) -> list[SelectorProfile]:
+        selectors = registered_locators(self.order_page)
+        baseline = self._baseline_ms()
+
+        profiles = {}
+        initial = {}
+        for attribute, selector in selectors.items():
+            resolved = self._resolve(selector)
+            initial[attribute] = resolved
+            structural = resolved[1]
+            profiles[attribute] = SelectorProfile(
+                attribute=attribute,
+                selector=selector,
+                matches=self.page.locator(base_selector(selector)).count(),
+                median_ms=max(self._median_ms(selector) - baseline, 0.0),
+                stability=1.0,
+                structural=structural,
+                structural_ms=(max(self._median_ms(structural) - baseline, 0.0)
+                               if structural is not None else None),
+                shared_with=tuple(other for other, other_selector in selectors.items()
+                                  if other != attribute and other_selector == selector),
+            )
+
+        stable = {attribute: 1 for attribute in selectors}
+        for order in PROFILE_STATES.values():
+            self.order_page.fill_order(order)
+            for attribute, selector in selectors.items():
+                stable[attribute] += self._resolve(selector) == initial[attribute]
+
+        for attribute, profile in profiles.items():
+            profile.stability = stable[attribute] / (len(PROFILE_STATES) + 1)
+            profile.flags = selector_flags(profile, self.threshold, self.min_delta_ms)
+        return sorted(profiles.values(), key=lambda profile: -profile.median_ms)
+
+
+def format_selector_report(profiles: list[SelectorProfile]) -> str:
+    """Таблица профилей селекторов и структурные замены для помеченных"""
+    lines = [f"{'атрибут':<28} {'совпад.':>7} {'медиана, мс':>11} {'структ., мс':>11} {'стабильн.':>9}  флаги"]
+    for profile in profiles:
+        structural_ms = f"{profile.structural_ms:.2f}" if profile.structural_ms is not None else "-"
+        lines.append(f"{profile.attribute:<28} {profile.matches:>7} {profile.median_ms:>11.2f} "
+                     f"{structural_ms:>11} {profile.stability:>9.0%}  {', '.join(profile.flags)}")
+    flagged = [profile for profile in profiles if profile.flags]
+    if flagged:
+        lines.append("")
+        lines.append("Замены для помеченных селекторов:")
+        for profile in flagged:
+            shared = f" (общий с {', '.join(profile.shared_with)})" if profile.shared_with else ""
+            lines.append(f"  {profile.attribute}: {profile.selector}{shared}")
+            lines.append(f"    -> {profile.structural or 'элемент не найден'}")
+    return "\n".join(lines)
+
+
+def _profile(repeat: int, threshold: float, har_bundle: Optional[HarBundle]) -> list[SelectorProfile]:
+    with sync_playwright() as p:
+        browser = p[get_browser_engine()].launch(**get_launch_options())
+        try:
+            page = new_order_context(browser, har_bundle, get_route_profile()).new_page()
+            open_order_page(page)
+            return SelectorProfiler(page, repeat, threshold).run()
+        finally:
+            browser.close()
+
+
+def run_selector_profile(repeat: int = 20, threshold: float = 2.0) -> list[SelectorProfile]:
+    """Профилирует селекторы на локальной копии, HAR-слепке или основном стенде"""
+    if is_local_site_enabled():
+        with serve_local_site(parse_latency(get_local_site_latency())):
+            return _profile(repeat, threshold, None)
+    har_bundle = get_har_bundle() if get_har_mode() == "replay" else None
+    return _profile(repeat, threshold, har_bundle)
@@ -0,0 +1,284 @@
+"""
+Разбиение прогона между машинами CI (--shard i/n) и сборка общего отчета
+
+Тесты раскладываются на n частей схемой LPT по истории длительностей
+(reports/durations.json, см. utils/durations.py и utils/scheduling.py),
+машина выполняет свою часть i (нумерация с единицы), остальные тесты
+снимаются с прогона. Разбиение зависит только от списка тестов и истории,
+поэтому на машинах с одной историей части одинаковы и не пересекаются.
+Без истории все тесты считаются одинаковыми и части выравниваются по числу
+тестов. Делятся только тесты, отобранные -m и -k: выражение отбора одно на
+всех машинах, поэтому разбиение остается детерминированным. План части
+(отобранные тесты и тесты части) записывается в reports/shard.json.
+
+merge_shards собирает каталоги reports машин в один: общий results.json и
+HTML-сводку со ссылками на отчеты частей, результаты allure. Тесты, которые
+выполнили несколько частей, тесты без части и неполный набор частей
+попадают в список проблем сборки. История длительностей всех частей
+записывается в reports/durations.json, откуда ее читает следующее разбиение.
+"""
+import html
+import json
+import shutil
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from utils.config import REPORTS_DIR
+from utils.durations import DURATIONS_PATH, DurationStore, apply_selection, strip_group
+from utils.results import summarize
+from utils.scheduling import assign_bins, estimate_durations
+
+
+MERGED_DIR = REPORTS_DIR / "merged"
+
+# Файлы, которые прогон части оставляет в своем каталоге reports
+RESULTS_FILE = "results.json"
+REPORT_FILE = "report.html"
+DURATIONS_FILE = "durations.json"
+PLAN_FILE = "shard.json"
+ALLURE_DIR = "allure-results"
+
+PLAN_PATH = REPORTS_DIR / PLAN_FILE
+
+_shard_key = pytest.StashKey[tuple[int, int, int]]()
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Номер части (с единицы) и число частей из строки "i/n" """
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Ожидается --shard i/n, например 2/4, получено {value!r}") from None
+    if total < 1 or not 1 <= index <= total:
+        raise ValueError(f"Часть {index}/{total} вне диапазона 1..{total}")
+    return index, total
+
+
+def select_shard(nodeids: list[str], index: int, total: int, history: dict[str, float]) -> set[str]:
+    """Тесты части index из total: LPT по истории, без истории - поровну по числу"""
+    durations = estimate_durations(sorted(nodeids), history)
+    assignment = assign_bins(durations, total)
+    return {nodeid for nodeid, shard in assignment.items() if shard == index - 1}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--shard", default=None, metavar="I/N",
+        help="выполнить только часть I из N, разбиение по истории длительностей"
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    value = config.getoption("shard")
+    if value:
+        try:
+            parse_shard(value)
+        except ValueError as error:
+            raise pytest.UsageError(str(error)) from error
+
+
+def _write_plan(config: pytest.Config, value: str, nodeids: list[str], selected: set[str]) -> None:
+    """План части для проверки при сборке; под xdist его пишет один воркер"""
+    if hasattr(config, "workerinput") and config.workerinput["workerid"] != "gw0":
+        return
+    plan = {"shard": value, "collected": sorted(nodeids), "assigned": sorted(selected)}
+    PLAN_PATH.parent.mkdir(parents=True, exist_ok=True)
+    PLAN_PATH.write_text(json.dumps(plan, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def apply_shard(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Оставляет в items только тесты части из --shard"""
+    value = config.getoption("shard")
+    index, total = parse_shard(value)
+    nodeids = [strip_group(item.nodeid) for item in items]
+    selected = select_shard(nodeids, index, total, DurationStore().durations)
+    kept = [item for item in items if strip_group(item.nodeid) in selected]
+    deselected = [item for item in items if strip_group(item.nodeid) not in selected]
+    config.stash[_shard_key] = (index, total, len(items))
+    _write_plan(config, value, nodeids, selected)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = kept
+
+
+# Обертка выбирает часть раньше всех обычных реализаций хука: до распределения по
+# длительности (utils/durations.py) и до того, как xdist допишет к nodeid группу.
+# Отбор -m и -k применяется здесь же, чтобы части делили только отобранные тесты.
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]):
+    if config.getoption("shard"):
+        apply_selection(config, items)
+        apply_shard(config, items)
+    yield
+
+
+def pytest_report_collectionfinish(config: pytest.Config, items: list[pytest.Item]) -> Optional[str]:
+    if _shard_key not in config.stash:
+        return None
+    index, total, collected = config.stash[_shard_key]
+    return f"Часть {index}/{total}: {len(items)} из {collected} тестов"
+
+
+def _read_json(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _shard_problems(labels: list[str]) -> list[str]:
+    """Проверяет, что собраны все части одного разбиения, каждая по одному разу"""
+    try:
+        parsed = [parse_shard(label) for label in labels]
+    except ValueError as error:
+        return [str(error)]
+    problems = []
+    totals = sorted({total for _, total in parsed})
+    if len(totals) > 1:
+        problems.append(f"Части из разных разбиений: {', '.join(labels)}")
+        return problems
+    total = totals[0] if totals else 0
+    repeated = sorted({label for label in labels if labels.count(label) > 1})
+    if repeated:
+        problems.append(f"Части собраны повторно: {', '.join(repeated)}")
+    absent = [f"{index}/{total}" for index in range(1, total + 1) if f"{index}/{total}" not in labels]
+    if absent:
+        problems.append(f"Не хватает частей: {', '.join(absent)}")
+    return problems
+
+
+def merge_results(shards: list[dict], plans: Optional[list[dict]] = None) -> dict:
+    """Общие итоги частей: тесты всех частей с номером части, время - по самой долгой
+
+    Тест, который выполнили несколько частей, не перезаписывается: он остается
+    с исходом первой части, а все исходы попадают в duplicates. По планам частей
+    (reports/shard.json) находятся тесты, которые не достались ни одной части.
+    """
+    labels = [results.get("shard") or f"{number}/{len(shards)}" for number, results in enumerate(shards, start=1)]
+    tests = {}
+    runs: dict[str, dict[str, str]] = {}
+    for label, results in zip(labels, shards):
+        for nodeid, entry in results["tests"].items():
+            runs.setdefault(nodeid, {})[label] = entry["outcome"]
+            tests.setdefault(nodeid, {**entry, "shard": label})
+    duplicates = {nodeid: outcomes for nodeid, outcomes in sorted(runs.items()) if len(outcomes) > 1}
+
+    plans = plans or []
+    collected = set().union(*(plan["collected"] for plan in plans))
+    assigned = set().union(*(plan["assigned"] for plan in plans))
+    missing = sorted(collected - assigned)
+
+    problems = _shard_problems(labels) if any(results.get("shard") for results in shards) else []
+    if duplicates:
+        problems.append(f"Тесты выполнены в нескольких частях ({len(duplicates)}): "
+                        f"истории длительностей машин различаются")
+    if missing:
+        problems.append(f"Тесты не достались ни одной части ({len(missing)}): "
+                        f"истории длительностей машин различаются")
+    return {
+        "created": max((results["created"] for results in shards), default=""),
+        "duration": max((results["duration"] for results in shards), default=0.0),
+        "sequential_duration": round(sum(results["duration"] for results in shards), 3),
+        "shards": [{"shard": label, "duration": results["duration"], **summarize(results["tests"])}
+                   for label, results in zip(labels, shards)],
+        "problems": problems,
+        "duplicates": duplicates,
+        "missing": missing,
+        "tests": tests,
+    }
+
+
+def merge_durations(history: dict[str, float], shards: list[tuple[dict, dict]]) -> dict[str, float]:
+    """История длительностей после всех частей: каждая часть обновляет свои тесты
+
+    shards - пары (история части, итоги части).
+    """
+    merged = dict(history)
+    for durations, results in shards:
+        merged.update({nodeid: durations[nodeid] for nodeid in results["tests"] if nodeid in durations})
+    return merged
+
+
+def _render_html(merged: dict, reports: list[Optional[str]]) -> str:
+    """HTML-сводка общего прогона со ссылками на отчеты частей"""
+    rows = []
+    for shard, report in zip(merged["shards"], reports):
+        link = f'<a href="{report}">отчет</a>' if report else ""
+        rows.append(f"<tr><td>{html.escape(shard['shard'])}</td><td>{shard['passed']}</td>"
+                    f"<td>{shard['failed']}</td><td>{shard['skipped']}</td>"
+                    f"<td>{shard['duration']:.2f}</td><td>{link}</td></tr>")
+    tests = []
+    for nodeid, entry in sorted(merged["tests"].items()):
+        tests.append(f'<tr class="{entry["outcome"]}"><td>{html.escape(nodeid)}</td><td>{entry["outcome"]}</td>'
+                     f'<td>{entry["duration"]:.2f}</td><td>{html.escape(entry["shard"])}</td></tr>')
+    total = summarize(merged["tests"])
+    problems = "".join(f"<li>{html.escape(problem)}</li>" for problem in merged["problems"])
+    problems += "".join(f"<li>{html.escape(nodeid)}: {html.escape(str(outcomes))}</li>"
+                        for nodeid, outcomes in merged["duplicates"].items())
+    problems += "".join(f"<li>{html.escape(nodeid)}: ни в одной части</li>" for nodeid in merged["missing"])
+    return f"""<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>Общий отчет по частям прогона</title>
+<style>
+body {{ font-family: sans-serif; }}
+table {{ border-collapse: collapse; margin-bottom: 24px; }}
+td, th {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; }}
+tr.failed {{ background: #fdd; }}
+tr.skipped {{ background: #ffd; }}
+ul.problems {{ color: #a00; }}
+</style>
+</head>
+<body>
+<h1>Общий отчет по частям прогона</h1>
+<p>Пройдено {total['passed']}, упало {total['failed']}, пропущено {total['skipped']}.
+Прогон {merged['duration']:.2f} с, последовательно было бы {merged['sequential_duration']:.2f} с.</p>
+{f'<h2>Проблемы сборки</h2><ul class="problems">{problems}</ul>' if problems else ''}
+<table>
+<tr><th>часть</th><th>пройдено</th><th>упало</th><th>пропущено</th><th>время, с</th><th></th></tr>
+{chr(10).join(rows)}
+</table>
+<table>
+<tr><th>тест</th><th>исход</th><th>время, с</th><th>часть</th></tr>
+{chr(10).join(tests)}
+</table>
+</body>
+</html>
+"""
+
+
+def merge_shards(directories: list[Path], output: Path = MERGED_DIR,
+                 history_path: Path = DURATIONS_PATH) -> dict:
+    """Собирает каталоги reports частей в output и возвращает общие итоги
+
+    История длительностей всех частей сохраняется в history_path.
+    """
+    missing = [str(directory) for directory in directories if not (directory / RESULTS_FILE).is_file()]
+    if missing:
+        raise FileNotFoundError(f"Нет {RESULTS_FILE} в каталогах частей: {', '.join(missing)}")
+    output.mkdir(parents=True, exist_ok=True)
+    shards = [_read_json(directory / RESULTS_FILE) for directory in directories]
+    plans = [_read_json(directory / PLAN_FILE) for directory in directories if (directory / PLAN_FILE).is_file()]
+    merged = merge_results(shards, plans)
+    (output / RESULTS_FILE).write_text(json.dumps(merged, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    reports: list[Optional[str]] = []
+    for number, directory in enumerate(directories, start=1):
+        report = directory / REPORT_FILE
+        if report.is_file():
+            shutil.copyfile(report, output / f"shard-{number}.html")
+            reports.append(f"shard-{number}.html")
+        else:
+            reports.append(None)
+        # Результаты allure - отдельные файлы на тест, поэтому части просто складываются вместе
+        allure = directory / ALLURE_DIR
+        if allure.is_dir():
+            shutil.copytree(allure, output / ALLURE_DIR, dirs_exist_ok=True)
+    (output / REPORT_FILE).write_text(_render_html(merged, reports), encoding="utf-8")
+
+    history = [(_read_json(directory / DURATIONS_FILE), results)
+               for directory, results in zip(directories, shards) if (directory / DURATIONS_FILE).is_file()]
+    store = DurationStore(history_path)
+    store.durations = merge_durations(store.durations, history)
+    store.save()
+    return merged
@@ -0,0 +1,17 @@
+"""
+Статистические функции для отчетов о длительности
+"""
+import math
+from typing import Sequence
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Возвращает перцентиль q (0..100) с линейной интерполяцией"""
+    if not values:
+        raise ValueError("Перцентиль пустой выборки не определен")
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower, upper = math.floor(position), math.ceil(position)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
@@ -0,0 +1,337 @@
+"""
+База длительностей тестов по фазам
+
+Для каждого теста в reports/timings.sqlite записываются фазы setup (без
+навигации), navigation, body и teardown, окно страницы и метрики загрузки
+(utils/web_vitals.py), а для прогона - git SHA, браузер и все окна его
+тестов. Отчет по базе строит python run_tests.py --timing-report.
+"""
+import sqlite3
+import subprocess
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from typing import Optional
+
+import pytest
+
+from utils.config import REPORTS_DIR
+from utils.durations import strip_group
+from utils.engines import get_run_engines
+from utils.stats import percentile
+from utils.web_vitals import WEB_VITALS_PROPERTY
+
+
+TIMINGS_PATH = REPORTS_DIR / "timings.sqlite"
+
+PHASES = ("setup", "navigation", "body", "teardown")
+
+# Свойство теста, в котором фикстуры передают время навигации
+NAVIGATION_PROPERTY = "phase:navigation"
+
+# Свойство теста с окном его страницы: тесты выбирают конфигурацию контекста сами
+VIEWPORT_PROPERTY = "viewport"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    git_sha TEXT NOT NULL,
+    browser TEXT NOT NULL,
+    viewport TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    viewport TEXT
+);
+CREATE INDEX IF NOT EXISTS timings_nodeid ON timings(nodeid, run_id);
+CREATE TABLE IF NOT EXISTS web_vitals (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS web_vitals_run ON web_vitals(run_id, metric);
+"""
+
+_current_item: Optional[pytest.Item] = None
+
+
+def record_navigation(seconds: float) -> None:
+    """Отмечает время навигации для выполняющегося теста"""
+    if _current_item is not None:
+        _current_item.user_properties.append((NAVIGATION_PROPERTY, seconds))
+
+
+def record_viewport(item: pytest.Item, viewport: Optional[dict]) -> None:
+    """Сохраняет окно страницы теста (page.viewport_size) в свойства теста"""
+    if viewport is not None:
+        item.user_properties.append((VIEWPORT_PROPERTY, f"{viewport['width']}x{viewport['height']}"))
+
+
+@dataclass(frozen=True)
+class TimingSummary:
+    """Сводка длительности теста за несколько прогонов"""
+    nodeid: str
+    runs: int
+    p50: float
+    p95: float
+    latest: float
+
+
+@dataclass(frozen=True)
+class VitalsTrend:
+    """Медиана метрики страницы в последнем прогоне и в предыдущих"""
+    metric: str
+    latest: float
+    baseline: Optional[float]
+
+
+@dataclass(frozen=True)
+class Regression:
+    """Тест, который стал заметно медленнее предыдущих прогонов"""
+    nodeid: str
+    latest: float
+    baseline: float
+
+    @property
+    def ratio(self) -> float:
+        return self.latest / self.baseline if self.baseline else float("inf")
+
+
+def current_git_sha() -> str:
+    """Возвращает SHA текущего коммита или unknown вне git"""
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return result.stdout.strip()
+
+
+class TimingStore:
+    """SQLite-хранилище длительностей тестов по фазам"""
+
+    def __init__(self, path: Path = TIMINGS_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        # Базы, созданные до записи окна каждого теста
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(timings)")}
+        if "viewport" not in columns:
+            self.connection.execute("ALTER TABLE timings ADD COLUMN viewport TEXT")
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def record_run(self, timings: dict[str, dict[str, float]], outcomes: dict[str, str],
+                   git_sha: str, browser: str, viewports: Optional[dict[str, str]] = None,
+                   vitals: Optional[dict[str, dict[str, float]]] = None) -> int:
+        """Сохраняет прогон: nodeid -> {фаза: секунды}, nodeid -> окно "ШxВ" и nodeid -> {метрика: значение}
+
+        В runs.viewport записываются все окна тестов прогона через запятую.
+        """
+        viewports = viewports or {}
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started_at, git_sha, browser, viewport) VALUES (?, ?, ?, ?)",
+                (datetime.now(timezone.utc).isoformat(), git_sha, browser,
+                 ",".join(sorted(set(viewports.values())))),
+            )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO timings (run_id, nodeid, phase, seconds, outcome, viewport) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, nodeid, phase, seconds, outcomes.get(nodeid, "unknown"), viewports.get(nodeid))
+                    for nodeid, phases in timings.items()
+                    for phase, seconds in phases.items()
+                ],
+            )
+            self.connection.executemany(
+                "INSERT INTO web_vitals (run_id, nodeid, metric, value) VALUES (?, ?, ?, ?)",
+                [
+                    (run_id, nodeid, metric, value)
+                    for nodeid, metrics in (vitals or {}).items()
+                    for metric, value in metrics.items()
+                ],
+            )
+        return run_id
+
+    def run_ids(self, limit: int) -> list[int]:
+        """Возвращает идентификаторы последних прогонов, начиная с самого нового"""
+        rows = self.connection.execute("SELECT id FROM runs ORDER BY id DESC LIMIT ?", (limit,))
+        return [row[0] for row in rows]
+
+    def _totals(self, run_ids: list[int]) -> dict[str, dict[int, float]]:
+        """Суммарная длительность тестов по прогонам: nodeid -> {run_id: секунды}"""
+        if not run_ids:
+            return {}
+        placeholders = ", ".join("?" * len(run_ids))
+        rows = self.connection.execute(
+            f"SELECT nodeid, run_id, SUM(seconds) FROM timings "
+            f"WHERE run_id IN ({placeholders}) GROUP BY nodeid, run_id",
+            run_ids,
+        )
+        totals: dict[str, dict[int, float]] = {}
+        for nodeid, run_id, seconds in rows:
+            totals.setdefault(nodeid, {})[run_id] = seconds
+        return totals
+
+    def slowest(self, limit: int = 10) -> list[tuple[str, dict[str, float]]]:
+        """Самые медленные тесты последнего прогона с разбивкой по фазам"""
+        latest = self.run_ids(1)
+        if not latest:
+            return []
+        phases: dict[str, dict[str, float]] = {}
+        rows = self.connection.execute(
+            "SELECT nodeid, phase, seconds FROM timings WHERE run_id = ?", latest
+        )
+        for nodeid, phase, seconds in rows:
+            phases.setdefault(nodeid, {})[phase] = seconds
+        ordered = sorted(phases.items(), key=lambda item: -sum(item[1].values()))
+        return ordered[:limit]
+
+    def summary(self, runs: int = 10) -> list[TimingSummary]:
+        """p50/p95 суммарной длительности каждого теста за последние runs прогонов"""
+        run_ids = self.run_ids(runs)
+        result = []
+        for nodeid, by_run in self._totals(run_ids).items():
+            values = list(by_run.values())
+            latest = by_run.get(run_ids[0], values[-1])
+            result.append(TimingSummary(nodeid, len(values), percentile(values, 50), percentile(values, 95), latest))
+        return sorted(result, key=lambda timing: -timing.p95)
+
+    def vitals_trend(self, runs: int = 10) -> list[VitalsTrend]:
+        """Медианы метрик страницы последнего прогона против предыдущих runs прогонов"""
+        run_ids = self.run_ids(runs + 1)
+        if not run_ids:
+            return []
+        latest: dict[str, list[float]] = {}
+        previous: dict[str, list[float]] = {}
+        placeholders = ", ".join("?" * len(run_ids))
+        rows = self.connection.execute(
+            f"SELECT run_id, metric, value FROM web_vitals WHERE run_id IN ({placeholders})", run_ids
+        )
+        for run_id, metric, value in rows:
+            (latest if run_id == run_ids[0] else previous).setdefault(metric, []).append(value)
+        return [
+            VitalsTrend(metric, median(values), median(previous[metric]) if metric in previous else None)
+            for metric, values in sorted(latest.items())
+        ]
+
+    def regressions(self, runs: int = 10, threshold: float = 1.2, min_delta: float = 0.1) -> list[Regression]:
+        """Тесты последнего прогона, медленнее медианы предыдущих runs прогонов
+
+        Регрессия засчитывается, если рост больше threshold раз и больше min_delta секунд.
+        """
+        run_ids = self.run_ids(runs + 1)
+        if len(run_ids) < 2:
+            return []
+        latest_id, previous_ids = run_ids[0], run_ids[1:]
+        result = []
+        for nodeid, by_run in self._totals(run_ids).items():
+            history = [by_run[run_id] for run_id in previous_ids if run_id in by_run]
+            if latest_id not in by_run or not history:
+                continue
+            latest, baseline = by_run[latest_id], median(history)
+            if latest > baseline * threshold and latest - baseline > min_delta:
+                result.append(Regression(nodeid, latest, baseline))
+        return sorted(result, key=lambda regression: -regression.ratio)
+
+
+class TimingRecorder:
+    """Плагин: собирает фазы тестов и сохраняет прогон в конце сессии"""
+
+    def __init__(self, config: pytest.Config):
+        self.config = config
+        self.timings: dict[str, dict[str, float]] = {}
+        self.outcomes: dict[str, str] = {}
+        self.vitals: dict[str, dict[str, float]] = {}
+        self.viewports: dict[str, str] = {}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item: pytest.Item):
+        global _current_item
+        _current_item = item
+        try:
+            yield
+        finally:
+            _current_item = None
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        nodeid = strip_group(report.nodeid)
+        phases = self.timings.setdefault(nodeid, {})
+        if report.when == "setup":
+            phases["setup"] = report.duration
+        elif report.when == "call":
+            phases["body"] = report.duration
+        else:
+            phases["teardown"] = report.duration
+            navigation = sum(value for name, value in report.user_properties if name == NAVIGATION_PROPERTY)
+            if navigation:
+                phases["navigation"] = navigation
+                phases["setup"] = max(phases.get("setup", 0.0) - navigation, 0.0)
+            for name, value in report.user_properties:
+                if name == WEB_VITALS_PROPERTY:
+                    self.vitals[nodeid] = value
+                elif name == VIEWPORT_PROPERTY:
+                    self.viewports[nodeid] = value
+        if report.failed or report.when == "call" or (report.skipped and report.when == "setup"):
+            self.outcomes[nodeid] = report.outcome
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if hasattr(self.config, "workerinput") or not self.timings:
+            return
+        store = TimingStore()
+        try:
+            store.record_run(
+                self.timings,
+                self.outcomes,
+                git_sha=current_git_sha(),
+                browser=",".join(get_run_engines(self.config)),
+                viewports=self.viewports,
+                vitals=self.vitals,
+            )
+        finally:
+            store.close()
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.pluginmanager.register(TimingRecorder(config), "timing_recorder")
+
+
+def print_timing_report(runs: int = 10, limit: int = 10, path: Path = TIMINGS_PATH) -> None:
+    """Печатает самые медленные тесты, p50/p95 и регрессии"""
+    if not path.is_file():
+        print(f"База длительностей {path} еще не создана: запустите тесты")
+        return
+    store = TimingStore(path)
+    try:
+        print("\nСамые медленные тесты последнего прогона (сек):")
+        print(f"{'тест':<80} " + " ".join(f"{phase:>10}" for phase in PHASES))
+        for nodeid, phases in store.slowest(limit):
+            print(f"{nodeid:<80} " + " ".join(f"{phases.get(phase, 0.0):>10.2f}" for phase in PHASES))
+
+        print(f"\nДлительность за последние {runs} прогонов (сек):")
+        print(f"{'тест':<80} {'прогонов':>8} {'p50':>8} {'p95':>8}")
+        for timing in store.summary(runs)[:limit]:
+            print(f"{timing.nodeid:<80} {timing.runs:>8} {timing.p50:>8.2f} {timing.p95:>8.2f}")
+
+        trend = store.vitals_trend(runs)
+        if trend:
+            print(f"\nМетрики страницы: медиана последнего прогона и предыдущих {runs} прогонов:")
+            for vitals in trend:
+                baseline = f"{vitals.baseline:>12.2f}" if vitals.baseline is not None else f"{'-':>12}"
+                print(f"{vitals.metric:<30} {vitals.latest:>12.2f} {baseline}")
+
+        regressions = store.regressions(runs)
+        print(f"\nРегрессии относительно предыдущих {runs} прогонов: {len(regressions)}")
+        for regression in regressions:
+            print(f"{regression.nodeid:<80} {regression.baseline:>8.2f} -> {regression.latest:>8.2f} "
+                  f"(x{regression.ratio:.2f})")
+    finally:
+        store.close()
@@ -0,0 +1,127 @@
+"""
+Переиспользование загруженной страницы заказа между тестами (PAGE_REUSE=true)
+
+Каждый процесс (воркер xdist) держит одну загруженную страницу. Перед
+очередным тестом форма возвращается в исходное состояние одним вызовом
+в странице, результат сверяется с отпечатком, снятым сразу после загрузки.
+Если сброс не удался (например, фреймворк вернул свое состояние или открыто
+модальное окно), страница перезагружается.
+"""
+from playwright.sync_api import Page
+
+from utils.context_factory import open_order_page
+
+
+# Отпечаток состояния формы: значения, отметки и доступность полей,
+# тексты ошибок и открытые диалоги
+FORM_FINGERPRINT_JS = """
+() => ({
+    url: location.href,
+    controls: Array.from(document.querySelectorAll('input, select, textarea')).map(el => [
+        el.name, el.type, el.value, el.checked, el.disabled
+    ]),
+    errors: Array.from(document.querySelectorAll('.error, .invalid, [class*="error"]'))
+        .map(el => (el.textContent || '').trim()),
+    modal: Array.from(document.querySelectorAll('h3'))
+        .some(el => el.textContent.includes('Подтверждение заказа')),
+})
+"""
+
+# Сброс формы к значениям по умолчанию с событиями input/change,
+# которые слушает фреймворк приложения; возвращает отпечаток после перерисовки
+RESET_FORM_JS = """
+async () => {
+    const nativeSetter = (el, prop) => {
+        const descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), prop);
+        return descriptor && descriptor.set;
+    };
+    const notify = (el, events) => {
+        for (const type of events) {
+            el.dispatchEvent(new Event(type, { bubbles: true }));
+        }
+    };
+
+    for (const el of document.querySelectorAll('input, textarea, select')) {
+        if (el.type === 'checkbox' || el.type === 'radio') {
+            if (el.checked !== el.defaultChecked) {
+                nativeSetter(el, 'checked').call(el, el.defaultChecked);
+                notify(el, ['click', 'input', 'change']);
+            }
+        } else if (el.tagName === 'SELECT') {
+            const option = Array.from(el.options).find(o => o.defaultSelected) || el.options[0];
+            const value = option ? option.value : '';
+            if (el.value !== value) {
+                nativeSetter(el, 'value').call(el, value);
+                notify(el, ['input', 'change']);
+            }
+        } else if (el.value !== el.defaultValue) {
+            nativeSetter(el, 'value').call(el, el.defaultValue);
+            notify(el, ['input', 'change']);
+        }
+    }
+
+    localStorage.clear();
+    sessionStorage.clear();
+    if (document.activeElement) {
+        document.activeElement.blur();
+    }
+    window.scrollTo(0, 0);
+
+    // Даем фреймворку перерисовать форму перед проверкой
+    await new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+    return (%s)();
+}
+""" % FORM_FINGERPRINT_JS
+
+
+CLEAR_STORAGE_JS = """
+() => {
+    try {
+        localStorage.clear();
+        sessionStorage.clear();
+    } catch (e) {
+        // about:blank и чужие источники хранилищ не имеют
+    }
+}
+"""
+
+
+class WarmOrderPage:
+    """Загруженная страница заказа, которая сбрасывается между тестами"""
+
+    def __init__(self, page: Page):
+        self.page = page
+        # Окно, с которым создан контекст: тест мог изменить его размер
+        self.viewport = page.viewport_size
+        self.resets = 0
+        self.reloads = 0
+        self._pristine = self._load()
+        self._dirty = False
+
+    def _load(self) -> dict:
+        """Загружает страницу и снимает отпечаток исходного состояния"""
+        open_order_page(self.page)
+        return self.page.evaluate(FORM_FINGERPRINT_JS)
+
+    def acquire(self) -> Page:
+        """Возвращает страницу в исходном состоянии для очередного теста"""
+        if self._dirty:
+            self._restore()
+        self._dirty = True
+        return self.page
+
+    def _restore(self) -> None:
+        """Сбрасывает форму, при неудаче перезагружает страницу"""
+        if self.page.viewport_size != self.viewport:
+            self.page.set_viewport_size(self.viewport)
+
+        if self.page.url.split("#")[0] == self._pristine["url"].split("#")[0]:
+            state = self.page.evaluate(RESET_FORM_JS)
+            if state == self._pristine:
+                self.resets += 1
+                return
+
+        # Черновик из хранилища не должен восстановиться после перезагрузки
+        self.page.evaluate(CLEAR_STORAGE_JS)
+        self._pristine = self._load()
+        self.reloads += 1
@@ -0,0 +1,143 @@
+"""
+Метрики производительности страницы заказа в каждом тесте (WEB_VITALS=true)
+
+Скрипт инициализации контекста подписывается на LCP, сдвиги макета (CLS) и
+длинные задачи. При завершении теста из страницы забираются Navigation
+Timing, время отрисовки, эти метрики и число запросов/байт к сайту. Результат
+прикладывается к отчетам pytest-html и allure и сохраняется в базе
+длительностей (см. utils/timing.py) вместе с прогоном.
+"""
+import json
+from dataclasses import asdict, dataclass
+from typing import Optional
+from urllib.parse import urlparse
+
+import pytest
+from playwright.sync_api import BrowserContext, Error, Page
+
+from utils.config import get_base_url, is_web_vitals_enabled
+
+try:
+    import allure
+except ImportError:
+    allure = None
+
+try:
+    from pytest_html import extras as html_extras
+except ImportError:
+    html_extras = None
+
+
+WEB_VITALS_PROPERTY = "web_vitals"
+
+# Наблюдатели подключаются до загрузки страницы, buffered подхватывает ранние записи
+WEB_VITALS_INIT_JS = """
+(() => {
+    if (window.__webVitals) return;
+    const vitals = window.__webVitals = {lcp: null, cls: 0, longTasks: 0, longTaskMs: 0, reported: false};
+    const observe = (type, callback) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(callback)).observe({type, buffered: true});
+        } catch (error) {
+            // Тип записей не поддерживается движком браузера
+        }
+    };
+    observe('largest-contentful-paint', entry => { vitals.lcp = entry.startTime; });
+    observe('layout-shift', entry => { if (!entry.hadRecentInput) vitals.cls += entry.value; });
+    observe('longtask', entry => {
+        vitals.longTasks += 1;
+        vitals.longTaskMs += entry.duration;
+    });
+    performance.setResourceTimingBufferSize(1000);
+})();
+"""
+
+# Метрики текущего документа; повторно для того же документа возвращает null,
+# чтобы переиспользуемая страница не повторяла одни и те же значения
+COLLECT_WEB_VITALS_JS = """
+host => {
+    const vitals = window.__webVitals;
+    if (!vitals || vitals.reported) return null;
+    vitals.reported = true;
+    const [nav] = performance.getEntriesByType('navigation');
+    const paint = Object.fromEntries(performance.getEntriesByType('paint').map(entry => [entry.name, entry.startTime]));
+    const resources = performance.getEntriesByType('resource')
+        .filter(entry => new URL(entry.name).hostname === host);
+    return {
+        ttfb: nav ? nav.responseStart : null,
+        dom_content_loaded: nav ? nav.domContentLoadedEventEnd : null,
+        load: nav ? nav.loadEventEnd : null,
+        first_paint: paint['first-paint'] ?? null,
+        first_contentful_paint: paint['first-contentful-paint'] ?? null,
+        lcp: vitals.lcp,
+        cls: vitals.cls,
+        long_tasks: vitals.longTasks,
+        long_task_ms: vitals.longTaskMs,
+        requests: resources.length + (nav ? 1 : 0),
+        transfer_bytes: resources.reduce((sum, entry) => sum + entry.transferSize, nav ? nav.transferSize : 0),
+    };
+}
+"""
+
+
+@dataclass(frozen=True)
+class WebVitals:
+    """Метрики загрузки страницы; времена в миллисекундах от начала навигации"""
+    ttfb: Optional[float] = None
+    dom_content_loaded: Optional[float] = None
+    load: Optional[float] = None
+    first_paint: Optional[float] = None
+    first_contentful_paint: Optional[float] = None
+    lcp: Optional[float] = None
+    cls: Optional[float] = None
+    long_tasks: Optional[float] = None
+    long_task_ms: Optional[float] = None
+    requests: Optional[float] = None
+    transfer_bytes: Optional[float] = None
+
+    def as_metrics(self) -> dict[str, float]:
+        """Измеренные метрики без пропусков: имя -> значение"""
+        return {name: value for name, value in asdict(self).items() if value is not None}
+
+
+def install_web_vitals(context: BrowserContext) -> None:
+    """Подключает наблюдатели метрик ко всем страницам контекста"""
+    context.add_init_script(WEB_VITALS_INIT_JS)
+
+
+def collect_web_vitals(page: Page, site_url: Optional[str] = None) -> Optional[WebVitals]:
+    """Забирает метрики текущего документа; None, если страница сайта не загружалась"""
+    host = urlparse(site_url or get_base_url()).hostname
+    if page.is_closed() or urlparse(page.url).hostname != host:
+        return None
+    try:
+        state = page.evaluate(COLLECT_WEB_VITALS_JS, host)
+    except Error:
+        # Страница могла упасть или уйти на другой документ вместе с тестом
+        return None
+    return WebVitals(**state) if state else None
+
+
+def record_web_vitals(item: pytest.Item, page: Page) -> None:
+    """Сохраняет метрики страницы в свойства теста и прикладывает их к allure"""
+    if not is_web_vitals_enabled():
+        return
+    vitals = collect_web_vitals(page)
+    if vitals is None:
+        return
+    metrics = vitals.as_metrics()
+    item.user_properties.append((WEB_VITALS_PROPERTY, metrics))
+    if allure is not None:
+        allure.attach(json.dumps(metrics, indent=2), name="Web vitals",
+                      attachment_type=allure.attachment_type.JSON)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo):
+    outcome = yield
+    report = outcome.get_result()
+    if html_extras is None or report.when != "teardown":
+        return
+    for name, metrics in item.user_properties:
+        if name == WEB_VITALS_PROPERTY:
+            report.extras = getattr(report, "extras", []) + [html_extras.json(metrics, name="Web vitals")]